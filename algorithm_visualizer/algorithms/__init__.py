@@ -1,6 +1,12 @@
 from .bubble_sort import BubbleSort
 from .quick_sort import QuickSort
 from .merge_sort import MergeSort
+from .heap_sort import HeapSort
+from .intro_sort import IntroSort
+from .tim_sort import TimSort
+from .radix_sort import RadixSort
+from .counting_sort import CountingSort
 from .base_algorithm import BaseAlgorithm
 
-__all__ = ['BubbleSort', 'QuickSort', 'MergeSort', 'BaseAlgorithm']
\ No newline at end of file
+__all__ = ['BubbleSort', 'QuickSort', 'MergeSort', 'HeapSort', 'IntroSort', 'TimSort',
+           'RadixSort', 'CountingSort', 'BaseAlgorithm']
\ No newline at end of file
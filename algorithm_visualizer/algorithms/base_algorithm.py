@@ -1,6 +1,11 @@
+import math
 from abc import ABC, abstractmethod
-from typing import List, Any
+from itertools import islice
+from typing import Callable, Iterator, List, Any, Optional
 from ..core.timeline import Timeline
+from ..core.step import EMITTER, Step, StepEmitter
+from ..core.stats import CountingEmitter, StepStats
+from ..core.sinks import StepSink
 
 
 class BaseAlgorithm(ABC):
@@ -14,13 +19,75 @@ class BaseAlgorithm(ABC):
             'space': ''
         }
     
+    def validate(self, array: List[Any]):
+        """Raise ValueError if the algorithm cannot sort `array`."""
+        pass
+    
     @abstractmethod
-    def execute(self, array: List[Any]) -> Timeline:
+    def iter_steps(self, array: List[Any], emit: StepEmitter = EMITTER) -> Iterator[Step]:
+        """Lazily yield the steps of sorting a copy of `array`, built by `emit`."""
         pass
     
+    def execute(self, array: List[Any], keyframe_interval: Optional[int] = None,
+                max_steps: Optional[int] = None, compact_steps: bool = False,
+                adaptive_keyframes: bool = False) -> Timeline:
+        """Run the algorithm on a copy of `array` and record every step."""
+        timeline = Timeline(array, keyframe_interval, compact_steps, adaptive_keyframes=adaptive_keyframes)
+        return self.run(array, timeline, max_steps)
+    
+    def run(self, array: List[Any], sink: StepSink, max_steps: Optional[int] = None) -> StepSink:
+        """Run the algorithm on a copy of `array`, recording each step into `sink`.
+        
+        The sink decides what recording costs: a Timeline keeps everything,
+        StepStats only counts, a FileSink or StreamSink writes the steps out.
+        The sink is closed when the run ends, and returned.
+        """
+        steps = self.iter_steps(array)
+        if max_steps is not None:
+            steps = islice(steps, max_steps)
+        add_step = sink.add_step
+        try:
+            for step in steps:
+                add_step(step)
+        finally:
+            sink.close()
+        return sink
+    
+    def collect_stats(self, array: List[Any], max_steps: Optional[int] = None) -> StepStats:
+        """Run the algorithm only counting steps, without building a Timeline."""
+        stats = StepStats()
+        steps = self.iter_steps(array, CountingEmitter(stats))
+        if max_steps is not None:
+            steps = islice(steps, max_steps)
+        stats.count(steps)
+        return stats
+    
+    def estimate_steps(self, array: List[Any], sample_size: int = 128) -> int:
+        """Estimate how many steps sorting `array` takes.
+        
+        Counts the steps for an evenly spaced sample of the input and scales
+        the count by the growth rate in `complexity['average']`.
+        """
+        n = len(array)
+        if n <= sample_size:
+            return sum(1 for _ in self.iter_steps(array))
+        
+        sample = array[::math.ceil(n / sample_size)]
+        sample_steps = sum(1 for _ in self.iter_steps(sample))
+        growth = _growth_function(self.complexity.get('average', ''))
+        return round(sample_steps * growth(n) / growth(len(sample)))
+    
     def get_info(self) -> dict:
         return {
             'name': self.name,
             'description': self.description,
             'complexity': self.complexity
-        }
\ No newline at end of file
+        }
+
+
+def _growth_function(complexity: str) -> Callable[[int], float]:
+    if '²' in complexity or 'n^2' in complexity:
+        return lambda n: n * n
+    if 'log n' in complexity:
+        return lambda n: n * math.log2(n)
+    return lambda n: n
\ No newline at end of file
@@ -1,7 +1,6 @@
-from typing import List
+from typing import Iterator, List
 from .base_algorithm import BaseAlgorithm
-from ..core.timeline import Timeline
-from ..core.step import Step
+from ..core.step import EMITTER, Step, StepEmitter
 
 
 class BubbleSort(BaseAlgorithm):
@@ -17,49 +16,46 @@ class BubbleSort(BaseAlgorithm):
             'space': 'O(1)'
         }
     
-    def execute(self, array: List) -> Timeline:
-        timeline = Timeline(array)
+    def iter_steps(self, array: List, emit: StepEmitter = EMITTER) -> Iterator[Step]:
         arr = array.copy()
         n = len(arr)
         
         for i in range(n):
             swapped = False
-            timeline.add_step(Step.highlight(
-                list(range(n - i)), 
-                f"Pass {i + 1}: Checking unsorted portion"
-            ))
+            yield emit.highlight(
+                range(n - i),
+                template='bubble_sort.pass', template_args=(i + 1,)
+            )
             
             for j in range(0, n - i - 1):
-                timeline.add_step(Step.compare(
+                yield emit.compare(
                     j, j + 1,
-                    f"Comparing elements at positions {j} and {j + 1}"
-                ))
+                    template='bubble_sort.compare', template_args=(j, j + 1)
+                )
                 
                 if arr[j] > arr[j + 1]:
-                    timeline.add_step(Step.swap(
+                    yield emit.swap(
                         j, j + 1,
-                        f"Swapping {arr[j]} and {arr[j + 1]} - they are in wrong order"
-                    ))
+                        template='bubble_sort.swap', template_args=(arr[j], arr[j + 1])
+                    )
                     arr[j], arr[j + 1] = arr[j + 1], arr[j]
                     swapped = True
             
-            timeline.add_step(Step.mark_sorted(
+            yield emit.mark_sorted(
                 [n - i - 1],
-                f"Element at position {n - i - 1} is now in its final position"
-            ))
+                template='bubble_sort.sorted', template_args=(n - i - 1,)
+            )
             
-            timeline.add_step(Step.clear_highlight(
-                list(range(n - i)),
+            yield emit.clear_highlight(
+                range(n - i),
                 "Clearing highlights for next pass"
-            ))
+            )
             
             if not swapped:
                 break
         
         if n > 0:
-            timeline.add_step(Step.mark_sorted(
+            yield emit.mark_sorted(
                 [0],
                 "First element is now sorted"
-            ))
-        
-        return timeline
\ No newline at end of file
+            )
\ No newline at end of file
@@ -0,0 +1,78 @@
+from typing import Iterator, List
+from .base_algorithm import BaseAlgorithm
+from ..core.step import EMITTER, Step, StepEmitter
+
+
+class CountingSort(BaseAlgorithm):
+    # The counts list holds one slot per value in [min, max]; inputs may span
+    # at most this many values, or RANGE_FACTOR times their length if larger
+    RANGE_FACTOR = 4
+    
+    def __init__(self, max_range: int = 1 << 16):
+        super().__init__(
+            name="Counting Sort",
+            description="A non-comparison integer sort that counts how often each value occurs and uses the running totals to place every element directly in its final position."
+        )
+        self.complexity = {
+            'best': 'O(n + k)',
+            'average': 'O(n + k)',
+            'worst': 'O(n + k)',
+            'space': 'O(n + k)'
+        }
+        self.max_range = max_range
+    
+    def validate(self, array: List):
+        if any(type(value) is not int for value in array):
+            raise ValueError("Counting sort requires integer values")
+        if array:
+            value_range = max(array) - min(array) + 1
+            limit = max(self.max_range, self.RANGE_FACTOR * len(array))
+            if value_range > limit:
+                raise ValueError(
+                    f"Counting sort supports a value range of at most {limit} for this input, got {value_range}"
+                )
+    
+    def iter_steps(self, array: List, emit: StepEmitter = EMITTER) -> Iterator[Step]:
+        self.validate(array)
+        arr = array.copy()
+        n = len(arr)
+        if n == 0:
+            return
+        
+        minimum = min(arr)
+        counts = [0] * (max(arr) - minimum + 1)
+        emit.allocate(len(counts) + n)
+        
+        for i, value in enumerate(arr):
+            counts[value - minimum] += 1
+            yield emit.highlight(
+                [i],
+                template='counting_sort.count',
+                template_args=(value, counts[value - minimum])
+            )
+        
+        # Running totals give the end position of each value; filling from
+        # the back keeps equal values in their original order
+        for offset in range(1, len(counts)):
+            counts[offset] += counts[offset - 1]
+        output = [None] * n
+        for value in reversed(arr):
+            counts[value - minimum] -= 1
+            output[counts[value - minimum]] = value
+        
+        yield emit.clear_highlight(
+            range(n),
+            "Counting completed - writing values back in order"
+        )
+        for k, value in enumerate(output):
+            yield emit.overwrite(
+                k, value,
+                template='counting_sort.place',
+                template_args=(value, k)
+            )
+            yield emit.mark_sorted(
+                [k],
+                template='counting_sort.sorted',
+                template_args=(value, k)
+            )
+        emit.release(len(counts) + n)
\ No newline at end of file
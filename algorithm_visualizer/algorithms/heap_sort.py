@@ -0,0 +1,34 @@
+from typing import Iterator, List
+from .base_algorithm import BaseAlgorithm
+from .helpers import heapify_range
+from ..core.step import EMITTER, Step, StepEmitter
+
+
+class HeapSort(BaseAlgorithm):
+    def __init__(self):
+        super().__init__(
+            name="Heap Sort",
+            description="An in-place, comparison-based sorting algorithm that builds a max-heap and repeatedly moves the largest element to the end of the array."
+        )
+        self.complexity = {
+            'best': 'O(n log n)',
+            'average': 'O(n log n)',
+            'worst': 'O(n log n)',
+            'space': 'O(1)'
+        }
+    
+    def iter_steps(self, array: List, emit: StepEmitter = EMITTER) -> Iterator[Step]:
+        arr = array.copy()
+        n = len(arr)
+        if n == 0:
+            return
+        
+        yield emit.highlight(
+            range(n),
+            "Building a max-heap from the whole array"
+        )
+        yield from heapify_range(arr, 0, n - 1, emit)
+        yield emit.clear_highlight(
+            range(n),
+            "Heap is empty - every element is in place"
+        )
\ No newline at end of file
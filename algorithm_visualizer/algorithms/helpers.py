@@ -0,0 +1,86 @@
+from typing import Iterator, List
+from ..core.step import EMITTER, Step, StepEmitter
+
+
+def sift_down(arr: List, root: int, size: int, offset: int = 0,
+              emit: StepEmitter = EMITTER) -> Iterator[Step]:
+    """Restore the max-heap property below `root` for a heap stored at arr[offset:offset + size]."""
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            return
+        
+        if child + 1 < size:
+            yield emit.compare(
+                offset + child, offset + child + 1,
+                template='heap_sort.compare_children',
+                template_args=(arr[offset + child], arr[offset + child + 1])
+            )
+            if arr[offset + child] < arr[offset + child + 1]:
+                child += 1
+        
+        yield emit.compare(
+            offset + root, offset + child,
+            template='heap_sort.compare_parent',
+            template_args=(arr[offset + root], arr[offset + child])
+        )
+        if arr[offset + root] >= arr[offset + child]:
+            return
+        
+        yield emit.swap(
+            offset + root, offset + child,
+            template='heap_sort.sift',
+            template_args=(arr[offset + root], arr[offset + child])
+        )
+        arr[offset + root], arr[offset + child] = arr[offset + child], arr[offset + root]
+        root = child
+
+
+def heapify_range(arr: List, low: int, high: int, emit: StepEmitter = EMITTER) -> Iterator[Step]:
+    """Heap sort arr[low:high + 1] in place."""
+    size = high - low + 1
+    for start in range(size // 2 - 1, -1, -1):
+        yield from sift_down(arr, start, size, low, emit)
+    
+    for end in range(size - 1, 0, -1):
+        yield emit.swap(
+            low, low + end,
+            template='heap_sort.extract',
+            template_args=(arr[low], low + end)
+        )
+        arr[low], arr[low + end] = arr[low + end], arr[low]
+        yield emit.mark_sorted(
+            [low + end],
+            template='heap_sort.sorted',
+            template_args=(arr[low + end], low + end)
+        )
+        yield from sift_down(arr, 0, end, low, emit)
+    
+    if size > 0:
+        yield emit.mark_sorted(
+            [low],
+            template='heap_sort.sorted',
+            template_args=(arr[low], low)
+        )
+
+
+def insertion_sort_range(arr: List, low: int, high: int, emit: StepEmitter = EMITTER) -> Iterator[Step]:
+    """Insertion sort arr[low:high + 1] with adjacent compares and swaps."""
+    for i in range(low + 1, high + 1):
+        j = i
+        while j > low:
+            yield emit.compare(
+                j - 1, j,
+                template='insertion.compare',
+                template_args=(arr[j - 1], arr[j])
+            )
+            if arr[j - 1] <= arr[j]:
+                break
+            
+            yield emit.swap(
+                j - 1, j,
+                template='insertion.shift',
+                template_args=(arr[j], arr[j - 1])
+            )
+            arr[j - 1], arr[j] = arr[j], arr[j - 1]
+            j -= 1
\ No newline at end of file
@@ -0,0 +1,134 @@
+import math
+from typing import Generator, Iterator, List
+from .base_algorithm import BaseAlgorithm
+from .helpers import heapify_range, insertion_sort_range
+from ..core.step import EMITTER, Step, StepEmitter
+
+
+class IntroSort(BaseAlgorithm):
+    # Partitions at or below this size are finished with insertion sort
+    INSERTION_THRESHOLD = 16
+    
+    def __init__(self):
+        super().__init__(
+            name="Intro Sort",
+            description="A hybrid sort that runs quick sort with median-of-three pivots, switches to heap sort when recursion gets too deep and finishes small partitions with insertion sort."
+        )
+        self.complexity = {
+            'best': 'O(n log n)',
+            'average': 'O(n log n)',
+            'worst': 'O(n log n)',
+            'space': 'O(log n)'
+        }
+    
+    def iter_steps(self, array: List, emit: StepEmitter = EMITTER) -> Iterator[Step]:
+        arr = array.copy()
+        n = len(arr)
+        if n == 0:
+            return
+        
+        depth_limit = 2 * int(math.log2(n))
+        yield from self._intro_sort(arr, 0, n - 1, depth_limit, emit)
+    
+    def _intro_sort(self, arr: List, low: int, high: int, depth_limit: int,
+                    emit: StepEmitter = EMITTER) -> Iterator[Step]:
+        emit.enter()
+        while high - low + 1 > self.INSERTION_THRESHOLD:
+            if depth_limit == 0:
+                yield emit.highlight(
+                    range(low, high + 1),
+                    template='intro_sort.fallback',
+                    template_args=(low, high)
+                )
+                yield from heapify_range(arr, low, high, emit)
+                emit.leave()
+                return
+            depth_limit -= 1
+            
+            pivot_index = yield from self._partition(arr, low, high, emit)
+            yield emit.mark_sorted(
+                [pivot_index],
+                template='quick_sort.pivot_sorted',
+                template_args=(arr[pivot_index], pivot_index)
+            )
+            
+            # Recurse into the smaller side and loop on the larger one, so
+            # the stack depth stays O(log n)
+            if pivot_index - low < high - pivot_index:
+                yield from self._intro_sort(arr, low, pivot_index - 1, depth_limit, emit)
+                low = pivot_index + 1
+            else:
+                yield from self._intro_sort(arr, pivot_index + 1, high, depth_limit, emit)
+                high = pivot_index - 1
+        
+        if low <= high:
+            yield emit.highlight(
+                range(low, high + 1),
+                template='intro_sort.insertion',
+                template_args=(low, high)
+            )
+            yield from insertion_sort_range(arr, low, high, emit)
+            yield emit.mark_sorted(
+                range(low, high + 1),
+                template='intro_sort.range_sorted',
+                template_args=(low, high)
+            )
+        emit.leave()
+    
+    def _partition(self, arr: List, low: int, high: int, emit: StepEmitter = EMITTER) -> Generator[Step, None, int]:
+        mid = (low + high) // 2
+        # Median of three: order arr[low], arr[mid], arr[high], then use the middle
+        for a, b in ((low, mid), (mid, high), (low, mid)):
+            yield emit.compare(
+                a, b,
+                template='intro_sort.median_compare',
+                template_args=(arr[a], arr[b])
+            )
+            if arr[a] > arr[b]:
+                yield emit.swap(
+                    a, b,
+                    template='intro_sort.median_swap',
+                    template_args=(arr[a], arr[b])
+                )
+                arr[a], arr[b] = arr[b], arr[a]
+        
+        yield emit.swap(
+            mid, high,
+            template='intro_sort.pivot_to_end',
+            template_args=(arr[mid],)
+        )
+        arr[mid], arr[high] = arr[high], arr[mid]
+        
+        pivot = arr[high]
+        yield emit.pivot(
+            high,
+            template='quick_sort.pivot',
+            template_args=(pivot, high)
+        )
+        
+        i = low - 1
+        for j in range(low, high):
+            yield emit.compare(
+                j, high,
+                template='quick_sort.compare',
+                template_args=(arr[j], pivot)
+            )
+            if arr[j] <= pivot:
+                i += 1
+                if i != j:
+                    yield emit.swap(
+                        i, j,
+                        template='quick_sort.move_left',
+                        template_args=(arr[j],)
+                    )
+                    arr[i], arr[j] = arr[j], arr[i]
+        
+        if i + 1 != high:
+            yield emit.swap(
+                i + 1, high,
+                template='quick_sort.place_pivot',
+                template_args=(pivot,)
+            )
+            arr[i + 1], arr[high] = arr[high], arr[i + 1]
+        
+        return i + 1
\ No newline at end of file
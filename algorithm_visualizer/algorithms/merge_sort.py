@@ -1,11 +1,18 @@
-from typing import List
+from typing import Generator, Iterator, List
 from .base_algorithm import BaseAlgorithm
-from ..core.timeline import Timeline
-from ..core.step import Step
+from ..core.step import EMITTER, Step, StepEmitter
 
 
 class MergeSort(BaseAlgorithm):
-    def __init__(self):
+    """Stable merge sort.
+    
+    The default is the classic top-down recursion. With `bottom_up=True`
+    runs of width 1, 2, 4, ... are merged iteratively, alternating a single
+    auxiliary buffer with the working array between passes instead of
+    slicing out both halves for every merge.
+    """
+    
+    def __init__(self, bottom_up: bool = False):
         super().__init__(
             name="Merge Sort",
             description="A stable, divide-and-conquer sorting algorithm that divides the array into halves and merges them back in sorted order."
@@ -16,88 +23,163 @@ class MergeSort(BaseAlgorithm):
             'worst': 'O(n log n)',
             'space': 'O(n)'
         }
+        self.bottom_up = bottom_up
     
-    def execute(self, array: List) -> Timeline:
-        timeline = Timeline(array)
+    def iter_steps(self, array: List, emit: StepEmitter = EMITTER) -> Iterator[Step]:
         arr = array.copy()
-        self._merge_sort(arr, 0, len(arr) - 1, timeline)
+        if self.bottom_up:
+            arr = yield from self._bottom_up_merge_sort(arr, emit)
+        else:
+            yield from self._merge_sort(arr, 0, len(arr) - 1, emit)
         
         for i in range(len(arr)):
-            timeline.add_step(Step.mark_sorted(
+            yield emit.mark_sorted(
                 [i],
-                f"Element {arr[i]} is in its final sorted position"
-            ))
-        
-        return timeline
+                template='merge_sort.sorted', template_args=(arr[i],)
+            )
     
-    def _merge_sort(self, arr: List, left: int, right: int, timeline: Timeline):
+    def _merge_sort(self, arr: List, left: int, right: int, emit: StepEmitter = EMITTER) -> Iterator[Step]:
         if left < right:
+            emit.enter()
             mid = (left + right) // 2
             
-            timeline.add_step(Step.highlight(
-                list(range(left, right + 1)),
-                f"Dividing array from index {left} to {right}"
-            ))
+            yield emit.highlight(
+                range(left, right + 1),
+                template='merge_sort.divide', template_args=(left, right)
+            )
             
-            self._merge_sort(arr, left, mid, timeline)
-            self._merge_sort(arr, mid + 1, right, timeline)
+            yield from self._merge_sort(arr, left, mid, emit)
+            yield from self._merge_sort(arr, mid + 1, right, emit)
             
-            self._merge(arr, left, mid, right, timeline)
+            yield from self._merge(arr, left, mid, right, emit)
             
-            timeline.add_step(Step.clear_highlight(
-                list(range(left, right + 1)),
+            yield emit.clear_highlight(
+                range(left, right + 1),
                 "Merge operation completed"
-            ))
+            )
+            emit.leave()
     
-    def _merge(self, arr: List, left: int, mid: int, right: int, timeline: Timeline):
+    def _bottom_up_merge_sort(self, arr: List, emit: StepEmitter = EMITTER) -> Generator[Step, None, List]:
+        n = len(arr)
+        source, target = arr, [None] * n
+        emit.allocate(n)
+        width = 1
+        
+        while width < n:
+            for left in range(0, n, 2 * width):
+                mid = min(left + width, n) - 1
+                right = min(left + 2 * width, n) - 1
+                
+                if mid >= right:
+                    # Unpaired trailing run: carry it into the target unchanged
+                    for k in range(left, right + 1):
+                        target[k] = source[k]
+                    continue
+                
+                yield emit.highlight(
+                    range(left, right + 1),
+                    template='merge_sort.runs', template_args=(width, left, right)
+                )
+                
+                yield from self._merge_into(source, target, left, mid, right, emit)
+                
+                yield emit.clear_highlight(
+                    range(left, right + 1),
+                    "Merge operation completed"
+                )
+            
+            source, target = target, source
+            width *= 2
+        
+        emit.release(n)
+        return source
+    
+    def _merge_into(self, source: List, target: List, left: int, mid: int, right: int,
+                    emit: StepEmitter = EMITTER) -> Iterator[Step]:
+        yield emit.merge(
+            (left, mid + 1),
+            (mid + 1, right + 1),
+            template='merge_sort.merge', template_args=(left, mid + 1, right + 1)
+        )
+        
+        i, j = left, mid + 1
+        for k in range(left, right + 1):
+            if i <= mid and j <= right:
+                yield emit.compare(
+                    i, j,
+                    template='merge_sort.compare', template_args=(source[i], source[j])
+                )
+                take_left = source[i] <= source[j]
+                template = 'merge_sort.place'
+            else:
+                take_left = i <= mid
+                template = 'merge_sort.copy_remaining'
+            
+            if take_left:
+                value = source[i]
+                i += 1
+            else:
+                value = source[j]
+                j += 1
+            
+            yield emit.overwrite(
+                k, value,
+                template=template, template_args=(value, k)
+            )
+            target[k] = value
+    
+    def _merge(self, arr: List, left: int, mid: int, right: int, emit: StepEmitter = EMITTER) -> Iterator[Step]:
         left_arr = arr[left:mid + 1]
         right_arr = arr[mid + 1:right + 1]
+        emit.allocate(right - left + 1)
         
-        timeline.add_step(Step.merge(
+        yield emit.merge(
             (left, mid + 1),
             (mid + 1, right + 1),
-            f"Merging left subarray [{left}:{mid + 1}] with right subarray [{mid + 1}:{right + 1}]"
-        ))
+            template='merge_sort.merge', template_args=(left, mid + 1, right + 1)
+        )
         
         i = j = 0
         k = left
         
         while i < len(left_arr) and j < len(right_arr):
-            timeline.add_step(Step.compare(
+            yield emit.compare(
                 left + i, mid + 1 + j,
-                f"Comparing {left_arr[i]} with {right_arr[j]}"
-            ))
+                template='merge_sort.compare', template_args=(left_arr[i], right_arr[j])
+            )
             
             if left_arr[i] <= right_arr[j]:
-                timeline.add_step(Step.overwrite(
+                yield emit.overwrite(
                     k, left_arr[i],
-                    f"Placing {left_arr[i]} at position {k}"
-                ))
+                    template='merge_sort.place', template_args=(left_arr[i], k)
+                )
                 arr[k] = left_arr[i]
                 i += 1
             else:
-                timeline.add_step(Step.overwrite(
+                yield emit.overwrite(
                     k, right_arr[j],
-                    f"Placing {right_arr[j]} at position {k}"
-                ))
+                    template='merge_sort.place', template_args=(right_arr[j], k)
+                )
                 arr[k] = right_arr[j]
                 j += 1
             k += 1
         
         while i < len(left_arr):
-            timeline.add_step(Step.overwrite(
+            yield emit.overwrite(
                 k, left_arr[i],
-                f"Copying remaining {left_arr[i]} to position {k}"
-            ))
+                template='merge_sort.copy_remaining', template_args=(left_arr[i], k)
+            )
             arr[k] = left_arr[i]
             i += 1
             k += 1
         
         while j < len(right_arr):
-            timeline.add_step(Step.overwrite(
+            yield emit.overwrite(
                 k, right_arr[j],
-                f"Copying remaining {right_arr[j]} to position {k}"
-            ))
+                template='merge_sort.copy_remaining', template_args=(right_arr[j], k)
+            )
             arr[k] = right_arr[j]
             j += 1
-            k += 1
\ No newline at end of file
+            k += 1
+        
+        emit.release(right - left + 1)
\ No newline at end of file
@@ -1,11 +1,25 @@
-from typing import List
+import random
+from typing import Generator, Iterator, List, Optional, Tuple
 from .base_algorithm import BaseAlgorithm
-from ..core.timeline import Timeline
-from ..core.step import Step
+from ..core.step import EMITTER, Step, StepEmitter
 
 
 class QuickSort(BaseAlgorithm):
-    def __init__(self):
+    """Quick sort driven by an explicit stack.
+    
+    `pivot_strategy` selects how the pivot is chosen: 'last' (the original
+    behaviour), 'median_of_three', 'random' (reproducible when `seed` is
+    given) or 'ninther'. With `three_way=True` partitions are split into
+    less-than, equal and greater-than regions, so runs of duplicates are
+    placed in one pass. The smaller side is always sorted first, keeping the
+    stack at O(log n) entries regardless of input.
+    """
+    
+    PIVOT_STRATEGIES = ('last', 'median_of_three', 'random', 'ninther')
+    # Partitions smaller than this use median-of-three instead of the ninther
+    NINTHER_THRESHOLD = 40
+    
+    def __init__(self, pivot_strategy: str = 'last', three_way: bool = False, seed: Optional[int] = None):
         super().__init__(
             name="Quick Sort",
             description="An efficient, in-place sorting algorithm that uses divide-and-conquer strategy with a pivot element."
@@ -16,54 +30,172 @@ class QuickSort(BaseAlgorithm):
             'worst': 'O(n²)',
             'space': 'O(log n)'
         }
+        if pivot_strategy not in self.PIVOT_STRATEGIES:
+            raise ValueError(f"Unknown pivot strategy '{pivot_strategy}', expected one of {', '.join(self.PIVOT_STRATEGIES)}")
+        self.pivot_strategy = pivot_strategy
+        self.three_way = three_way
+        self.seed = seed
     
-    def execute(self, array: List) -> Timeline:
-        timeline = Timeline(array)
+    def iter_steps(self, array: List, emit: StepEmitter = EMITTER) -> Iterator[Step]:
         arr = array.copy()
-        self._quick_sort(arr, 0, len(arr) - 1, timeline)
-        return timeline
-    
-    def _quick_sort(self, arr: List, low: int, high: int, timeline: Timeline):
-        if low < high:
-            pivot_index = self._partition(arr, low, high, timeline)
+        rng = random.Random(self.seed)
+        stack = []
+        if len(arr) > 1:
+            stack.append((0, len(arr) - 1))
+            emit.enter()
+        
+        while stack:
+            low, high = stack.pop()
+            emit.leave()
+            
+            pivot_index = yield from self._choose_pivot(arr, low, high, rng, emit)
+            if self.three_way:
+                lt, gt = yield from self._partition_three_way(arr, low, high, pivot_index, emit)
+            else:
+                lt = gt = yield from self._partition(arr, low, high, pivot_index, emit)
             
-            timeline.add_step(Step.mark_sorted(
-                [pivot_index],
-                f"Pivot element {arr[pivot_index]} is now in its final position at index {pivot_index}"
-            ))
+            if lt == gt:
+                yield emit.mark_sorted(
+                    [lt],
+                    template='quick_sort.pivot_sorted', template_args=(arr[lt], lt)
+                )
+            else:
+                yield emit.mark_sorted(
+                    range(lt, gt + 1),
+                    template='quick_sort.equal_sorted', template_args=(arr[lt], lt, gt)
+                )
             
-            self._quick_sort(arr, low, pivot_index - 1, timeline)
-            self._quick_sort(arr, pivot_index + 1, high, timeline)
+            # Push the larger side first so the smaller one is sorted next
+            left, right = (low, lt - 1), (gt + 1, high)
+            if lt - low < high - gt:
+                left, right = right, left
+            for part_low, part_high in (left, right):
+                if part_low < part_high:
+                    stack.append((part_low, part_high))
+                    emit.enter()
     
-    def _partition(self, arr: List, low: int, high: int, timeline: Timeline) -> int:
+    def _choose_pivot(self, arr: List, low: int, high: int, rng: random.Random,
+                      emit: StepEmitter = EMITTER) -> Generator[Step, None, int]:
+        if self.pivot_strategy == 'random':
+            return rng.randint(low, high)
+        if self.pivot_strategy == 'last' or high - low < 2:
+            return high
+        
+        mid = (low + high) // 2
+        if self.pivot_strategy == 'ninther' and high - low + 1 >= self.NINTHER_THRESHOLD:
+            # Tukey's ninther: the median of three medians of three
+            step = (high - low + 1) // 8
+            first = yield from self._median_of_three(arr, low, low + step, low + 2 * step, emit)
+            middle = yield from self._median_of_three(arr, mid - step, mid, mid + step, emit)
+            last = yield from self._median_of_three(arr, high - 2 * step, high - step, high, emit)
+            return (yield from self._median_of_three(arr, first, middle, last, emit))
+        
+        return (yield from self._median_of_three(arr, low, mid, high, emit))
+    
+    def _median_of_three(self, arr: List, a: int, b: int, c: int,
+                         emit: StepEmitter = EMITTER) -> Generator[Step, None, int]:
+        yield emit.compare(
+            a, b,
+            template='quick_sort.median_compare', template_args=(arr[a], arr[b])
+        )
+        if arr[a] > arr[b]:
+            a, b = b, a
+        
+        yield emit.compare(
+            b, c,
+            template='quick_sort.median_compare', template_args=(arr[b], arr[c])
+        )
+        if arr[b] <= arr[c]:
+            return b
+        
+        yield emit.compare(
+            a, c,
+            template='quick_sort.median_compare', template_args=(arr[a], arr[c])
+        )
+        return c if arr[a] <= arr[c] else a
+    
+    def _partition(self, arr: List, low: int, high: int, pivot_index: int,
+                   emit: StepEmitter = EMITTER) -> Generator[Step, None, int]:
+        if pivot_index != high:
+            yield emit.swap(
+                pivot_index, high,
+                template='quick_sort.pivot_to_end', template_args=(arr[pivot_index],)
+            )
+            arr[pivot_index], arr[high] = arr[high], arr[pivot_index]
+        
         pivot = arr[high]
-        timeline.add_step(Step.pivot(
+        yield emit.pivot(
             high,
-            f"Choosing {pivot} as pivot element at position {high}"
-        ))
+            template='quick_sort.pivot', template_args=(pivot, high)
+        )
         
         i = low - 1
         
         for j in range(low, high):
-            timeline.add_step(Step.compare(
+            yield emit.compare(
                 j, high,
-                f"Comparing {arr[j]} with pivot {pivot}"
-            ))
+                template='quick_sort.compare', template_args=(arr[j], pivot)
+            )
             
             if arr[j] <= pivot:
                 i += 1
                 if i != j:
-                    timeline.add_step(Step.swap(
+                    yield emit.swap(
                         i, j,
-                        f"Moving {arr[j]} to left of pivot"
-                    ))
+                        template='quick_sort.move_left', template_args=(arr[j],)
+                    )
                     arr[i], arr[j] = arr[j], arr[i]
         
         if i + 1 != high:
-            timeline.add_step(Step.swap(
+            yield emit.swap(
                 i + 1, high,
-                f"Placing pivot {pivot} in its final position"
-            ))
+                template='quick_sort.place_pivot', template_args=(pivot,)
+            )
             arr[i + 1], arr[high] = arr[high], arr[i + 1]
         
-        return i + 1
\ No newline at end of file
+        return i + 1
+    
+    def _partition_three_way(self, arr: List, low: int, high: int, pivot_index: int,
+                             emit: StepEmitter = EMITTER) -> Generator[Step, None, Tuple[int, int]]:
+        # Dutch national flag partition: arr[low:lt] < pivot, arr[lt:i] == pivot
+        # and arr[gt + 1:high + 1] > pivot. A copy of the pivot always sits at lt.
+        if pivot_index != low:
+            yield emit.swap(
+                pivot_index, low,
+                template='quick_sort.pivot_to_start', template_args=(arr[pivot_index],)
+            )
+            arr[pivot_index], arr[low] = arr[low], arr[pivot_index]
+        
+        pivot = arr[low]
+        yield emit.pivot(
+            low,
+            template='quick_sort.pivot', template_args=(pivot, low)
+        )
+        
+        lt, i, gt = low, low + 1, high
+        while i <= gt:
+            yield emit.compare(
+                i, lt,
+                template='quick_sort.compare', template_args=(arr[i], pivot)
+            )
+            
+            if arr[i] < pivot:
+                yield emit.swap(
+                    lt, i,
+                    template='quick_sort.move_left', template_args=(arr[i],)
+                )
+                arr[lt], arr[i] = arr[i], arr[lt]
+                lt += 1
+                i += 1
+            elif arr[i] > pivot:
+                if i != gt:
+                    yield emit.swap(
+                        i, gt,
+                        template='quick_sort.move_right', template_args=(arr[i],)
+                    )
+                    arr[i], arr[gt] = arr[gt], arr[i]
+                gt -= 1
+            else:
+                i += 1
+        
+        return lt, gt
\ No newline at end of file
@@ -0,0 +1,83 @@
+from typing import Iterator, List
+from .base_algorithm import BaseAlgorithm
+from ..core.step import EMITTER, Step, StepEmitter
+
+
+class RadixSort(BaseAlgorithm):
+    def __init__(self, base: int = 10):
+        if type(base) is not int or base < 2:
+            raise ValueError(f"Radix sort needs an integer base of at least 2, got {base!r}")
+        super().__init__(
+            name="Radix Sort",
+            description="A non-comparison integer sort that distributes elements by one digit at a time, from the least significant digit up, using a stable counting pass per digit."
+        )
+        self.complexity = {
+            'best': 'O(d·(n + b))',
+            'average': 'O(d·(n + b))',
+            'worst': 'O(d·(n + b))',
+            'space': 'O(n + b)'
+        }
+        self.base = base
+    
+    def validate(self, array: List):
+        if any(type(value) is not int for value in array):
+            raise ValueError("Radix sort requires integer values")
+    
+    def iter_steps(self, array: List, emit: StepEmitter = EMITTER) -> Iterator[Step]:
+        self.validate(array)
+        arr = array.copy()
+        n = len(arr)
+        if n == 0:
+            return
+        
+        # Shift keys so negative numbers sort correctly
+        minimum = min(arr)
+        largest_key = max(arr) - minimum
+        base = self.base
+        
+        exponent = 1
+        digit_position = 1
+        while True:
+            yield emit.highlight(
+                range(n),
+                template='radix_sort.pass',
+                template_args=(digit_position,)
+            )
+            
+            counts = [0] * base
+            emit.allocate(base + n)
+            for value in arr:
+                counts[(value - minimum) // exponent % base] += 1
+            
+            # Turn counts into end positions, then fill from the back to keep the pass stable
+            for digit in range(1, base):
+                counts[digit] += counts[digit - 1]
+            output = [None] * n
+            for value in reversed(arr):
+                digit = (value - minimum) // exponent % base
+                counts[digit] -= 1
+                output[counts[digit]] = value
+            
+            for k, value in enumerate(output):
+                yield emit.overwrite(
+                    k, value,
+                    template='radix_sort.place',
+                    template_args=(value, (value - minimum) // exponent % base, k)
+                )
+            arr = output
+            emit.release(base + n)
+            
+            yield emit.clear_highlight(
+                range(n),
+                "Digit pass completed"
+            )
+            
+            if largest_key // exponent < base:
+                break
+            exponent *= base
+            digit_position += 1
+        
+        yield emit.mark_sorted(
+            range(n),
+            "Every digit has been processed - the array is sorted"
+        )
\ No newline at end of file
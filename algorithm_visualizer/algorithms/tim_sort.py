@@ -0,0 +1,153 @@
+from typing import Generator, Iterator, List, Tuple
+from .helpers import insertion_sort_range
+from .merge_sort import MergeSort
+from ..core.step import EMITTER, Step, StepEmitter
+
+
+class TimSort(MergeSort):
+    """Natural merge sort in the style of Timsort.
+    
+    Existing ascending or strictly descending runs are detected and reused,
+    short runs are extended to `min_merge`-derived length with insertion sort,
+    and runs are merged under Timsort's stack invariants.
+    """
+    
+    MIN_MERGE = 32
+    
+    def __init__(self, min_merge: int = MIN_MERGE):
+        super().__init__()
+        self.name = "Tim Sort"
+        self.description = "A stable hybrid sort that finds naturally ordered runs, extends short runs with insertion sort and merges runs pairwise while keeping the run stack balanced."
+        self.complexity = {
+            'best': 'O(n)',
+            'average': 'O(n log n)',
+            'worst': 'O(n log n)',
+            'space': 'O(n)'
+        }
+        self.min_merge = min_merge
+    
+    def iter_steps(self, array: List, emit: StepEmitter = EMITTER) -> Iterator[Step]:
+        arr = array.copy()
+        n = len(arr)
+        if n == 0:
+            return
+        
+        min_run = self._min_run_length(n)
+        runs: List[Tuple[int, int]] = []
+        low = 0
+        
+        while low < n:
+            run_length = yield from self._count_run(arr, low, n, emit)
+            if run_length < min_run:
+                forced = min(min_run, n - low)
+                yield from insertion_sort_range(arr, low, low + forced - 1, emit)
+                run_length = forced
+            
+            yield emit.highlight(
+                range(low, low + run_length),
+                template='tim_sort.run',
+                template_args=(low, low + run_length - 1)
+            )
+            runs.append((low, run_length))
+            emit.enter()
+            yield from self._merge_collapse(arr, runs, emit)
+            low += run_length
+        
+        while len(runs) > 1:
+            index = len(runs) - 2
+            if index > 0 and runs[index - 1][1] < runs[index + 1][1]:
+                index -= 1
+            yield from self._merge_at(arr, runs, index, emit)
+        emit.leave()
+        
+        yield emit.mark_sorted(
+            range(n),
+            "All runs merged - the array is sorted"
+        )
+    
+    def _min_run_length(self, n: int) -> int:
+        remainder = 0
+        while n >= self.min_merge:
+            remainder |= n & 1
+            n >>= 1
+        return n + remainder
+    
+    def _count_run(self, arr: List, low: int, n: int, emit: StepEmitter = EMITTER) -> Generator[Step, None, int]:
+        high = low + 1
+        if high == n:
+            return 1
+        
+        yield emit.compare(
+            low, high,
+            template='tim_sort.run_compare',
+            template_args=(arr[low], arr[high])
+        )
+        if arr[high] < arr[low]:
+            # Strictly descending runs are reversed; equal elements would
+            # lose their order, so they end the run
+            while high + 1 < n:
+                yield emit.compare(
+                    high, high + 1,
+                    template='tim_sort.run_compare',
+                    template_args=(arr[high], arr[high + 1])
+                )
+                if not arr[high + 1] < arr[high]:
+                    break
+                high += 1
+            
+            left, right = low, high
+            while left < right:
+                yield emit.swap(
+                    left, right,
+                    template='tim_sort.reverse',
+                    template_args=(arr[left], arr[right])
+                )
+                arr[left], arr[right] = arr[right], arr[left]
+                left += 1
+                right -= 1
+        else:
+            while high + 1 < n:
+                yield emit.compare(
+                    high, high + 1,
+                    template='tim_sort.run_compare',
+                    template_args=(arr[high], arr[high + 1])
+                )
+                if arr[high + 1] < arr[high]:
+                    break
+                high += 1
+        
+        return high - low + 1
+    
+    def _merge_collapse(self, arr: List, runs: List[Tuple[int, int]], emit: StepEmitter = EMITTER) -> Iterator[Step]:
+        # Keep run lengths decreasing faster than Fibonacci so merges stay balanced
+        while len(runs) > 1:
+            index = len(runs) - 2
+            if ((index > 0 and runs[index - 1][1] <= runs[index][1] + runs[index + 1][1])
+                    or (index > 1 and runs[index - 2][1] <= runs[index - 1][1] + runs[index][1])):
+                if runs[index - 1][1] < runs[index + 1][1]:
+                    index -= 1
+            elif runs[index][1] > runs[index + 1][1]:
+                break
+            yield from self._merge_at(arr, runs, index, emit)
+    
+    def _merge_at(self, arr: List, runs: List[Tuple[int, int]], index: int,
+                  emit: StepEmitter = EMITTER) -> Iterator[Step]:
+        start, length = runs[index]
+        _, next_length = runs[index + 1]
+        mid = start + length - 1
+        right = mid + next_length
+        
+        yield emit.highlight(
+            range(start, right + 1),
+            template='tim_sort.merge_runs',
+            template_args=(start, mid, right)
+        )
+        yield from self._merge(arr, start, mid, right, emit)
+        yield emit.clear_highlight(
+            range(start, right + 1),
+            "Merge operation completed"
+        )
+        
+        runs[index] = (start, length + next_length)
+        del runs[index + 1]
+        emit.leave()
\ No newline at end of file
@@ -0,0 +1,3 @@
+from .suite import run_suite, run_case, compare_results, make_input, save_results, load_results
+
+__all__ = ['run_suite', 'run_case', 'compare_results', 'make_input', 'save_results', 'load_results']
\ No newline at end of file
@@ -0,0 +1,75 @@
+import argparse
+import sys
+from .suite import (
+    BENCHMARKS, DISTRIBUTIONS, DEFAULT_SIZES, QUADRATIC_SIZE_LIMIT,
+    run_suite, compare_results, save_results, load_results
+)
+
+
+def _print_entry(entry: dict):
+    label = f"{entry['benchmark']:<10} {entry['algorithm']:<8} {entry['distribution']:<11} {entry['size']:>7}"
+    if entry['status'] == 'ok':
+        print(f"{label}  {entry['seconds'] * 1000:10.2f} ms  {entry['peak_bytes'] / 1e6:9.2f} MB  {entry['steps']:>10} steps")
+    else:
+        print(f"{label}  {entry['status']}: {entry['reason']}")
+
+
+def _run(args) -> int:
+    results = run_suite(
+        sizes=args.sizes,
+        distributions=args.distributions,
+        benchmarks=args.benchmarks,
+        repeat=args.repeat,
+        seed=args.seed,
+        quadratic_size_limit=args.quadratic_limit,
+        progress=_print_entry
+    )
+    save_results(results, args.output)
+    print(f"\nResults written to {args.output}")
+    return 0
+
+
+def _compare(args) -> int:
+    comparisons = compare_results(load_results(args.baseline), load_results(args.current), args.threshold)
+    regressions = [item for item in comparisons if item['regression']]
+    
+    for item in comparisons:
+        marker = "REGRESSION" if item['regression'] else ""
+        print(f"{item['benchmark']:<10} {item['algorithm']:<8} {item['distribution']:<11} {item['size']:>7}"
+              f"  time x{item['time_ratio']:.2f}  memory x{item['memory_ratio']:.2f}  {marker}")
+    
+    print(f"\n{len(regressions)} regression(s) in {len(comparisons)} comparable case(s)")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m algorithm_visualizer.benchmarks",
+        description="Benchmark algorithm execution, timeline construction and serialization"
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = subparsers.add_parser('run', help="Run the benchmark suite")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    run_parser.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS, default=DISTRIBUTIONS)
+    run_parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS, default=BENCHMARKS)
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--quadratic-limit', type=int, default=QUADRATIC_SIZE_LIMIT,
+                            help="Skip O(n²) cases above this input size")
+    run_parser.add_argument('--output', default='benchmark_results.json')
+    run_parser.set_defaults(handler=_run)
+    
+    compare_parser = subparsers.add_parser('compare', help="Compare two result files")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="Relative slowdown or memory growth treated as a regression")
+    compare_parser.set_defaults(handler=_compare)
+    
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
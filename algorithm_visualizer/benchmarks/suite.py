@@ -0,0 +1,220 @@
+import json
+import platform
+import random
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from ..algorithms import (
+    BubbleSort, QuickSort, MergeSort, HeapSort, IntroSort, TimSort, RadixSort, CountingSort
+)
+from ..algorithms.base_algorithm import BaseAlgorithm
+from ..core.timeline import Timeline
+
+
+BENCHMARKS = ['execute', 'stats', 'add_step', 'seek', 'serialize']
+DISTRIBUTIONS = ['random', 'sorted', 'reversed', 'few_unique']
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+# Quadratic cases above this size take minutes to hours and are skipped
+QUADRATIC_SIZE_LIMIT = 2000
+# Keyframe spacing used for the timelines built by the suite
+KEYFRAME_INTERVAL = 1024
+# Number of random positions reconstructed by the seek benchmark
+SEEK_SAMPLES = 50
+# The JSON payload holds one full array per step; bigger cases are skipped
+SERIALIZE_VALUE_LIMIT = 20_000_000
+
+RESULTS_VERSION = 1
+
+
+def default_algorithms() -> Dict[str, BaseAlgorithm]:
+    return {
+        'bubble': BubbleSort(),
+        'quick': QuickSort(),
+        'merge': MergeSort(),
+        'merge_bottom_up': MergeSort(bottom_up=True),
+        'heap': HeapSort(),
+        'intro': IntroSort(),
+        'tim': TimSort(),
+        'radix': RadixSort(),
+        'counting': CountingSort()
+    }
+
+
+def make_input(distribution: str, size: int, seed: int = 0) -> List[int]:
+    rng = random.Random(seed)
+    if distribution == 'random':
+        return [rng.randint(1, size * 10) for _ in range(size)]
+    if distribution == 'sorted':
+        return list(range(1, size + 1))
+    if distribution == 'reversed':
+        return list(range(size, 0, -1))
+    if distribution == 'few_unique':
+        return [rng.randint(1, 5) for _ in range(size)]
+    raise ValueError(f"Unknown distribution: {distribution}")
+
+
+def _is_quadratic(algorithm: BaseAlgorithm, distribution: str) -> bool:
+    # Random input hits the average case; ordered or duplicate-heavy input
+    # is where the simple sorts degrade to their worst case
+    case = 'average' if distribution == 'random' else 'worst'
+    return '²' in algorithm.complexity.get(case, '')
+
+
+def _measure(func: Callable[[], object], repeat: int) -> Tuple[float, int]:
+    """Return the best wall time over `repeat` runs and the peak traced memory."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    
+    # Tracing slows execution down, so memory is measured on a separate run
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def _load_serializer() -> Optional[Callable]:
+    try:
+        from ..web.flask_app import serialize_timeline
+    except ImportError:
+        return None
+    return serialize_timeline
+
+
+def run_case(benchmark: str, algorithm_name: str, algorithm: BaseAlgorithm,
+             array: List[int], repeat: int = 3, seed: int = 0) -> dict:
+    timeline = algorithm.execute(array, keyframe_interval=KEYFRAME_INTERVAL)
+    steps = timeline.get_total_steps()
+    
+    if benchmark == 'execute':
+        func = lambda: algorithm.execute(array, keyframe_interval=KEYFRAME_INTERVAL)
+    
+    elif benchmark == 'stats':
+        func = lambda: algorithm.collect_stats(array)
+    
+    elif benchmark == 'add_step':
+        step_list = list(timeline.steps)
+        
+        def func():
+            target = Timeline(array, KEYFRAME_INTERVAL)
+            for step in step_list:
+                target.add_step(step)
+    
+    elif benchmark == 'seek':
+        rng = random.Random(seed)
+        positions = [rng.randint(0, steps) for _ in range(SEEK_SAMPLES)]
+        
+        def func():
+            for position in positions:
+                timeline.get_state_at(position)
+    
+    elif benchmark == 'serialize':
+        serialize_timeline = _load_serializer()
+        if serialize_timeline is None:
+            return {'status': 'skipped', 'reason': 'flask is not installed', 'steps': steps}
+        if (steps + 1) * len(array) > SERIALIZE_VALUE_LIMIT:
+            return {'status': 'skipped', 'reason': 'payload above serialize limit', 'steps': steps}
+        func = lambda: json.dumps(serialize_timeline(timeline, algorithm_name))
+    
+    else:
+        raise ValueError(f"Unknown benchmark: {benchmark}")
+    
+    seconds, peak_bytes = _measure(func, repeat)
+    return {'status': 'ok', 'seconds': seconds, 'peak_bytes': peak_bytes, 'steps': steps}
+
+
+def run_suite(sizes: Iterable[int] = DEFAULT_SIZES,
+              distributions: Iterable[str] = DISTRIBUTIONS,
+              benchmarks: Iterable[str] = BENCHMARKS,
+              algorithms: Optional[Dict[str, BaseAlgorithm]] = None,
+              repeat: int = 3, seed: int = 0,
+              quadratic_size_limit: int = QUADRATIC_SIZE_LIMIT,
+              progress: Optional[Callable[[dict], None]] = None) -> dict:
+    algorithms = algorithms or default_algorithms()
+    results = []
+    
+    for benchmark in benchmarks:
+        for algorithm_name, algorithm in algorithms.items():
+            for distribution in distributions:
+                for size in sizes:
+                    entry = {
+                        'benchmark': benchmark,
+                        'algorithm': algorithm_name,
+                        'distribution': distribution,
+                        'size': size
+                    }
+                    
+                    if size > quadratic_size_limit and _is_quadratic(algorithm, distribution):
+                        entry.update(status='skipped', reason='quadratic case above size limit')
+                    else:
+                        try:
+                            entry.update(run_case(
+                                benchmark, algorithm_name, algorithm,
+                                make_input(distribution, size, seed), repeat, seed
+                            ))
+                        except RecursionError:
+                            entry.update(status='error', reason='recursion limit exceeded')
+                    
+                    results.append(entry)
+                    if progress:
+                        progress(entry)
+    
+    return {
+        'version': RESULTS_VERSION,
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'seed': seed,
+            'keyframe_interval': KEYFRAME_INTERVAL
+        },
+        'results': results
+    }
+
+
+def _result_key(entry: dict) -> Tuple:
+    return entry['benchmark'], entry['algorithm'], entry['distribution'], entry['size']
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.10) -> List[dict]:
+    """Pair up matching cases and flag those that got slower or bigger than `threshold`."""
+    baseline_by_key = {
+        _result_key(entry): entry for entry in baseline['results'] if entry.get('status') == 'ok'
+    }
+    
+    comparisons = []
+    for entry in current['results']:
+        previous = baseline_by_key.get(_result_key(entry))
+        if previous is None or entry.get('status') != 'ok':
+            continue
+        
+        time_ratio = entry['seconds'] / previous['seconds'] if previous['seconds'] else 1.0
+        memory_ratio = entry['peak_bytes'] / previous['peak_bytes'] if previous['peak_bytes'] else 1.0
+        comparisons.append({
+            'benchmark': entry['benchmark'],
+            'algorithm': entry['algorithm'],
+            'distribution': entry['distribution'],
+            'size': entry['size'],
+            'time_ratio': time_ratio,
+            'memory_ratio': memory_ratio,
+            'regression': time_ratio > 1 + threshold or memory_ratio > 1 + threshold
+        })
+    return comparisons
+
+
+def save_results(results: dict, path: str):
+    with open(path, 'w') as handle:
+        json.dump(results, handle, indent=2)
+
+
+def load_results(path: str) -> dict:
+    with open(path) as handle:
+        return json.load(handle)
\ No newline at end of file
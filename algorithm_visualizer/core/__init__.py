@@ -1,5 +1,14 @@
-from .step import Step, StepType
+from .step import Step, StepType, StepEmitter
 from .timeline import Timeline
-from .array_state import ArrayState
+from .array_state import ArrayState, ArrayStateView
+from .cursor import TimelineCursor
+from .step_store import StepStore
+from .index_set import IndexSet
+from .stats import StepStats, ProbingEmitter, CountingEmitter
+from .sinks import StepSink, FanOutSink, FileSink, StreamSink, read_trace
+from .trace_file import TraceWriter, MappedTimeline
 
-__all__ = ['Step', 'StepType', 'Timeline', 'ArrayState']
\ No newline at end of file
+__all__ = ['Step', 'StepType', 'Timeline', 'ArrayState', 'ArrayStateView', 'TimelineCursor', 'StepStore', 'IndexSet',
+           'StepEmitter', 'StepStats', 'ProbingEmitter', 'CountingEmitter',
+           'StepSink', 'FanOutSink', 'FileSink', 'StreamSink', 'read_trace',
+           'TraceWriter', 'MappedTimeline']
\ No newline at end of file
@@ -1,16 +1,37 @@
-from typing import List, Any, Optional
+from typing import AbstractSet, List, Any, Optional, Sequence
 from dataclasses import dataclass, field
 import copy
+from .index_set import IndexSet
+from .step import StepType
 
 
 @dataclass
 class ArrayState:
     values: List[Any]
-    sorted_indices: List[int] = field(default_factory=list)
-    highlighted_indices: List[int] = field(default_factory=list)
+    # Lists passed here are converted to IndexSets by __post_init__
+    sorted_indices: IndexSet = field(default_factory=IndexSet)
+    highlighted_indices: IndexSet = field(default_factory=IndexSet)
     pivot_index: Optional[int] = None
     comparing_indices: List[int] = field(default_factory=list)
     
+    def __post_init__(self):
+        if not isinstance(self.sorted_indices, IndexSet):
+            self.sorted_indices = IndexSet(self.sorted_indices, size=len(self.values))
+        if not isinstance(self.highlighted_indices, IndexSet):
+            self.highlighted_indices = IndexSet(self.highlighted_indices, size=len(self.values))
+    
+    def __eq__(self, other) -> bool:
+        # Written out because `values` may be an ndarray, whose == is elementwise
+        if not isinstance(other, ArrayState):
+            return NotImplemented
+        return (
+            _as_list(self.values) == _as_list(other.values)
+            and self.sorted_indices == other.sorted_indices
+            and self.highlighted_indices == other.highlighted_indices
+            and self.pivot_index == other.pivot_index
+            and self.comparing_indices == other.comparing_indices
+        )
+    
     def copy(self) -> 'ArrayState':
         return ArrayState(
             values=self.values.copy(),
@@ -23,32 +44,193 @@ class ArrayState:
     def apply_step(self, step, current_values: List[Any]) -> List[Any]:
         new_values = current_values.copy()
         
-        if step.type.value == "swap":
+        if step.type is StepType.SWAP:
             idx1, idx2 = step.indices
             new_values[idx1], new_values[idx2] = new_values[idx2], new_values[idx1]
             
-        elif step.type.value == "overwrite":
+        elif step.type is StepType.OVERWRITE:
             idx = step.indices[0]
             new_values[idx] = step.values[0]
             
         return new_values
     
+    def advance(self, step):
+        """Apply `step` in place and return an undo record for `retreat`."""
+        previous_comparing = self.comparing_indices
+        step_type = step.type
+        undo = None
+        self.comparing_indices = []
+        
+        if step_type is StepType.COMPARE:
+            self.comparing_indices = step.indices
+            
+        elif step_type is StepType.SWAP:
+            idx1, idx2 = step.indices
+            self.values[idx1], self.values[idx2] = self.values[idx2], self.values[idx1]
+            
+        elif step_type is StepType.OVERWRITE:
+            idx = step.indices[0]
+            undo = self.values[idx]
+            self.values[idx] = step.values[0]
+            
+        elif step_type is StepType.MARK_SORTED:
+            undo = self.sorted_indices.update(step.indices)
+            
+        elif step_type is StepType.HIGHLIGHT:
+            undo = self.highlighted_indices.replace(step.indices)
+            
+        elif step_type is StepType.CLEAR_HIGHLIGHT:
+            undo = self.highlighted_indices.difference_update(step.indices)
+            
+        elif step_type is StepType.PIVOT:
+            undo = self.pivot_index
+            self.pivot_index = step.indices[0]
+            
+        return previous_comparing, undo
+    
+    def retreat(self, step, undo):
+        previous_comparing, data = undo
+        step_type = step.type
+        
+        if step_type is StepType.SWAP:
+            idx1, idx2 = step.indices
+            self.values[idx1], self.values[idx2] = self.values[idx2], self.values[idx1]
+            
+        elif step_type is StepType.OVERWRITE:
+            self.values[step.indices[0]] = data
+            
+        elif step_type is StepType.MARK_SORTED:
+            self.sorted_indices.restore(data)
+            
+        elif step_type is StepType.HIGHLIGHT or step_type is StepType.CLEAR_HIGHLIGHT:
+            self.highlighted_indices.restore(data)
+            
+        elif step_type is StepType.PIVOT:
+            self.pivot_index = data
+            
+        self.comparing_indices = previous_comparing
+    
     def update_state(self, step):
         self.comparing_indices = []
+        step_type = step.type
         
-        if step.type.value == "compare":
+        if step_type is StepType.COMPARE:
             self.comparing_indices = step.indices
             
-        elif step.type.value == "mark_sorted":
-            self.sorted_indices.extend(step.indices)
+        elif step_type is StepType.MARK_SORTED:
+            self.sorted_indices.update(step.indices)
             
-        elif step.type.value == "highlight":
-            self.highlighted_indices = step.indices
+        elif step_type is StepType.HIGHLIGHT:
+            self.highlighted_indices.replace(step.indices)
             
-        elif step.type.value == "clear_highlight":
-            for idx in step.indices:
-                if idx in self.highlighted_indices:
-                    self.highlighted_indices.remove(idx)
-                    
-        elif step.type.value == "pivot":
-            self.pivot_index = step.indices[0]
\ No newline at end of file
+        elif step_type is StepType.CLEAR_HIGHLIGHT:
+            self.highlighted_indices.difference_update(step.indices)
+            
+        elif step_type is StepType.PIVOT:
+            self.pivot_index = step.indices[0]
+
+
+def _as_list(values):
+    # NumPy-backed states hold an ndarray; compare those as plain lists
+    to_list = getattr(values, 'tolist', None)
+    return values if isinstance(values, list) or to_list is None else to_list()
+
+
+class _ReadOnlyList(Sequence):
+    __slots__ = ('_items',)
+    
+    def __init__(self, items: List[Any]):
+        self._items = items
+    
+    def __getitem__(self, index):
+        return self._items[index]
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __iter__(self):
+        return iter(self._items)
+    
+    def __contains__(self, item) -> bool:
+        return item in self._items
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, _ReadOnlyList):
+            other = other._items
+        return _as_list(self._items) == _as_list(other)
+    
+    def __repr__(self) -> str:
+        return repr(self._items)
+    
+    def copy(self) -> List[Any]:
+        return list(self._items)
+
+
+class _ReadOnlySet(AbstractSet):
+    __slots__ = ('_items',)
+    
+    def __init__(self, items: IndexSet):
+        self._items = items
+    
+    def __contains__(self, item) -> bool:
+        return item in self._items
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __iter__(self):
+        return iter(self._items)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, _ReadOnlySet):
+            other = other._items
+        return self._items == other
+    
+    def __repr__(self) -> str:
+        return repr(self._items)
+    
+    def copy(self) -> IndexSet:
+        return self._items.copy()
+
+
+class ArrayStateView:
+    """Read-only, zero-copy view of an ArrayState.
+    
+    A view tracks the state it wraps, so it is only meaningful until the
+    owning timeline moves again; call `copy()` to keep a snapshot.
+    """
+    __slots__ = ('_state',)
+    
+    def __init__(self, state: ArrayState):
+        self._state = state
+    
+    @property
+    def values(self) -> Sequence[Any]:
+        return _ReadOnlyList(self._state.values)
+    
+    @property
+    def sorted_indices(self) -> AbstractSet[int]:
+        return _ReadOnlySet(self._state.sorted_indices)
+    
+    @property
+    def highlighted_indices(self) -> AbstractSet[int]:
+        return _ReadOnlySet(self._state.highlighted_indices)
+    
+    @property
+    def pivot_index(self) -> Optional[int]:
+        return self._state.pivot_index
+    
+    @property
+    def comparing_indices(self) -> Sequence[int]:
+        return _ReadOnlyList(self._state.comparing_indices)
+    
+    def copy(self) -> ArrayState:
+        return self._state.copy()
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ArrayStateView):
+            other = other._state
+        return self._state == other
+    
+    def __repr__(self) -> str:
+        return f"ArrayStateView({self._state!r})"
\ No newline at end of file
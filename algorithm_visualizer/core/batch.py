@@ -0,0 +1,102 @@
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .array_state import ArrayState
+from .step import Step, StepType
+from .step_store import StepStore, _INT_VALUE, _TYPE_CODES
+
+
+# Shorter runs are replayed step by step; decoding the columns costs more
+BATCH_MIN_STEPS = 32
+
+_COMPARE = _TYPE_CODES[StepType.COMPARE]
+_SWAP = _TYPE_CODES[StepType.SWAP]
+_OVERWRITE = _TYPE_CODES[StepType.OVERWRITE]
+_MARK_SORTED = _TYPE_CODES[StepType.MARK_SORTED]
+_HIGHLIGHT = _TYPE_CODES[StepType.HIGHLIGHT]
+_CLEAR_HIGHLIGHT = _TYPE_CODES[StepType.CLEAR_HIGHLIGHT]
+_PIVOT = _TYPE_CODES[StepType.PIVOT]
+
+
+def apply_steps(state: ArrayState, steps: Sequence[Step], start: int, stop: int) -> ArrayState:
+    """Apply `steps[start:stop]` to `state` in place and return it.
+    
+    For a StepStore, NumPy reads the type, index and value columns directly
+    and splits the run into value changes and everything else, which touch
+    disjoint parts of the state. Swaps and overwrites are replayed over
+    plain integers (or, for an ndarray and no swaps, as one scatter write),
+    and only the sorted-marker steps plus the last highlight and pivot are
+    built as Step objects; comparisons only matter if they come last. Without NumPy,
+    or for short runs, each step is applied with `advance`.
+    """
+    if np is None or not isinstance(steps, StepStore) or stop - start < BATCH_MIN_STEPS:
+        for position in range(start, stop):
+            state.advance(steps[position])
+        return state
+    
+    # Slicing the array.array columns copies them, so a timeline still being
+    # appended to on another thread never sees its buffers exported
+    codes = np.frombuffer(steps._types[start:stop], dtype=np.uint8)
+    offsets = np.frombuffer(steps._index_offsets[start:stop + 1], dtype=np.uint64).astype(np.int64)
+    indices = np.array(steps._indices[offsets[0]:offsets[-1]], dtype=np.int32)
+    offsets -= offsets[0]
+    
+    is_value_step = (codes == _SWAP) | (codes == _OVERWRITE)
+    value_positions = np.flatnonzero(is_value_step)
+    if len(value_positions):
+        _apply_value_steps(state, steps, start, codes, indices, offsets, value_positions)
+    
+    # A highlight replaces the whole highlighted set and a pivot replaces the
+    # last one, so only the final highlight (and clears after it) and the
+    # final pivot matter; every sorted marker does
+    marker_steps = codes == _MARK_SORTED
+    highlights = np.flatnonzero(codes == _HIGHLIGHT)
+    tail = codes[highlights[-1] if len(highlights) else 0:]
+    marker_steps[len(codes) - len(tail):] |= (tail == _HIGHLIGHT) | (tail == _CLEAR_HIGHLIGHT)
+    pivots = np.flatnonzero(codes == _PIVOT)
+    if len(pivots):
+        marker_steps[pivots[-1]] = True
+    for position in np.flatnonzero(marker_steps).tolist():
+        state.advance(steps[start + position])
+    
+    state.comparing_indices = steps[stop - 1].indices if codes[-1] == _COMPARE else []
+    return state
+
+
+def _apply_value_steps(state: ArrayState, steps: StepStore, start: int, codes, indices, offsets, positions):
+    is_swap = codes[positions] == _SWAP
+    first = indices[offsets[positions]]
+    # Overwrites have a single index, so their second entry is never used
+    second = indices[np.minimum(offsets[positions] + 1, len(indices) - 1)]
+    
+    # Integer values live in a column; anything else is in the side table
+    flags = np.frombuffer(steps._flags[start:start + int(positions[-1]) + 1], dtype=np.uint8)[positions]
+    ints = np.frombuffer(steps._values[start:start + int(positions[-1]) + 1], dtype=np.int64)[positions]
+    new_values = ints.tolist()
+    for slot in np.flatnonzero(~is_swap & ((flags & _INT_VALUE) == 0)).tolist():
+        new_values[slot] = steps[start + int(positions[slot])].values[0]
+    
+    values = state.values
+    if isinstance(values, np.ndarray) and not is_swap.any():
+        # Pure overwrite runs (merges, counting and radix passes) become one
+        # scatter write. Fancy assignment has no defined order for repeated
+        # targets, so only the last write to each index is kept
+        _, last = np.unique(first[::-1], return_index=True)
+        keep = len(first) - 1 - last
+        values[first[keep]] = np.asarray(new_values, dtype=values.dtype)[keep]
+        return
+    
+    # Swaps depend on each other, so they are replayed in order over plain
+    # Python ints, on a list copy of an ndarray
+    target = values.tolist() if isinstance(values, np.ndarray) else values
+    for swap, i, j, value in zip(is_swap.tolist(), first.tolist(), second.tolist(), new_values):
+        if swap:
+            target[i], target[j] = target[j], target[i]
+        else:
+            target[i] = value
+    if target is not values:
+        values[:] = target
\ No newline at end of file
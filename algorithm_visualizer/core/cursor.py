@@ -0,0 +1,96 @@
+from typing import List, Optional, Tuple
+from .array_state import ArrayState
+from .batch import BATCH_MIN_STEPS, apply_steps
+
+
+# Steps before the target that a jump still walks one at a time, so that
+# stepping back from where it lands can use undo records
+UNDO_TAIL = 64
+
+
+class TimelineCursor:
+    """Live state that walks a timeline one step at a time.
+    
+    Moving forward applies the next step in place, moving backward applies
+    the recorded inverse, so a tick costs O(changed indices) instead of a
+    full copy. Jumps past the undo history rebuild from the nearest keyframe,
+    and long jumps apply most of the way in one batch (see core.batch).
+    """
+    
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self._state: Optional[ArrayState] = None
+        self._index = 0
+        self._base = 0
+        self._next_keyframe: Optional[int] = None
+        self._steps_known = 0
+        self._undo: List[Tuple] = []
+    
+    @property
+    def index(self) -> int:
+        return self._index
+    
+    def move_to(self, index: int) -> ArrayState:
+        """Move to the state after `index` steps and return it (not a copy)."""
+        timeline = self.timeline
+        if not 0 <= index <= len(timeline.steps):
+            raise IndexError("timeline state index out of range")
+        
+        if not timeline.is_delta_encoded:
+            self._index = index
+            return timeline.array_states[index]
+        
+        if self._state is None or index < self._base:
+            self._rebuild(index)
+        elif index > self._index:
+            if timeline.keyframe_position(index) > self._index:
+                self._rebuild(index)
+            else:
+                self._skip_to(index)
+        
+        while self._index < index:
+            self._forward()
+        while self._index > index:
+            self._backward()
+        return self._state
+    
+    def _rebuild(self, index: int):
+        self._base, self._state = self.timeline.nearest_keyframe(index)
+        self._index = self._base
+        self._undo = []
+        self._skip_to(index)
+        self._find_next_keyframe()
+    
+    def _find_next_keyframe(self):
+        self._next_keyframe = self.timeline.next_keyframe_position(self._index)
+        self._steps_known = len(self.timeline.steps)
+    
+    def _skip_to(self, index: int):
+        # Batch-apply all but the last UNDO_TAIL steps; the history behind
+        # the new base is dropped, as after crossing a keyframe
+        stop = index - UNDO_TAIL
+        if stop - self._index >= BATCH_MIN_STEPS:
+            apply_steps(self._state, self.timeline.steps, self._index, stop)
+            self._base = self._index = stop
+            self._undo = []
+    
+    def _forward(self):
+        if self._next_keyframe is None and len(self.timeline.steps) > self._steps_known:
+            # The timeline has grown since the last lookup (e.g. a job still
+            # generating it), so keyframes may have been added ahead of us
+            self._find_next_keyframe()
+        
+        step = self.timeline.steps[self._index]
+        self._undo.append(self._state.advance(step))
+        self._index += 1
+        
+        # Crossing a keyframe means everything behind it can be rebuilt
+        # cheaply, so the undo history never grows beyond one interval.
+        if self._index == self._next_keyframe:
+            self._base = self._index
+            self._undo = []
+            self._find_next_keyframe()
+    
+    def _backward(self):
+        self._index -= 1
+        self._state.retreat(self.timeline.steps[self._index], self._undo.pop())
\ No newline at end of file
@@ -1,7 +1,72 @@
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Tuple
 from .step import StepType
 
 
+# Explanation templates referenced by `Step.template`. Algorithms emit the
+# template id and its arguments; the text is only formatted when displayed.
+STEP_TEMPLATES = {
+    'bubble_sort.pass': "Pass {0}: Checking unsorted portion",
+    'bubble_sort.compare': "Comparing elements at positions {0} and {1}",
+    'bubble_sort.swap': "Swapping {0} and {1} - they are in wrong order",
+    'bubble_sort.sorted': "Element at position {0} is now in its final position",
+    'quick_sort.pivot': "Choosing {0} as pivot element at position {1}",
+    'quick_sort.compare': "Comparing {0} with pivot {1}",
+    'quick_sort.move_left': "Moving {0} to left of pivot",
+    'quick_sort.place_pivot': "Placing pivot {0} in its final position",
+    'quick_sort.pivot_sorted': "Pivot element {0} is now in its final position at index {1}",
+    'quick_sort.median_compare': "Choosing a pivot: comparing candidates {0} and {1}",
+    'quick_sort.pivot_to_end': "Moving pivot {0} to the end of the partition",
+    'quick_sort.pivot_to_start': "Moving pivot {0} to the start of the partition",
+    'quick_sort.move_right': "Moving {0} to right of pivot",
+    'quick_sort.equal_sorted': "All elements equal to pivot {0} are now in their final positions {1} to {2}",
+    'merge_sort.divide': "Dividing array from index {0} to {1}",
+    'merge_sort.merge': "Merging left subarray [{0}:{1}] with right subarray [{1}:{2}]",
+    'merge_sort.runs': "Merging sorted runs of width {0} from index {1} to {2}",
+    'merge_sort.compare': "Comparing {0} with {1}",
+    'merge_sort.place': "Placing {0} at position {1}",
+    'merge_sort.copy_remaining': "Copying remaining {0} to position {1}",
+    'merge_sort.sorted': "Element {0} is in its final sorted position",
+    'heap_sort.compare_children': "Comparing children {0} and {1} to find the larger one",
+    'heap_sort.compare_parent': "Comparing parent {0} with its larger child {1}",
+    'heap_sort.sift': "Sifting {0} down below {1} to restore the heap",
+    'heap_sort.extract': "Moving the maximum {0} to position {1}",
+    'heap_sort.sorted': "Element {0} is now in its final position at index {1}",
+    'insertion.compare': "Comparing {0} with {1} to find the insertion point",
+    'insertion.shift': "Shifting {0} left past {1}",
+    'intro_sort.median_compare': "Median of three: comparing {0} with {1}",
+    'intro_sort.median_swap': "Median of three: ordering {0} and {1}",
+    'intro_sort.pivot_to_end': "Moving median {0} to the end to use as pivot",
+    'intro_sort.fallback': "Recursion too deep - heap sorting indices {0} to {1}",
+    'intro_sort.insertion': "Small partition - insertion sorting indices {0} to {1}",
+    'intro_sort.range_sorted': "Indices {0} to {1} are now in their final positions",
+    'tim_sort.run_compare': "Extending the current run: comparing {0} with {1}",
+    'tim_sort.reverse': "Reversing a descending run: swapping {0} and {1}",
+    'tim_sort.run': "Run from index {0} to {1} is ready",
+    'tim_sort.merge_runs': "Merging runs [{0}..{1}] and [{1}+1..{2}]",
+    'radix_sort.pass': "Distributing elements by digit {0}",
+    'radix_sort.place': "Placing {0} (digit {1}) at position {2}",
+    'counting_sort.count': "Counting value {0} - seen {1} time(s) so far",
+    'counting_sort.place': "Writing {0} to position {1}",
+    'counting_sort.sorted': "Element {0} is in its final position at index {1}"
+}
+
+RENDER_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_cached(template: str, args: Tuple) -> str:
+    return STEP_TEMPLATES[template].format(*args)
+
+
+def render_template(template: str, args: Tuple = ()) -> str:
+    try:
+        return _render_cached(template, args)
+    except TypeError:
+        # Unhashable arguments cannot be cached
+        return STEP_TEMPLATES[template].format(*args)
+
+
 class ExplanationEngine:
     def __init__(self):
         self.step_explanations = {
@@ -30,12 +95,39 @@ class ExplanationEngine:
                 'strategy': 'Divide array into halves and merge back in order',
                 'key_idea': 'Stable sort with guaranteed O(n log n) time complexity',
                 'when_to_use': 'When stability is required, external sorting, linked lists'
+            },
+            'heap_sort': {
+                'strategy': 'Build a max-heap, then repeatedly move the maximum to the end',
+                'key_idea': 'In-place sort with guaranteed O(n log n) time complexity',
+                'when_to_use': 'When memory is tight and worst-case guarantees matter'
+            },
+            'intro_sort': {
+                'strategy': 'Quick sort that falls back to heap sort and insertion sort',
+                'key_idea': 'Fast average case of quick sort without its O(n²) worst case',
+                'when_to_use': 'General-purpose in-place sorting, as in many standard libraries'
+            },
+            'tim_sort': {
+                'strategy': 'Find naturally ordered runs and merge them in a balanced order',
+                'key_idea': 'Adapts to existing order - nearly sorted input takes close to O(n)',
+                'when_to_use': 'Real-world data with partial order; stable sorting'
+            },
+            'radix_sort': {
+                'strategy': 'Stably distribute elements by each digit, least significant first',
+                'key_idea': 'No comparisons - time grows with the number of digits, not log n',
+                'when_to_use': 'Large arrays of bounded integers or fixed-length keys'
+            },
+            'counting_sort': {
+                'strategy': 'Count occurrences of each value and write them back in order',
+                'key_idea': 'Linear time when the value range k is small compared to n',
+                'when_to_use': 'Integers from a small range, e.g. grades or ages'
             }
         }
     
     def get_step_explanation(self, step, algorithm_name: str = "") -> str:
         if step.explanation:
             return step.explanation
+        if step.template:
+            return render_template(step.template, tuple(step.template_args))
             
         explanation_func = self.step_explanations.get(step.type)
         if explanation_func:
@@ -0,0 +1,175 @@
+import operator
+from collections.abc import Set
+from typing import Iterable, Iterator, List, Tuple
+
+
+# Undo records are (start, previous bytes) segments of the membership map
+Segments = List[Tuple[int, bytes]]
+
+_ONES = b'\x01'
+
+
+def _as_index(index) -> int:
+    # numpy integers and other integral types become plain ints; negative
+    # values would wrap around the membership map, so they are rejected
+    index = operator.index(index)
+    if index < 0:
+        raise ValueError(f"IndexSet members must be non-negative, got {index}")
+    return index
+
+
+class IndexSet(Set):
+    """Set of array indices backed by a byte-per-index membership map.
+    
+    Membership and single-index updates are O(1). Contiguous updates given
+    as a `range` are applied with slice assignment, so marking or clearing
+    a region costs one C-level memset instead of a Python loop. Members are
+    also tracked by a [low, high) bound so iteration and clearing only touch
+    the populated span. Iteration is in ascending index order. Members are
+    non-negative integers; any integral type, e.g. a numpy integer, is
+    stored as a plain int.
+    
+    The mutating methods return undo segments that `restore` reapplies,
+    which is how ArrayState steps backwards without copying the whole set.
+    """
+    __slots__ = ('_flags', '_count', '_low', '_high')
+    
+    def __init__(self, indices: Iterable[int] = (), size: int = 0):
+        self._flags = bytearray(size)
+        self._count = 0
+        self._low = self._high = 0
+        self.update(indices)
+    
+    def __contains__(self, index) -> bool:
+        if type(index) is not int:
+            try:
+                index = operator.index(index)
+            except TypeError:
+                return False
+        flags = self._flags
+        return 0 <= index < len(flags) and flags[index] == 1
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __iter__(self) -> Iterator[int]:
+        flags, index, high = self._flags, self._low, self._high
+        while True:
+            index = flags.find(_ONES, index, high)
+            if index < 0:
+                return
+            yield index
+            index += 1
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, IndexSet):
+            if self._count != other._count:
+                return False
+            return not self._count or self._span() == other._span()
+        if isinstance(other, (list, tuple, range)):
+            other = set(other)
+        return Set.__eq__(self, other)
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"IndexSet({list(self)!r})"
+    
+    def copy(self) -> 'IndexSet':
+        duplicate = IndexSet.__new__(IndexSet)
+        duplicate._flags = self._flags[:]
+        duplicate._count, duplicate._low, duplicate._high = self._count, self._low, self._high
+        return duplicate
+    
+    def add(self, index: int) -> Segments:
+        index = _as_index(index)
+        self._grow(index + 1)
+        if self._flags[index]:
+            return []
+        self._flags[index] = 1
+        self._include(index, index + 1)
+        self._count += 1
+        return [(index, b'\x00')]
+    
+    def discard(self, index: int) -> Segments:
+        if index not in self:
+            return []
+        self._flags[index] = 0
+        self._count -= 1
+        self._shrink()
+        return [(index, _ONES)]
+    
+    def update(self, indices: Iterable[int]) -> Segments:
+        if type(indices) is range and indices.step == 1:
+            start, stop = indices.start, indices.stop
+            if start >= stop:
+                return []
+            _as_index(start)
+            self._grow(stop)
+            flags = self._flags
+            previous = bytes(flags[start:stop])
+            self._count += (stop - start) - previous.count(1)
+            flags[start:stop] = _ONES * (stop - start)
+            self._include(start, stop)
+            return [(start, previous)]
+        
+        segments = []
+        for index in indices:
+            segments.extend(self.add(index))
+        return segments
+    
+    def difference_update(self, indices: Iterable[int]) -> Segments:
+        if type(indices) is range and indices.step == 1:
+            start, stop = max(indices.start, self._low), min(indices.stop, self._high)
+            if start >= stop:
+                return []
+            flags = self._flags
+            previous = bytes(flags[start:stop])
+            self._count -= previous.count(1)
+            flags[start:stop] = bytes(stop - start)
+            self._shrink()
+            return [(start, previous)]
+        
+        segments = []
+        for index in indices:
+            segments.extend(self.discard(index))
+        return segments
+    
+    def clear(self) -> Segments:
+        if not self._count:
+            return []
+        return self.difference_update(range(self._low, self._high))
+    
+    def replace(self, indices: Iterable[int]) -> Segments:
+        """Make `indices` the only members."""
+        return self.clear() + self.update(indices)
+    
+    def restore(self, segments: Segments):
+        """Undo the mutations that returned `segments`."""
+        flags = self._flags
+        for start, previous in reversed(segments):
+            stop = start + len(previous)
+            self._count += previous.count(1) - flags.count(1, start, stop)
+            flags[start:stop] = previous
+            self._include(start, stop)
+        self._shrink()
+    
+    def _span(self) -> Tuple[int, bytearray]:
+        flags = self._flags
+        first = flags.find(_ONES, self._low, self._high)
+        last = flags.rfind(_ONES, self._low, self._high)
+        return first, flags[first:last + 1]
+    
+    def _grow(self, size: int):
+        if size > len(self._flags):
+            self._flags.extend(bytes(size - len(self._flags)))
+    
+    def _shrink(self):
+        if not self._count:
+            self._low = self._high = 0
+    
+    def _include(self, start: int, stop: int):
+        if self._low == self._high:
+            self._low, self._high = start, stop
+        else:
+            self._low, self._high = min(self._low, start), max(self._high, stop)
\ No newline at end of file
@@ -0,0 +1,93 @@
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+from .array_state import ArrayState
+from .step import Step, StepType
+
+
+# Relative cost of replaying each step type with core.batch: comparisons are
+# skipped by a column scan, swaps and overwrites are one loop iteration each,
+# and marker steps are decoded into Step objects first
+REPLAY_COSTS = {
+    StepType.COMPARE: 0.25,
+    StepType.SWAP: 1.0,
+    StepType.OVERWRITE: 1.0,
+    StepType.MARK_SORTED: 4.0,
+    StepType.HIGHLIGHT: 4.0,
+    StepType.CLEAR_HIGHLIGHT: 4.0,
+    StepType.PIVOT: 4.0,
+    StepType.MERGE: 0.25
+}
+
+
+class SeekIndex:
+    """Checkpoint states at increasing step positions.
+    
+    `floor` finds the last checkpoint at or before a position by binary
+    search, so a seek costs O(log k) for k checkpoints plus the replay from
+    that checkpoint, however the checkpoints are spaced.
+    """
+    
+    def __init__(self):
+        self.positions: List[int] = []
+        self.states: List[ArrayState] = []
+    
+    def add(self, position: int, state: ArrayState):
+        if self.positions and position <= self.positions[-1]:
+            raise ValueError("checkpoints must be added in increasing position order")
+        self.positions.append(position)
+        self.states.append(state)
+    
+    def floor_position(self, index: int) -> int:
+        return self.positions[bisect_right(self.positions, index) - 1]
+    
+    def floor(self, index: int) -> Tuple[int, ArrayState]:
+        """Return the last checkpoint at or before `index` (not a copy)."""
+        slot = bisect_right(self.positions, index) - 1
+        return self.positions[slot], self.states[slot]
+    
+    def next_position(self, index: int) -> Optional[int]:
+        """Position of the first checkpoint after `index`, if any."""
+        slot = bisect_right(self.positions, index)
+        return self.positions[slot] if slot < len(self.positions) else None
+    
+    def max_gap(self, total_steps: int) -> int:
+        """Most steps a seek replays, i.e. the longest stretch without a checkpoint."""
+        bounds = self.positions + [total_steps]
+        return max((b - a for a, b in zip(bounds, bounds[1:])), default=0)
+    
+    def __len__(self) -> int:
+        return len(self.positions)
+
+
+class FixedKeyframes:
+    """Checkpoint every `interval` steps."""
+    
+    def __init__(self, interval: int):
+        self.interval = interval
+        self._steps = 0
+    
+    def should_checkpoint(self, step: Step) -> bool:
+        self._steps += 1
+        return self._steps % self.interval == 0
+
+
+class AdaptiveKeyframes:
+    """Checkpoint once `budget` units of replay cost have built up.
+    
+    Costs come from REPLAY_COSTS, so stretches that change the state a lot
+    (swaps, writes, markers) get dense checkpoints while long runs of
+    comparisons get sparse ones. Every seek replays at most about `budget`
+    swaps' worth of work.
+    """
+    
+    def __init__(self, budget: int):
+        self.budget = budget
+        self._cost = 0.0
+    
+    def should_checkpoint(self, step: Step) -> bool:
+        self._cost += REPLAY_COSTS[step.type]
+        if self._cost >= self.budget:
+            self._cost = 0.0
+            return True
+        return False
\ No newline at end of file
@@ -0,0 +1,156 @@
+import json
+from typing import IO, Any, Callable, Iterator, List, Optional, Protocol, Union, runtime_checkable
+
+from .step import Step, StepType
+
+
+@runtime_checkable
+class StepSink(Protocol):
+    """Anything a run can record its steps into.
+    
+    Timeline keeps every step and its states in memory, StepStats only
+    counts them, FileSink appends them to disk and StreamSink sends them
+    over a socket; FanOutSink feeds several at once. `close` is called once
+    after the last step, even if the run fails.
+    """
+    
+    def add_step(self, step: Step):
+        ...
+    
+    def close(self):
+        ...
+
+
+def step_to_record(step: Step) -> dict:
+    """A JSON-serializable record of `step` that step_from_record can rebuild"""
+    indices = step.indices
+    record = {
+        'type': step.type.value,
+        # Contiguous regions stay a [start, stop] pair instead of a full list
+        'indices': {'range': [indices.start, indices.stop]}
+        if type(indices) is range and indices.step == 1 else list(indices)
+    }
+    if step.values:
+        record['values'] = step.values
+    if step.explanation:
+        record['explanation'] = step.explanation
+    if step.metadata:
+        record['metadata'] = step.metadata
+    if step.template:
+        record['template'] = step.template
+        record['template_args'] = list(step.template_args)
+    return record
+
+
+def step_from_record(record: dict) -> Step:
+    indices = record['indices']
+    if isinstance(indices, dict):
+        indices = range(*indices['range'])
+    return Step(
+        type=StepType(record['type']),
+        indices=indices,
+        values=record.get('values'),
+        explanation=record.get('explanation', ""),
+        metadata=restore_metadata(record.get('metadata')),
+        template=record.get('template'),
+        template_args=tuple(record.get('template_args', ()))
+    )
+
+
+def restore_metadata(metadata: Optional[dict]) -> Optional[dict]:
+    if metadata and 'left_range' in metadata:
+        # Merge ranges are tuples; JSON turned them into lists
+        return {key: tuple(value) for key, value in metadata.items()}
+    return metadata
+
+
+class FanOutSink:
+    """Forwards every step to each of `sinks` in turn."""
+    
+    def __init__(self, *sinks: StepSink):
+        self.sinks = sinks
+    
+    def add_step(self, step: Step):
+        for sink in self.sinks:
+            sink.add_step(step)
+    
+    def close(self):
+        # Every sink is closed even if one fails; the first error is re-raised
+        error = None
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as exc:
+                if error is None:
+                    error = exc
+        if error is not None:
+            raise error
+
+
+class FileSink:
+    """Appends steps to a file as NDJSON step records.
+    
+    `target` is a path, opened in append mode so several runs can share a
+    file, or an already open text file. When `initial_array` is given it is
+    written first as a header line, which read_trace hands back. Lines are
+    buffered by the file object; nothing is kept in memory.
+    """
+    
+    def __init__(self, target: Union[str, IO[str]], initial_array: Optional[List] = None):
+        self._owns_file = isinstance(target, str)
+        self._file = open(target, 'a', encoding='utf-8') if self._owns_file else target
+        self.steps_written = 0
+        if initial_array is not None:
+            self._file.write(json.dumps({'initial_array': initial_array}) + "\n")
+    
+    def add_step(self, step: Step):
+        self._file.write(json.dumps(step_to_record(step)) + "\n")
+        self.steps_written += 1
+    
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+def read_trace(path: str) -> Iterator[Union[List, Step]]:
+    """Yield what a FileSink wrote: header arrays as lists and steps as Step objects"""
+    with open(path, encoding='utf-8') as trace:
+        for line in trace:
+            record = json.loads(line)
+            if 'initial_array' in record:
+                yield record['initial_array']
+            else:
+                yield step_from_record(record)
+
+
+class StreamSink:
+    """Sends steps as NDJSON over a connection, `batch_size` steps per write.
+    
+    `send` takes the encoded bytes, e.g. `socket.sendall` or a response
+    writer; batching keeps the number of syscalls (and packets) down while
+    only one batch is ever buffered.
+    """
+    
+    def __init__(self, send: Callable[[bytes], Any], batch_size: int = 256):
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        self._send = send
+        self.batch_size = batch_size
+        self._buffer: List[str] = []
+        self.steps_sent = 0
+    
+    def add_step(self, step: Step):
+        self._buffer.append(json.dumps(step_to_record(step)))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        if self._buffer:
+            self._send(("\n".join(self._buffer) + "\n").encode('utf-8'))
+            self.steps_sent += len(self._buffer)
+            self._buffer = []
+    
+    def close(self):
+        self.flush()
\ No newline at end of file
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
 
@@ -17,10 +17,15 @@ class StepType(Enum):
 @dataclass
 class Step:
     type: StepType
-    indices: List[int]
+    # A list of indices, or a `range` for contiguous regions
+    indices: Sequence[int]
     values: Optional[List[Any]] = None
     explanation: str = ""
     metadata: Optional[dict] = None
+    # Lazily rendered explanation: a template id from core.explanations plus
+    # its arguments, used instead of formatting `explanation` up front
+    template: Optional[str] = None
+    template_args: Tuple = ()
     
     def __post_init__(self):
         if self.values is None:
@@ -29,67 +34,127 @@ class Step:
             self.metadata = {}
     
     @classmethod
-    def compare(cls, index1: int, index2: int, explanation: str = "") -> 'Step':
+    def compare(cls, index1: int, index2: int, explanation: str = "",
+                template: Optional[str] = None, template_args: Tuple = ()) -> 'Step':
         return cls(
             type=StepType.COMPARE,
             indices=[index1, index2],
-            explanation=explanation
+            explanation=explanation,
+            template=template,
+            template_args=template_args
         )
     
     @classmethod
-    def swap(cls, index1: int, index2: int, explanation: str = "") -> 'Step':
+    def swap(cls, index1: int, index2: int, explanation: str = "",
+             template: Optional[str] = None, template_args: Tuple = ()) -> 'Step':
         return cls(
             type=StepType.SWAP,
             indices=[index1, index2],
-            explanation=explanation
+            explanation=explanation,
+            template=template,
+            template_args=template_args
         )
     
     @classmethod
-    def overwrite(cls, index: int, value: Any, explanation: str = "") -> 'Step':
+    def overwrite(cls, index: int, value: Any, explanation: str = "",
+                  template: Optional[str] = None, template_args: Tuple = ()) -> 'Step':
         return cls(
             type=StepType.OVERWRITE,
             indices=[index],
             values=[value],
-            explanation=explanation
+            explanation=explanation,
+            template=template,
+            template_args=template_args
         )
     
     @classmethod
-    def mark_sorted(cls, indices: List[int], explanation: str = "") -> 'Step':
+    def mark_sorted(cls, indices: Sequence[int], explanation: str = "",
+                    template: Optional[str] = None, template_args: Tuple = ()) -> 'Step':
         return cls(
             type=StepType.MARK_SORTED,
             indices=indices,
-            explanation=explanation
+            explanation=explanation,
+            template=template,
+            template_args=template_args
         )
     
     @classmethod
-    def highlight(cls, indices: List[int], explanation: str = "") -> 'Step':
+    def highlight(cls, indices: Sequence[int], explanation: str = "",
+                  template: Optional[str] = None, template_args: Tuple = ()) -> 'Step':
         return cls(
             type=StepType.HIGHLIGHT,
             indices=indices,
-            explanation=explanation
+            explanation=explanation,
+            template=template,
+            template_args=template_args
         )
     
     @classmethod
-    def clear_highlight(cls, indices: List[int], explanation: str = "") -> 'Step':
+    def clear_highlight(cls, indices: Sequence[int], explanation: str = "",
+                        template: Optional[str] = None, template_args: Tuple = ()) -> 'Step':
         return cls(
             type=StepType.CLEAR_HIGHLIGHT,
             indices=indices,
-            explanation=explanation
+            explanation=explanation,
+            template=template,
+            template_args=template_args
         )
     
     @classmethod
-    def pivot(cls, index: int, explanation: str = "") -> 'Step':
+    def pivot(cls, index: int, explanation: str = "",
+              template: Optional[str] = None, template_args: Tuple = ()) -> 'Step':
         return cls(
             type=StepType.PIVOT,
             indices=[index],
-            explanation=explanation
+            explanation=explanation,
+            template=template,
+            template_args=template_args
         )
     
     @classmethod
-    def merge(cls, left_range: tuple, right_range: tuple, explanation: str = "") -> 'Step':
+    def merge(cls, left_range: tuple, right_range: tuple, explanation: str = "",
+              template: Optional[str] = None, template_args: Tuple = ()) -> 'Step':
         return cls(
             type=StepType.MERGE,
-            indices=list(range(left_range[0], right_range[1])),
+            indices=range(left_range[0], right_range[1]),
             metadata={'left_range': left_range, 'right_range': right_range},
-            explanation=explanation
-        )
\ No newline at end of file
+            explanation=explanation,
+            template=template,
+            template_args=template_args
+        )
+
+
+class StepEmitter:
+    """Creates the steps an algorithm yields.
+    
+    Algorithms build their steps through an emitter rather than the Step
+    constructors, so a run can substitute a cheaper one (see
+    core.stats.CountingEmitter). `enter`/`leave` bracket recursion or pushes
+    onto an explicit stack, and `allocate`/`release` report auxiliary buffers
+    in array elements; this emitter ignores both.
+    """
+    
+    compare = Step.compare
+    swap = Step.swap
+    overwrite = Step.overwrite
+    mark_sorted = Step.mark_sorted
+    highlight = Step.highlight
+    clear_highlight = Step.clear_highlight
+    pivot = Step.pivot
+    merge = Step.merge
+    
+    def enter(self):
+        pass
+    
+    def leave(self):
+        pass
+    
+    def allocate(self, size: int):
+        pass
+    
+    def release(self, size: int):
+        pass
+
+
+# Default emitter used when algorithms record full steps
+EMITTER = StepEmitter()
\ No newline at end of file
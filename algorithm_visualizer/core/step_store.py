@@ -0,0 +1,232 @@
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .step import Step, StepType
+
+
+_STEP_TYPES = list(StepType)
+_TYPE_CODES = {step_type: code for code, step_type in enumerate(_STEP_TYPES)}
+
+# Per-step flags
+_CONTIGUOUS = 1  # indices stored as a [start, stop) pair
+_INT_VALUE = 2   # a single integer value stored in the values column
+_OBJECT_ARGS = 4  # template arguments kept in the side table
+_RANGE = 8       # contiguous indices that were given as a range and are rebuilt as one
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+class StepStore:
+    """Append-only, struct-of-arrays storage for steps.
+    
+    Type codes, index runs, values and explanation ids live in flat
+    `array.array` columns; `Step` objects are only built when accessed.
+    Contiguous index runs (highlight/merge regions) are kept as a start/stop
+    pair, explanations and template ids are interned in a string table, and
+    integer template arguments share a flat column. Anything that does not
+    fit a column (non-integer values or arguments, metadata) goes to a sparse
+    side table.
+    """
+    
+    def __init__(self, steps: Iterable[Step] = ()):
+        self._types = array('B')
+        self._flags = array('B')
+        self._index_offsets = array('Q', [0])
+        self._indices = array('i')
+        self._values = array('q')
+        self._explanations = array('I')
+        self._templates = array('I')
+        self._arg_offsets = array('Q', [0])
+        self._args = array('q')
+        self._strings: List[str] = [""]
+        self._string_ids: Dict[str, int] = {"": 0}
+        self._extra_values: Dict[int, List[Any]] = {}
+        self._extra_args: Dict[int, tuple] = {}
+        self._metadata: Dict[int, dict] = {}
+        
+        self.extend(steps)
+    
+    def append(self, step: Step):
+        position = len(self._types)
+        flags = 0
+        
+        # Decide where the arguments go before any column is written, so a
+        # step that cannot be stored never leaves the columns out of step
+        args = step.template_args
+        if not all(type(arg) is int and _INT64_MIN <= arg <= _INT64_MAX for arg in args):
+            flags |= _OBJECT_ARGS
+        
+        indices = step.indices
+        count = len(indices)
+        if type(indices) is range and indices.step == 1:
+            flags |= _CONTIGUOUS | _RANGE
+            self._indices.append(indices.start)
+            self._indices.append(indices.stop)
+        elif (count > 2 and indices[-1] - indices[0] == count - 1
+                and list(indices) == list(range(indices[0], indices[-1] + 1))):
+            flags |= _CONTIGUOUS
+            self._indices.append(indices[0])
+            self._indices.append(indices[-1] + 1)
+        else:
+            self._indices.extend(indices)
+        
+        value = 0
+        values = step.values
+        if len(values) == 1 and type(values[0]) is int and _INT64_MIN <= values[0] <= _INT64_MAX:
+            flags |= _INT_VALUE
+            value = values[0]
+        elif values:
+            self._extra_values[position] = list(values)
+        
+        if flags & _OBJECT_ARGS:
+            self._extra_args[position] = tuple(args)
+        else:
+            self._args.extend(args)
+        
+        if step.metadata:
+            self._metadata[position] = step.metadata
+        
+        self._types.append(_TYPE_CODES[step.type])
+        self._flags.append(flags)
+        self._index_offsets.append(len(self._indices))
+        self._values.append(value)
+        self._explanations.append(self._intern(step.explanation))
+        self._templates.append(self._intern(step.template or ""))
+        self._arg_offsets.append(len(self._args))
+    
+    def _intern(self, text: str) -> int:
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(text)
+            self._string_ids[text] = string_id
+        return string_id
+    
+    def extend(self, steps: Iterable[Step]):
+        for step in steps:
+            self.append(step)
+    
+    def __len__(self) -> int:
+        return len(self._types)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._slice(*index.indices(len(self)))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("step index out of range")
+        return self._build(index)
+    
+    def __iter__(self) -> Iterator[Step]:
+        for position in range(len(self)):
+            yield self._build(position)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (StepStore, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+    
+    def iter_records(self) -> Iterator[Tuple[str, Sequence[int], List[Any], str, dict, Optional[str], tuple]]:
+        """Yield (type, indices, values, explanation, metadata, template, template_args)
+        without building Steps."""
+        types, flags, offsets = self._types, self._flags, self._index_offsets
+        indices, values, explanations = self._indices, self._values, self._explanations
+        strings, extra_values, metadata = self._strings, self._extra_values, self._metadata
+        templates, arg_offsets, args, extra_args = (
+            self._templates, self._arg_offsets, self._args, self._extra_args
+        )
+        type_values = [step_type.value for step_type in _STEP_TYPES]
+        
+        for position in range(len(types)):
+            flag = flags[position]
+            start, stop = offsets[position], offsets[position + 1]
+            if flag & _RANGE:
+                step_indices = range(indices[start], indices[start + 1])
+            elif flag & _CONTIGUOUS:
+                step_indices = list(range(indices[start], indices[start + 1]))
+            else:
+                step_indices = indices[start:stop].tolist()
+            
+            if flag & _INT_VALUE:
+                step_values = [values[position]]
+            else:
+                step_values = extra_values.get(position, [])
+            
+            if flag & _OBJECT_ARGS:
+                step_args = extra_args[position]
+            else:
+                step_args = tuple(args[arg_offsets[position]:arg_offsets[position + 1]])
+            
+            yield (
+                type_values[types[position]],
+                step_indices,
+                step_values,
+                strings[explanations[position]],
+                metadata.get(position, {}),
+                strings[templates[position]] or None,
+                step_args
+            )
+    
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the column storage, excluding the side tables."""
+        columns = (self._types, self._flags, self._index_offsets, self._indices,
+                   self._values, self._explanations, self._templates,
+                   self._arg_offsets, self._args)
+        return sum(len(column) * column.itemsize for column in columns)
+    
+    def _build(self, position: int) -> Step:
+        flag = self._flags[position]
+        start, stop = self._index_offsets[position], self._index_offsets[position + 1]
+        if flag & _RANGE:
+            indices = range(self._indices[start], self._indices[start + 1])
+        elif flag & _CONTIGUOUS:
+            indices = list(range(self._indices[start], self._indices[start + 1]))
+        else:
+            indices = self._indices[start:stop].tolist()
+        
+        if flag & _INT_VALUE:
+            values = [self._values[position]]
+        else:
+            values = list(self._extra_values.get(position, []))
+        
+        if flag & _OBJECT_ARGS:
+            template_args = self._extra_args[position]
+        else:
+            template_args = tuple(self._args[self._arg_offsets[position]:self._arg_offsets[position + 1]])
+        
+        return Step(
+            type=_STEP_TYPES[self._types[position]],
+            indices=indices,
+            values=values,
+            explanation=self._strings[self._explanations[position]],
+            metadata=dict(self._metadata.get(position, {})),
+            template=self._strings[self._templates[position]] or None,
+            template_args=template_args
+        )
+    
+    def _slice(self, start: int, stop: int, stride: int) -> 'StepStore':
+        if stride != 1:
+            return StepStore(self[position] for position in range(start, stop, stride))
+        
+        result = StepStore()
+        stop = max(start, stop)
+        first, last = self._index_offsets[start], self._index_offsets[stop]
+        
+        result._types = self._types[start:stop]
+        result._flags = self._flags[start:stop]
+        result._index_offsets = array('Q', (offset - first for offset in self._index_offsets[start:stop + 1]))
+        result._indices = self._indices[first:last]
+        result._values = self._values[start:stop]
+        result._explanations = self._explanations[start:stop]
+        result._templates = self._templates[start:stop]
+        first_arg, last_arg = self._arg_offsets[start], self._arg_offsets[stop]
+        result._arg_offsets = array('Q', (offset - first_arg for offset in self._arg_offsets[start:stop + 1]))
+        result._args = self._args[first_arg:last_arg]
+        # The intern table is append-only, so slices can share it
+        result._strings = self._strings
+        result._string_ids = self._string_ids
+        result._extra_values = {p - start: v for p, v in self._extra_values.items() if start <= p < stop}
+        result._extra_args = {p - start: a for p, a in self._extra_args.items() if start <= p < stop}
+        result._metadata = {p - start: m for p, m in self._metadata.items() if start <= p < stop}
+        return result
\ No newline at end of file
@@ -1,21 +1,77 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from .step import Step
-from .array_state import ArrayState
+from .array_state import ArrayState, ArrayStateView
+from .batch import apply_steps
+from .cursor import TimelineCursor
+from .step_store import StepStore
+from .seek_index import AdaptiveKeyframes, FixedKeyframes, SeekIndex
 
 
 class Timeline:
-    def __init__(self, initial_array: List):
+    def __init__(self, initial_array: List, keyframe_interval: Optional[int] = None,
+                 compact_steps: bool = False, numpy_values: bool = False,
+                 adaptive_keyframes: bool = False):
+        if keyframe_interval is not None and keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be a positive integer")
+        if adaptive_keyframes and keyframe_interval is None:
+            raise ValueError("adaptive_keyframes needs a keyframe_interval to use as its budget")
+        if numpy_values and np is None:
+            raise ImportError("numpy_values=True requires NumPy")
+        
         self.initial_array = initial_array.copy()
-        self.steps: List[Step] = []
+        # A StepStore keeps large traces in flat columns instead of Step objects
+        self.steps: List[Step] = StepStore() if compact_steps else []
         self.current_position = -1
-        self.array_states: List[ArrayState] = []
+        self.keyframe_interval = keyframe_interval
         
-        initial_state = ArrayState(values=self.initial_array.copy())
-        self.array_states.append(initial_state)
+        # With numpy_values every state holds an ndarray (of the initial
+        # array's dtype), so snapshots copy as one block and replays of
+        # overwrite runs become scatter writes
+        values = np.array(self.initial_array) if numpy_values else self.initial_array.copy()
+        initial_state = ArrayState(values=values)
+        if keyframe_interval is None:
+            self.array_states: List[ArrayState] = []
+            self.array_states.append(initial_state)
+        else:
+            # Delta mode: each step is the delta to the next state, and full
+            # snapshots are kept in a seek index to rebuild from, either every
+            # `keyframe_interval` steps or, with adaptive_keyframes, whenever
+            # that many swaps' worth of replay work has built up. A smaller
+            # interval costs more snapshots and buys faster seeks.
+            self.seek_index = SeekIndex()
+            self.seek_index.add(0, initial_state)
+            self._keyframe_policy = (
+                AdaptiveKeyframes(keyframe_interval) if adaptive_keyframes
+                else FixedKeyframes(keyframe_interval)
+            )
+            self._last_state = initial_state.copy()
+            self.array_states = _StateSequence(self)
+        
+        self._cursor = TimelineCursor(self)
+    
+    @property
+    def is_delta_encoded(self) -> bool:
+        return self.keyframe_interval is not None
+    
+    @property
+    def keyframes(self) -> List[ArrayState]:
+        return self.seek_index.states
     
     def add_step(self, step: Step):
         self.steps.append(step)
         
+        if self.keyframe_interval is not None:
+            self._last_state.advance(step)
+            if self._keyframe_policy.should_checkpoint(step):
+                self.seek_index.add(len(self.steps), self._last_state.copy())
+            return
+        
         current_state = self.array_states[-1].copy()
         new_values = current_state.apply_step(step, current_state.values)
         current_state.values = new_values
@@ -23,9 +79,61 @@ class Timeline:
         
         self.array_states.append(current_state)
     
-    def get_current_state(self) -> Optional[ArrayState]:
+    def close(self):
+        # Timelines are step sinks; there is nothing to release
+        pass
+    
+    def nearest_keyframe(self, index: int) -> Tuple[int, ArrayState]:
+        """Return the position and a copy of the closest snapshot at or before `index`."""
+        if self.keyframe_interval is None:
+            return index, self.array_states[index].copy()
+        if index == len(self.steps):
+            return index, self._last_state.copy()
+        
+        position, state = self.seek_index.floor(index)
+        return position, state.copy()
+    
+    def keyframe_position(self, index: int) -> int:
+        """Position of the closest snapshot at or before `index`."""
+        if self.keyframe_interval is None:
+            return index
+        return self.seek_index.floor_position(index)
+    
+    def next_keyframe_position(self, index: int) -> Optional[int]:
+        """Position of the first snapshot after `index`, if one exists yet."""
+        if self.keyframe_interval is None:
+            return index + 1
+        return self.seek_index.next_position(index)
+    
+    def seek_stats(self) -> dict:
+        """How many snapshots are kept and how many steps a seek replays at most."""
+        if self.keyframe_interval is None:
+            return {'keyframes': len(self.array_states), 'max_replay_steps': 0}
+        return {
+            'keyframes': len(self.seek_index),
+            'max_replay_steps': self.seek_index.max_gap(len(self.steps))
+        }
+    
+    def get_state_at(self, index: int) -> ArrayState:
+        """Return a copy of the state after the first `index` steps."""
+        if not 0 <= index <= len(self.steps):
+            raise IndexError("timeline state index out of range")
+        
+        start, state = self.nearest_keyframe(index)
+        return apply_steps(state, self.steps, start, index)
+    
+    def cursor(self) -> TimelineCursor:
+        """Create an independent cursor, e.g. for a separate playback session."""
+        return TimelineCursor(self)
+    
+    def get_current_state(self) -> Optional[ArrayStateView]:
+        """Return a read-only view of the current state.
+        
+        The view is valid until the position changes; call `copy()` on it to
+        keep a snapshot.
+        """
         if 0 <= self.current_position < len(self.array_states):
-            return self.array_states[self.current_position].copy()
+            return ArrayStateView(self._cursor.move_to(self.current_position))
         return None
     
     def get_current_step(self) -> Optional[Step]:
@@ -60,4 +168,32 @@ class Timeline:
     def get_progress(self) -> float:
         if len(self.steps) == 0:
             return 0.0
-        return (self.current_position + 1) / len(self.steps)
\ No newline at end of file
+        return (self.current_position + 1) / len(self.steps)
+
+
+class _StateSequence:
+    """Read-only stand-in for `Timeline.array_states` in delta mode.
+    
+    States are rebuilt on access from the nearest keyframe, so indexing costs
+    at most one keyframe gap of step applications and nothing is stored.
+    """
+    
+    def __init__(self, timeline: Timeline):
+        self._timeline = timeline
+    
+    def __len__(self) -> int:
+        return len(self._timeline.steps) + 1
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self._timeline.get_state_at(index)
+    
+    def __iter__(self) -> Iterator[ArrayState]:
+        _, state = self._timeline.nearest_keyframe(0)
+        yield state.copy()
+        for step in self._timeline.steps:
+            state.advance(step)
+            yield state.copy()
\ No newline at end of file
@@ -0,0 +1,380 @@
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .array_state import ArrayState
+from .sinks import restore_metadata
+from .step import Step, StepType
+from .timeline import Timeline, _StateSequence
+from .cursor import TimelineCursor
+
+
+TRACE_VERSION = 1
+
+# One fixed-size record per step: type, flags, inline index and argument
+# counts, template id, which numeric slots hold floats, two indices, one
+# value, three template arguments and the location of an optional JSON blob
+# for anything that does not fit.
+_RECORD = struct.Struct('<BBBBHBxiiqqqqQI4x')
+RECORD_SIZE = _RECORD.size
+
+_STEP_TYPES = list(StepType)
+_TYPE_CODES = {step_type: code for code, step_type in enumerate(_STEP_TYPES)}
+
+# Record flags
+_RANGE = 1         # indices are range(first, second)
+_INLINE_VALUE = 2  # values == [value]
+_EXTRA = 4         # the JSON blob holds the fields that are not inline
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+_INT32_MIN, _INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+# Floats share the int64 slots as their IEEE bit pattern
+_INT64 = struct.Struct('<q')
+_FLOAT64 = struct.Struct('<d')
+
+# Bytes of records unpacked at once when iterating over a trace
+_ITER_BLOCK = 4096 * RECORD_SIZE
+
+_STEPS_FILE = 'steps.bin'
+_EXTRAS_FILE = 'extras.bin'
+_KEYFRAMES_FILE = 'keyframes.bin'
+_INDEX_FILE = 'index.json'
+
+
+def _to_slot(number) -> Optional[Tuple[int, bool]]:
+    """Encode an int or float for a numeric slot, or None if it does not fit one"""
+    if type(number) is int and _INT64_MIN <= number <= _INT64_MAX:
+        return number, False
+    if type(number) is float:
+        return _INT64.unpack(_FLOAT64.pack(number))[0], True
+    return None
+
+
+def _from_slot(slot: int, is_float: int):
+    return _FLOAT64.unpack(_INT64.pack(slot))[0] if is_float else slot
+
+
+def _encode_state(state: ArrayState) -> bytes:
+    return json.dumps({
+        'values': state.values,
+        'sorted': list(state.sorted_indices),
+        'highlighted': list(state.highlighted_indices),
+        'pivot': state.pivot_index,
+        'comparing': list(state.comparing_indices)
+    }).encode('utf-8')
+
+
+def _decode_state(data) -> ArrayState:
+    state = json.loads(data)
+    return ArrayState(
+        values=state['values'],
+        sorted_indices=state['sorted'],
+        highlighted_indices=state['highlighted'],
+        pivot_index=state['pivot'],
+        comparing_indices=state['comparing']
+    )
+
+
+class TraceWriter:
+    """Step sink that writes a trace directory for MappedTimeline.
+    
+    Every step becomes one RECORD_SIZE-byte record appended to
+    `steps.bin`; index lists, values or arguments that do not fit the record
+    go to `extras.bin` as JSON. A snapshot of the state is appended to
+    `keyframes.bin` every `keyframe_interval` steps, and `close` writes
+    `index.json` with the keyframe offsets and template table. `flush`
+    publishes the steps so far the same way, marked incomplete, so another
+    process can read a trace while it is still being written. Only the
+    current state is held in memory, so traces can be far larger than RAM.
+    """
+    
+    def __init__(self, path: str, initial_array: List, keyframe_interval: int = 4096):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be a positive integer")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.steps_written = 0
+        
+        self._steps = open(os.path.join(path, _STEPS_FILE), 'wb')
+        self._extras = open(os.path.join(path, _EXTRAS_FILE), 'wb')
+        self._keyframes = open(os.path.join(path, _KEYFRAMES_FILE), 'wb')
+        self._extras_size = 0
+        self._keyframe_offsets: List[Tuple[int, int]] = []
+        self._keyframes_size = 0
+        # Template id 0 means no template
+        self._templates: List[Optional[str]] = [None]
+        self._template_ids: Dict[Optional[str], int] = {None: 0}
+        self._closed = False
+        
+        self._state = ArrayState(values=list(initial_array))
+        self._append_keyframe()
+    
+    def add_step(self, step: Step):
+        flags = 0
+        extra = {}
+        first = second = index_count = 0
+        
+        indices = step.indices
+        if type(indices) is range and indices.step == 1:
+            flags |= _RANGE
+            first, second = indices.start, indices.stop
+        elif len(indices) <= 2 and all(_INT32_MIN <= index <= _INT32_MAX for index in indices):
+            index_count = len(indices)
+            if index_count:
+                first = indices[0]
+            if index_count == 2:
+                second = indices[1]
+        else:
+            extra['indices'] = list(indices)
+        
+        value = float_mask = 0
+        values = step.values
+        slot = _to_slot(values[0]) if len(values) == 1 else None
+        if slot is not None:
+            flags |= _INLINE_VALUE
+            value, is_float = slot
+            float_mask |= is_float
+        elif values:
+            extra['values'] = values
+        
+        args = step.template_args
+        arg_count = len(args)
+        slots = [_to_slot(arg) for arg in args] if arg_count <= 3 else [None]
+        inline_args = [0, 0, 0]
+        if None in slots:
+            arg_count = 0
+            extra['template_args'] = list(args)
+        else:
+            for position, (slot_value, is_float) in enumerate(slots):
+                inline_args[position] = slot_value
+                float_mask |= is_float << (position + 1)
+        
+        if step.explanation:
+            extra['explanation'] = step.explanation
+        if step.metadata:
+            extra['metadata'] = step.metadata
+        
+        extra_offset = extra_length = 0
+        if extra:
+            flags |= _EXTRA
+            blob = json.dumps(extra).encode('utf-8')
+            extra_offset, extra_length = self._extras_size, len(blob)
+            self._extras.write(blob)
+            self._extras_size += extra_length
+        
+        template_id = self._template_ids.get(step.template)
+        if template_id is None:
+            template_id = self._template_ids[step.template] = len(self._templates)
+            self._templates.append(step.template)
+        
+        self._steps.write(_RECORD.pack(
+            _TYPE_CODES[step.type], flags, index_count, arg_count, template_id, float_mask,
+            first, second, value, *inline_args, extra_offset, extra_length
+        ))
+        self.steps_written += 1
+        
+        self._state.advance(step)
+        if self.steps_written % self.keyframe_interval == 0:
+            self._append_keyframe()
+    
+    def flush(self):
+        """Make the steps written so far readable with `MappedTimeline(path, allow_partial=True)`."""
+        # Records refer to extras and keyframes, so those reach the disk first
+        for trace_file in (self._extras, self._keyframes, self._steps):
+            trace_file.flush()
+        self._write_index(final_offset=None)
+    
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        
+        # The final state is kept too, so seeking to the end is one lookup
+        final_offset = self._append_keyframe(record=False)
+        for trace_file in (self._extras, self._keyframes, self._steps):
+            trace_file.close()
+        self._write_index(final_offset)
+    
+    def _write_index(self, final_offset: Optional[Tuple[int, int]]):
+        index = {
+            'version': TRACE_VERSION,
+            'record_size': RECORD_SIZE,
+            'total_steps': self.steps_written,
+            'complete': final_offset is not None,
+            'keyframe_interval': self.keyframe_interval,
+            'keyframes': self._keyframe_offsets,
+            'final_state': final_offset,
+            'templates': self._templates
+        }
+        # Written last and atomically: a trace without an index is unreadable,
+        # and one flushed mid-run says it is incomplete
+        index_path = os.path.join(self.path, _INDEX_FILE)
+        with open(index_path + '.tmp', 'w', encoding='utf-8') as index_file:
+            json.dump(index, index_file)
+        os.replace(index_path + '.tmp', index_path)
+    
+    def __enter__(self) -> 'TraceWriter':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _append_keyframe(self, record: bool = True) -> Tuple[int, int]:
+        blob = _encode_state(self._state)
+        location = (self._keyframes_size, len(blob))
+        self._keyframes.write(blob)
+        self._keyframes_size += len(blob)
+        if record:
+            self._keyframe_offsets.append(location)
+        return location
+
+
+def _map(path: str):
+    with open(path, 'rb') as mapped_file:
+        if os.fstat(mapped_file.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _MappedSteps:
+    """Read-only sequence of the steps in a memory-mapped trace.
+    
+    Records are decoded into Step objects on access; nothing is cached, so
+    the only memory used is the OS page cache behind the maps.
+    """
+    
+    def __init__(self, steps, extras, templates: List[Optional[str]], total_steps: int):
+        self._steps = steps
+        self._extras = extras
+        self._templates = templates
+        self._total_steps = total_steps
+    
+    def __len__(self) -> int:
+        return self._total_steps
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._total_steps))]
+        if index < 0:
+            index += self._total_steps
+        if not 0 <= index < self._total_steps:
+            raise IndexError("trace step index out of range")
+        return self._decode(_RECORD.unpack_from(self._steps, index * RECORD_SIZE))
+    
+    def __iter__(self) -> Iterator[Step]:
+        # Unpack a block of records at a time rather than copying the whole map
+        decode = self._decode
+        end = self._total_steps * RECORD_SIZE
+        for offset in range(0, end, _ITER_BLOCK):
+            for fields in _RECORD.iter_unpack(self._steps[offset:min(offset + _ITER_BLOCK, end)]):
+                yield decode(fields)
+    
+    def _decode(self, fields: tuple) -> Step:
+        (type_code, flags, index_count, arg_count, template_id, float_mask,
+         first, second, value, arg1, arg2, arg3, extra_offset, extra_length) = fields
+        
+        extra: Dict[str, Any] = {}
+        if flags & _EXTRA:
+            extra = json.loads(self._extras[extra_offset:extra_offset + extra_length])
+        
+        if flags & _RANGE:
+            indices = range(first, second)
+        elif 'indices' in extra:
+            indices = extra['indices']
+        else:
+            indices = [first, second][:index_count]
+        
+        if 'template_args' in extra:
+            template_args = tuple(extra['template_args'])
+        else:
+            template_args = tuple(
+                _from_slot(arg, float_mask >> (position + 1) & 1)
+                for position, arg in enumerate((arg1, arg2, arg3)[:arg_count])
+            )
+        
+        return Step(
+            type=_STEP_TYPES[type_code],
+            indices=indices,
+            values=[_from_slot(value, float_mask & 1)] if flags & _INLINE_VALUE else extra.get('values'),
+            explanation=extra.get('explanation', ""),
+            metadata=restore_metadata(extra.get('metadata')),
+            template=self._templates[template_id],
+            template_args=template_args
+        )
+
+
+class MappedTimeline(Timeline):
+    """Read-only Timeline over a trace directory written by TraceWriter.
+    
+    Steps and keyframes are memory-mapped rather than loaded, so opening a
+    trace costs one small index read however long it is, and seeking
+    decodes the nearest keyframe plus at most `keyframe_interval` records.
+    It plugs into VisualizationEngine.load_timeline like any Timeline.
+    
+    A trace that TraceWriter has only flushed is rejected unless
+    `allow_partial` is set; it then shows the steps up to that flush.
+    """
+    
+    def __init__(self, path: str, allow_partial: bool = False):
+        with open(os.path.join(path, _INDEX_FILE), encoding='utf-8') as index_file:
+            index = json.load(index_file)
+        if index.get('version') != TRACE_VERSION or index.get('record_size') != RECORD_SIZE:
+            raise ValueError(f"Unsupported trace format in '{path}'")
+        if not index['complete'] and not allow_partial:
+            raise ValueError(f"Trace in '{path}' is still being written")
+        
+        self.path = path
+        self.complete = index['complete']
+        self._maps = [_map(os.path.join(path, name)) for name in (_STEPS_FILE, _EXTRAS_FILE, _KEYFRAMES_FILE)]
+        steps_map, extras_map, self._keyframes_map = self._maps
+        self._keyframe_offsets = index['keyframes']
+        self._final_state = index['final_state']
+        
+        self.steps = _MappedSteps(steps_map, extras_map, index['templates'], index['total_steps'])
+        self.keyframe_interval = index['keyframe_interval']
+        self.initial_array = self._load_keyframe(self._keyframe_offsets[0]).values
+        self.array_states = _StateSequence(self)
+        self.current_position = -1
+        self._cursor = TimelineCursor(self)
+    
+    def add_step(self, step: Step):
+        raise TypeError("MappedTimeline is read-only; record with TraceWriter")
+    
+    def nearest_keyframe(self, index: int) -> Tuple[int, ArrayState]:
+        if index == len(self.steps) and self._final_state is not None:
+            return index, self._load_keyframe(self._final_state)
+        keyframe_index = index // self.keyframe_interval
+        return keyframe_index * self.keyframe_interval, self._load_keyframe(self._keyframe_offsets[keyframe_index])
+    
+    def keyframe_position(self, index: int) -> int:
+        return min(index // self.keyframe_interval, len(self._keyframe_offsets) - 1) * self.keyframe_interval
+    
+    def next_keyframe_position(self, index: int) -> Optional[int]:
+        position = (index // self.keyframe_interval + 1) * self.keyframe_interval
+        return position if position // self.keyframe_interval < len(self._keyframe_offsets) else None
+    
+    def seek_stats(self) -> dict:
+        return {
+            'keyframes': len(self._keyframe_offsets),
+            'max_replay_steps': min(self.keyframe_interval, len(self.steps))
+        }
+    
+    def close(self):
+        for mapped in self._maps:
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self._maps = []
+    
+    def __enter__(self) -> 'MappedTimeline':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _load_keyframe(self, location) -> ArrayState:
+        offset, length = location
+        return _decode_state(self._keyframes_map[offset:offset + length])
\ No newline at end of file
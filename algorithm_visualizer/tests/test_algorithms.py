@@ -1,5 +1,13 @@
+import collections
+import itertools
 import pytest
-from ..algorithms import BubbleSort, QuickSort, MergeSort
+import random
+from ..algorithms import (
+    BubbleSort, QuickSort, MergeSort, HeapSort, IntroSort, TimSort, RadixSort, CountingSort
+)
+from ..core.sinks import FanOutSink, FileSink, StepSink, StreamSink, read_trace
+from ..core.stats import StepStats
+from ..core.step import StepType
 from ..core.timeline import Timeline
 
 
@@ -93,4 +101,345 @@ class TestAlgorithmCorrectness:
         
         # Test step backward
         timeline.step_backward()
-        assert timeline.current_position == initial_steps
\ No newline at end of file
+        assert timeline.current_position == initial_steps
+    
+    def test_delta_encoded_execution_matches_full(self):
+        test_array = [64, 34, 25, 12, 22, 11, 90]
+        
+        for algorithm in [BubbleSort(), QuickSort(), MergeSort()]:
+            full = algorithm.execute(test_array)
+            delta = algorithm.execute(test_array, keyframe_interval=5)
+            
+            assert len(delta.array_states) == len(full.array_states)
+            assert delta.array_states[-1].values == sorted(test_array)
+            for index in range(0, len(full.array_states), 3):
+                assert delta.array_states[index] == full.array_states[index]
+            
+            # Scrub forward then backward through the live cursor
+            for position in list(range(full.get_total_steps())) + list(range(full.get_total_steps() - 1, -1, -1)):
+                full.set_position(position)
+                delta.set_position(position)
+                assert delta.get_current_state() == full.get_current_state()
+    
+    def test_iter_steps_matches_execute(self):
+        test_array = [5, 2, 8, 1, 9, 3]
+        
+        for algorithm in [BubbleSort(), QuickSort(), MergeSort()]:
+            steps = list(algorithm.iter_steps(test_array))
+            assert steps == algorithm.execute(test_array).steps
+            assert test_array == [5, 2, 8, 1, 9, 3]  # Input is not mutated
+    
+    def test_iter_steps_is_lazy(self):
+        # A full bubble sort trace of this size would be ~50 million steps
+        steps = BubbleSort().iter_steps(list(range(10000, 0, -1)))
+        first = list(itertools.islice(steps, 500))
+        
+        assert len(first) == 500
+        assert first[0].type.value == "highlight"
+    
+    def test_execute_max_steps(self):
+        timeline = MergeSort().execute([4, 3, 2, 1], max_steps=5)
+        
+        assert timeline.get_total_steps() == 5
+        assert len(timeline.array_states) == 6
+    
+    def test_compact_steps_execution(self):
+        test_array = [64, 34, 25, 12, 22, 11, 90]
+        
+        for algorithm in [BubbleSort(), QuickSort(), MergeSort()]:
+            full = algorithm.execute(test_array)
+            compact = algorithm.execute(test_array, keyframe_interval=8, compact_steps=True)
+            
+            assert compact.steps == full.steps
+            assert compact.array_states[-1].values == sorted(test_array)
+    
+    def test_estimate_steps_tracks_actual_count(self):
+        array = list(range(400, 0, -1))
+        for algorithm in (BubbleSort(), MergeSort(), HeapSort()):
+            actual = sum(1 for _ in algorithm.iter_steps(array))
+            assert 0.7 * actual < algorithm.estimate_steps(array) < 1.3 * actual
+
+
+class TestAdditionalAlgorithms:
+    
+    ALGORITHMS = [HeapSort(), IntroSort(), TimSort(), TimSort(min_merge=4), RadixSort(), CountingSort()]
+    
+    def _cases(self):
+        rng = random.Random(7)
+        return [
+            [64, 34, 25, 12, 22, 11, 90],
+            [5, 4, 3, 2, 1],
+            [1, 2, 3, 4, 5],
+            [3, 3, 1, 3, 1, 2, 2],
+            [-5, 12, 0, -33, 7, 100, -1],
+            [1],
+            [],
+            [rng.randint(-50, 500) for _ in range(200)],
+            list(range(300, 0, -1)),
+            [rng.randint(1, 3) for _ in range(150)]
+        ]
+    
+    def test_correctness(self):
+        for algorithm in self.ALGORITHMS:
+            for test_array in self._cases():
+                timeline = algorithm.execute(test_array, keyframe_interval=64)
+                assert timeline.array_states[-1].values == sorted(test_array), algorithm.name
+                assert timeline.initial_array == test_array
+    
+    def test_every_index_ends_sorted(self):
+        test_array = [9, 3, 7, 1, 8, 2, 6, 4, 5, 0, 11, 10]
+        
+        for algorithm in self.ALGORITHMS:
+            final_state = algorithm.execute(test_array).array_states[-1]
+            assert set(final_state.sorted_indices) == set(range(len(test_array))), algorithm.name
+    
+    def test_complexity_metadata(self):
+        for algorithm in self.ALGORITHMS:
+            info = algorithm.get_info()
+            assert all(info['complexity'][case] for case in ['best', 'average', 'worst', 'space'])
+        assert '²' not in IntroSort().complexity['worst']
+    
+    def test_intro_sort_falls_back_to_heap_sort(self):
+        arr = list(range(40, 0, -1))
+        steps = list(IntroSort()._intro_sort(arr, 0, len(arr) - 1, depth_limit=0))
+        
+        assert arr == sorted(arr)
+        assert steps[0].template == 'intro_sort.fallback'
+    
+    def test_tim_sort_reuses_natural_runs(self):
+        # Two ascending runs need only a single merge and no swaps
+        steps = list(TimSort(min_merge=2).iter_steps([1, 2, 3, 4, 5, 0, 6, 7, 8, 9]))
+        
+        assert sum(1 for step in steps if step.type.value == "merge") == 1
+        assert not any(step.type.value == "swap" for step in steps)
+    
+    def test_integer_sorts_reject_other_values(self):
+        for algorithm in [RadixSort(), CountingSort()]:
+            with pytest.raises(ValueError):
+                algorithm.execute([1.5, 2, 3])
+    
+    def test_counting_sort_rejects_huge_value_range(self):
+        with pytest.raises(ValueError):
+            CountingSort().validate([0, 10 ** 10])
+        with pytest.raises(ValueError):
+            list(CountingSort(max_range=100).iter_steps([0, 101]))
+        # Long inputs may span proportionally more values
+        array = list(range(0, 32, 4))
+        assert CountingSort(max_range=10).execute(array).array_states[-1].values == array
+    
+    def test_radix_sort_rejects_invalid_base(self):
+        for base in (1, 0, -10, 2.5, True):
+            with pytest.raises(ValueError):
+                RadixSort(base=base)
+        assert RadixSort(base=2).execute([3, 1, 2]).array_states[-1].values == [1, 2, 3]
+    
+    def test_radix_sort_is_linear_in_steps(self):
+        steps = RadixSort().execute(list(range(999, -1, -1)), keyframe_interval=1024).get_total_steps()
+        # Three digit passes, each a highlight, n overwrites and a clear
+        assert steps == 3 * (1000 + 2) + 1
+
+
+class TestQuickSortVariants:
+    
+    VARIANTS = [
+        QuickSort(pivot_strategy=strategy, three_way=three_way, seed=3)
+        for strategy in QuickSort.PIVOT_STRATEGIES
+        for three_way in (False, True)
+    ]
+    
+    def test_correctness(self):
+        rng = random.Random(11)
+        cases = [
+            [], [1], [2, 1], [3, 3, 3],
+            [64, 34, 25, 12, 22, 11, 90],
+            [rng.randint(-100, 100) for _ in range(300)],
+            [rng.randint(1, 4) for _ in range(200)],
+            list(range(120)),
+            list(range(120, 0, -1))
+        ]
+        
+        for algorithm in self.VARIANTS:
+            for test_array in cases:
+                timeline = algorithm.execute(test_array, keyframe_interval=64)
+                assert timeline.array_states[-1].values == sorted(test_array), (algorithm.pivot_strategy, algorithm.three_way)
+    
+    def test_large_sorted_input_does_not_recurse(self):
+        test_array = list(range(5000))
+        
+        for strategy in ['median_of_three', 'ninther']:
+            steps = sum(1 for _ in QuickSort(pivot_strategy=strategy).iter_steps(test_array))
+            # O(n log n): far below the ~n²/2 compares of a last-element pivot
+            assert steps < 20 * len(test_array) * 13
+        
+        # The iterative driver keeps even the quadratic case off the call stack
+        steps = sum(1 for _ in QuickSort().iter_steps(list(range(1200))))
+        assert steps > 1200 * 1199 // 2
+    
+    def test_three_way_handles_duplicates_in_linear_steps(self):
+        test_array = [5] * 2000
+        
+        three_way = sum(1 for _ in QuickSort(three_way=True).iter_steps(test_array))
+        assert three_way < 3 * len(test_array)
+        
+        final_state = QuickSort(three_way=True).execute([2, 1, 2, 1, 2]).array_states[-1]
+        assert final_state.values == [1, 1, 2, 2, 2]
+        assert set(final_state.sorted_indices) >= {2, 3, 4}
+    
+    def test_random_pivot_is_reproducible(self):
+        test_array = [random.Random(5).randint(0, 1000) for _ in range(100)]
+        
+        first = [step.indices for step in QuickSort(pivot_strategy='random', seed=42).iter_steps(test_array)]
+        second = [step.indices for step in QuickSort(pivot_strategy='random', seed=42).iter_steps(test_array)]
+        assert first == second
+    
+    def test_unknown_pivot_strategy(self):
+        with pytest.raises(ValueError):
+            QuickSort(pivot_strategy='first')
+
+
+class TestBottomUpMergeSort:
+    
+    def test_correctness(self):
+        rng = random.Random(13)
+        cases = [
+            [], [1], [2, 1], [5, 5, 1],
+            [64, 34, 25, 12, 22, 11, 90],
+            [rng.randint(-100, 100) for _ in range(257)],
+            list(range(100, 0, -1))
+        ]
+        
+        for test_array in cases:
+            timeline = MergeSort(bottom_up=True).execute(test_array, keyframe_interval=32)
+            assert timeline.array_states[-1].values == sorted(test_array)
+            assert set(timeline.array_states[-1].sorted_indices) == set(range(len(test_array)))
+    
+    def test_same_visible_steps_as_top_down(self):
+        # For power-of-two sizes both modes perform exactly the same merges
+        test_array = [random.Random(17).randint(0, 99) for _ in range(64)]
+        
+        top_down = list(MergeSort().iter_steps(test_array))
+        bottom_up = list(MergeSort(bottom_up=True).iter_steps(test_array))
+        
+        count = lambda steps: collections.Counter(step.type for step in steps)
+        assert count(top_down) == count(bottom_up)
+        merges = lambda steps: sorted(step.metadata['left_range'] for step in steps if step.metadata)
+        assert merges(top_down) == merges(bottom_up)
+    
+    def test_regions_are_ranges(self):
+        steps = list(MergeSort(bottom_up=True).iter_steps([4, 3, 2, 1, 0]))
+        
+        regions = [step for step in steps if step.type in (StepType.HIGHLIGHT, StepType.CLEAR_HIGHLIGHT, StepType.MERGE)]
+        assert regions and all(isinstance(step.indices, range) for step in regions)
+
+
+class TestStatsMode:
+    
+    def _algorithms(self):
+        return [
+            BubbleSort(), QuickSort(), QuickSort('ninther', three_way=True), MergeSort(),
+            MergeSort(bottom_up=True), HeapSort(), IntroSort(), TimSort(), RadixSort(), CountingSort()
+        ]
+    
+    def test_counts_match_recorded_steps(self):
+        rng = random.Random(5)
+        array = [rng.randint(1, 60) for _ in range(300)]
+        
+        for algorithm in self._algorithms():
+            stats = algorithm.collect_stats(array)
+            expected = collections.Counter(step.type for step in algorithm.iter_steps(array))
+            
+            assert stats.counts == {step_type: expected[step_type] for step_type in StepType}
+            assert stats.writes == 2 * expected[StepType.SWAP] + expected[StepType.OVERWRITE]
+            # Every probe is balanced by the end of the run
+            assert stats.depth == 0 and stats.aux_memory == 0
+    
+    def test_depth_and_memory(self):
+        array = list(range(1024, 0, -1))
+        
+        bubble = BubbleSort().collect_stats(array[:50])
+        assert bubble.max_depth == 0 and bubble.peak_aux_memory == 0
+        
+        merge = MergeSort().collect_stats(array)
+        assert merge.max_depth == 10
+        assert merge.peak_aux_memory == 1024
+        assert MergeSort(bottom_up=True).collect_stats(array).peak_aux_memory == 1024
+        
+        quick = QuickSort('median_of_three').collect_stats(array)
+        assert 0 < quick.max_depth <= 2 * 10
+    
+    def test_max_steps(self):
+        assert HeapSort().collect_stats(list(range(100)), max_steps=25).total_steps == 25
+
+
+class TestSinks:
+    
+    def test_builtin_sinks_follow_protocol(self):
+        for sink in (Timeline([1]), StepStats(), FanOutSink(), StreamSink(lambda data: None)):
+            assert isinstance(sink, StepSink)
+    
+    def test_run_into_timeline_matches_execute(self):
+        array = [5, 2, 8, 1, 9, 3]
+        timeline = MergeSort().run(array, Timeline(array))
+        expected = MergeSort().execute(array)
+        
+        assert timeline.steps == expected.steps
+        assert timeline.array_states[-1].values == sorted(array)
+    
+    def test_fan_out_and_file_round_trip(self, tmp_path):
+        array = [random.Random(2).randint(0, 50) for _ in range(40)]
+        path = str(tmp_path / 'trace.ndjson')
+        stats, timeline = StepStats(), Timeline(array)
+        
+        MergeSort(bottom_up=True).run(array, FanOutSink(stats, timeline, FileSink(path, initial_array=array)))
+        
+        records = list(read_trace(path))
+        assert records[0] == array
+        assert records[1:] == list(timeline.steps)
+        assert stats.total_steps == timeline.get_total_steps()
+        
+        replayed = Timeline(records[0])
+        for step in records[1:]:
+            replayed.add_step(step)
+        assert replayed.array_states[-1].values == sorted(array)
+    
+    def test_fan_out_closes_every_sink(self, tmp_path):
+        class BrokenSink(StepStats):
+            def close(self):
+                raise OSError("flush failed")
+        
+        path = str(tmp_path / 'trace.ndjson')
+        file_sink = FileSink(path, initial_array=[2, 1])
+        with pytest.raises(OSError, match="flush failed"):
+            BubbleSort().run([2, 1], FanOutSink(BrokenSink(), file_sink, BrokenSink()))
+        
+        assert list(read_trace(path))[0] == [2, 1]
+    
+    def test_file_sink_appends(self, tmp_path):
+        path = str(tmp_path / 'trace.ndjson')
+        BubbleSort().run([2, 1], FileSink(path))
+        BubbleSort().run([2, 1], FileSink(path))
+        
+        assert len(list(read_trace(path))) == 2 * BubbleSort().collect_stats([2, 1]).total_steps
+    
+    def test_stream_sink_batches(self):
+        writes = []
+        sink = QuickSort().run(list(range(30, 0, -1)), StreamSink(writes.append, batch_size=16))
+        
+        lines = b"".join(writes).decode().splitlines()
+        assert sink.steps_sent == len(lines) == QuickSort().collect_stats(list(range(30, 0, -1))).total_steps
+        assert all(len(write.splitlines()) <= 16 for write in writes)
+    
+    def test_sink_closed_when_run_fails(self):
+        class FailingSink(StepStats):
+            closed = False
+            
+            def add_step(self, step):
+                raise RuntimeError("disk full")
+            
+            def close(self):
+                self.closed = True
+        
+        sink = FailingSink()
+        with pytest.raises(RuntimeError):
+            HeapSort().run([3, 1, 2], sink)
+        assert sink.closed
\ No newline at end of file
@@ -0,0 +1,45 @@
+import pytest
+from ..benchmarks import run_suite, compare_results, make_input
+from ..algorithms import BubbleSort
+
+
+class TestBenchmarkSuite:
+    
+    def test_make_input_distributions(self):
+        assert make_input('sorted', 5) == [1, 2, 3, 4, 5]
+        assert make_input('reversed', 3) == [3, 2, 1]
+        assert make_input('random', 50, seed=1) == make_input('random', 50, seed=1)
+        assert len(set(make_input('few_unique', 100))) <= 5
+        
+        with pytest.raises(ValueError):
+            make_input('zigzag', 5)
+    
+    def test_run_suite_records_every_case(self):
+        results = run_suite(
+            sizes=[8, 50],
+            distributions=['random', 'reversed'],
+            benchmarks=['execute', 'seek'],
+            algorithms={'bubble': BubbleSort()},
+            repeat=1,
+            quadratic_size_limit=20
+        )
+        entries = results['results']
+        
+        assert len(entries) == 2 * 2 * 2
+        for entry in entries:
+            if entry['size'] == 50:
+                assert entry['status'] == 'skipped'
+            else:
+                assert entry['status'] == 'ok'
+                assert entry['seconds'] >= 0 and entry['peak_bytes'] >= 0 and entry['steps'] > 0
+    
+    def test_compare_flags_regressions(self):
+        def result(seconds, peak_bytes):
+            return {'results': [{
+                'benchmark': 'execute', 'algorithm': 'bubble', 'distribution': 'random',
+                'size': 10, 'status': 'ok', 'seconds': seconds, 'peak_bytes': peak_bytes
+            }]}
+        
+        assert not compare_results(result(1.0, 100), result(1.05, 100))[0]['regression']
+        assert compare_results(result(1.0, 100), result(1.5, 100))[0]['regression']
+        assert compare_results(result(1.0, 100), result(1.0, 200))[0]['regression']
\ No newline at end of file
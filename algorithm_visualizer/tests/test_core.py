@@ -1,7 +1,22 @@
+import asyncio
+import random
+import threading
+import numpy as np
 import pytest
 from ..core.step import Step, StepType
 from ..core.array_state import ArrayState
 from ..core.timeline import Timeline
+from ..core.step_store import StepStore
+from ..core.batch import apply_steps
+from ..core.seek_index import SeekIndex
+from ..core.index_set import IndexSet
+from ..core.explanations import ExplanationEngine
+from ..core.trace_file import MappedTimeline, TraceWriter
+from ..visualization import (
+    AsyncPlaybackController, AsyncVisualizationEngine, PlaybackController, Renderer, VisualizationEngine
+)
+from ..visualization.controller import MIN_SPEED
+from ..visualization.pacing import FramePacer
 
 
 class TestCoreComponents:
@@ -34,7 +49,7 @@ class TestCoreComponents:
         
         copied_state = state.copy()
         copied_state.values[0] = 99
-        copied_state.sorted_indices.append(99)
+        copied_state.sorted_indices.add(99)
         
         assert state.values[0] == 1  # Original unchanged
         assert 99 not in state.sorted_indices  # Original unchanged
@@ -117,4 +132,707 @@ class TestCoreComponents:
         assert timeline.get_progress() == 0.0
         
         timeline.set_position(4)
-        assert timeline.get_progress() == 1.0
\ No newline at end of file
+        assert timeline.get_progress() == 1.0
+
+
+class TestDeltaTimeline:
+    
+    def _build(self, keyframe_interval=None):
+        timeline = Timeline([3, 1, 2, 5], keyframe_interval)
+        timeline.add_step(Step.highlight([0, 1, 2, 3]))
+        timeline.add_step(Step.compare(0, 1))
+        timeline.add_step(Step.swap(0, 1))
+        timeline.add_step(Step.overwrite(3, 0))
+        timeline.add_step(Step.pivot(2))
+        timeline.add_step(Step.clear_highlight([0, 1]))
+        timeline.add_step(Step.mark_sorted([2]))
+        return timeline
+    
+    def test_keyframes_every_interval(self):
+        timeline = self._build(keyframe_interval=3)
+        
+        assert timeline.is_delta_encoded
+        assert len(timeline.keyframes) == 3  # positions 0, 3 and 6
+        assert len(timeline.array_states) == len(timeline.steps) + 1
+    
+    def test_states_match_full_snapshots(self):
+        full = self._build()
+        delta = self._build(keyframe_interval=3)
+        
+        for index in range(len(full.array_states)):
+            assert delta.array_states[index] == full.array_states[index]
+        assert list(delta.array_states) == full.array_states
+        assert delta.array_states[-1].values == [1, 3, 2, 0]
+    
+    def test_current_state_after_set_position(self):
+        full = self._build()
+        delta = self._build(keyframe_interval=2)
+        
+        for position in [4, -1, 0, 6, 2]:
+            full.set_position(position)
+            delta.set_position(position)
+            assert delta.get_current_state() == full.get_current_state()
+    
+    def test_invalid_keyframe_interval(self):
+        with pytest.raises(ValueError):
+            Timeline([1, 2], keyframe_interval=0)
+    
+    def test_cursor_walks_both_directions(self):
+        full = self._build()
+        delta = self._build(keyframe_interval=3)
+        positions = list(range(7)) + list(range(6, -1, -1)) + [5, 1, 6, 0]
+        
+        for position in positions:
+            full.set_position(position)
+            delta.set_position(position)
+            assert delta.get_current_state() == full.get_current_state()
+    
+    def test_current_state_is_read_only_view(self):
+        timeline = self._build(keyframe_interval=3)
+        timeline.set_position(3)
+        
+        view = timeline.get_current_state()
+        with pytest.raises(TypeError):
+            view.values[0] = 42
+        
+        snapshot = view.copy()
+        snapshot.values[0] = 42
+        assert timeline.get_current_state().values == [1, 3, 2, 5]
+    
+    def test_independent_cursors(self):
+        timeline = self._build(keyframe_interval=2)
+        first = timeline.cursor()
+        second = timeline.cursor()
+        
+        assert first.move_to(7).values == [1, 3, 2, 0]
+        assert second.move_to(1).values == [3, 1, 2, 5]
+        assert first.move_to(3).values == [1, 3, 2, 5]
+
+
+class TestStepStore:
+    
+    def _steps(self):
+        return [
+            Step.highlight(list(range(2, 7)), "Highlight"),
+            Step.compare(0, 1, "Compare"),
+            Step.swap(0, 1, "Swap"),
+            Step.overwrite(3, 42, "Overwrite"),
+            Step.overwrite(4, 2.5),
+            Step.mark_sorted([5, 1], "Compare"),
+            Step.merge((0, 2), (2, 4), "Merge"),
+            Step.compare(1, 2, template='bubble_sort.compare', template_args=(1, 2)),
+            Step.swap(1, 2, template='bubble_sort.swap', template_args=(2.5, "x"))
+        ]
+    
+    def test_round_trip(self):
+        steps = self._steps()
+        store = StepStore(steps)
+        
+        assert len(store) == len(steps)
+        assert list(store) == steps
+        assert store[-1] == steps[-1]
+        assert store[3].values == [42]
+        assert store[4].values == [2.5]
+        assert store == steps
+    
+    def test_slicing(self):
+        steps = self._steps()
+        store = StepStore(steps)
+        
+        assert isinstance(store[2:5], StepStore)
+        assert list(store[2:5]) == steps[2:5]
+        assert list(store[::2]) == steps[::2]
+        assert len(store[5:2]) == 0
+        assert [record[0] for record in store[1:3].iter_records()] == ["compare", "swap"]
+    
+    def test_contiguous_indices_are_compact(self):
+        store = StepStore([Step.highlight(list(range(1000)))])
+        
+        assert len(store._indices) == 2
+        assert store[0].indices == list(range(1000))
+    
+    def test_huge_template_args_use_side_table(self):
+        huge = Step.compare(0, 1, template='bubble_sort.compare', template_args=(2 ** 70, -2 ** 63))
+        store = StepStore([Step.swap(0, 1), huge, Step.overwrite(2, 2 ** 64)])
+        store.append(Step.compare(1, 2, template='bubble_sort.compare', template_args=(1, 2)))
+        
+        assert list(store) == [Step.swap(0, 1), huge, Step.overwrite(2, 2 ** 64), store[3]]
+        assert store[3].template_args == (1, 2)
+        assert list(store._args) == [1, 2]
+    
+    def test_compact_timeline(self):
+        timeline = Timeline([3, 1, 2], compact_steps=True)
+        timeline.add_step(Step.swap(0, 1))
+        timeline.add_step(Step.overwrite(2, 0))
+        
+        assert isinstance(timeline.steps, StepStore)
+        assert timeline.array_states[-1].values == [1, 3, 0]
+        timeline.set_position(1)
+        assert timeline.get_current_step() == Step.overwrite(2, 0)
+
+
+class TestBatchApply:
+    
+    def _random_steps(self, count, size, seed=3):
+        rng = random.Random(seed)
+        steps = []
+        for _ in range(count):
+            i, j = rng.randrange(size), rng.randrange(size)
+            kind = rng.random()
+            if kind < 0.3:
+                steps.append(Step.compare(i, j))
+            elif kind < 0.6:
+                steps.append(Step.swap(i, j))
+            elif kind < 0.8:
+                steps.append(Step.overwrite(i, rng.randrange(100)))
+            elif kind < 0.85:
+                steps.append(Step.overwrite(i, rng.random()))
+            elif kind < 0.9:
+                steps.append(Step.highlight(range(min(i, j), max(i, j) + 1)))
+            elif kind < 0.93:
+                steps.append(Step.clear_highlight([i, j]))
+            elif kind < 0.96:
+                steps.append(Step.pivot(i))
+            else:
+                steps.append(Step.mark_sorted([i]))
+        return steps
+    
+    def _timeline(self, steps, initial, **options):
+        timeline = Timeline(initial, **options)
+        for step in steps:
+            timeline.add_step(step)
+        return timeline
+    
+    def test_matches_step_by_step_replay(self):
+        steps = self._random_steps(3000, 40)
+        initial = [float(value) for value in range(40)]
+        full = self._timeline(steps, initial)
+        store = StepStore(steps)
+        
+        for start, stop in [(0, 3000), (0, 33), (100, 2900), (1234, 1300), (2999, 3000)]:
+            state = apply_steps(full.get_state_at(start), store, start, stop)
+            assert state == full.array_states[stop]
+    
+    def test_delta_timeline_and_cursor_jumps(self):
+        steps = self._random_steps(5000, 25)
+        initial = [float(value) for value in range(25)]
+        full = self._timeline(steps, initial)
+        delta = self._timeline(steps, initial, keyframe_interval=1000, compact_steps=True)
+        
+        for position in [4999, 10, 2500, 2499, 2400, 4100, 0, 3999, 4000, 1700]:
+            full.set_position(position)
+            delta.set_position(position)
+            assert delta.get_current_state() == full.get_current_state()
+    
+    def test_numpy_values(self):
+        steps = self._random_steps(5000, 25, seed=8)
+        initial = [float(value) for value in range(25)]
+        full = self._timeline(steps, initial)
+        numpy_timeline = self._timeline(steps, initial, keyframe_interval=512, compact_steps=True,
+                                        numpy_values=True)
+        
+        assert numpy_timeline.initial_array == initial
+        for position in [3000, 4999, 12, 2048]:
+            state = numpy_timeline.get_state_at(position)
+            assert isinstance(state.values, np.ndarray)
+            assert state == full.array_states[position]
+    
+    def test_numpy_overwrite_runs_keep_last_write(self):
+        steps = [Step.overwrite(index % 5, index) for index in range(200)]
+        timeline = self._timeline(steps, [0] * 5, keyframe_interval=1000, compact_steps=True,
+                                  numpy_values=True)
+        
+        assert timeline.get_state_at(200).values.tolist() == [195, 196, 197, 198, 199]
+        assert timeline.get_state_at(103).values.tolist() == [100, 101, 102, 98, 99]
+
+
+class TestSeekIndex:
+    
+    def test_floor_and_next(self):
+        index = SeekIndex()
+        for position in (0, 10, 25, 26):
+            index.add(position, ArrayState(values=[position]))
+        
+        assert index.floor(9)[0] == 0
+        assert index.floor(10)[1].values == [10]
+        assert index.floor_position(1000) == 26
+        assert index.next_position(10) == 25
+        assert index.next_position(26) is None
+        assert index.max_gap(40) == 15
+        with pytest.raises(ValueError):
+            index.add(20, ArrayState(values=[]))
+    
+    def _steps(self):
+        # A long scan of comparisons, then a burst of swaps
+        return [Step.compare(i % 5, 5) for i in range(400)] + [Step.swap(i % 5, 5) for i in range(100)]
+    
+    def test_adaptive_keyframes_follow_state_changes(self):
+        timeline = Timeline([5, 4, 3, 2, 1, 0], keyframe_interval=20, adaptive_keyframes=True)
+        for step in self._steps():
+            timeline.add_step(step)
+        
+        positions = timeline.seek_index.positions
+        assert sum(position <= 400 for position in positions) == 6   # every 80 comparisons
+        assert sum(position > 400 for position in positions) == 5    # every 20 swaps
+        assert timeline.seek_stats() == {'keyframes': 11, 'max_replay_steps': 80}
+        
+        with pytest.raises(ValueError):
+            Timeline([1], adaptive_keyframes=True)
+    
+    def test_controller_seeks_adaptive_timeline(self):
+        steps = self._steps()
+        full = Timeline([5, 4, 3, 2, 1, 0])
+        adaptive = Timeline([5, 4, 3, 2, 1, 0], keyframe_interval=20, compact_steps=True, adaptive_keyframes=True)
+        for step in steps:
+            full.add_step(step)
+            adaptive.add_step(step)
+        
+        seen = []
+        controller = PlaybackController()
+        controller.set_timeline(adaptive)
+        controller.on_position_change = lambda state, step: seen.append(state.copy())
+        for position in (450, 12, 499, 401, 400, 399, 0, 250):
+            controller.set_position(position)
+            assert seen[-1] == full.array_states[position]
+    
+    def test_cursor_sees_keyframes_added_later(self):
+        steps = [Step.swap(i % 5, i % 5 + 1) for i in range(60)]
+        full = Timeline([5, 4, 3, 2, 1, 0])
+        growing = Timeline([5, 4, 3, 2, 1, 0], keyframe_interval=16, compact_steps=True)
+        for step in steps:
+            full.add_step(step)
+        for step in steps[:10]:
+            growing.add_step(step)
+        
+        cursor = growing.cursor()
+        assert cursor.move_to(10) == full.array_states[10]
+        assert cursor._next_keyframe is None
+        
+        for step in steps[10:]:
+            growing.add_step(step)
+        assert cursor.move_to(12) == full.array_states[12]
+        assert cursor._next_keyframe == 16
+        for position in range(13, 61):
+            assert cursor.move_to(position) == full.array_states[position]
+            assert len(cursor._undo) <= 16
+
+
+def _comparison_timeline(steps):
+    timeline = Timeline(list(range(8)), keyframe_interval=64, compact_steps=True)
+    for i in range(steps):
+        timeline.add_step(Step.compare(i % 7, i % 7 + 1))
+    return timeline
+
+
+class TestPlayback:
+    
+    def test_pacer_below_frame_rate(self):
+        pacer = FramePacer(fps=60)
+        pacer.start(rate=2, now=10.0)
+        assert pacer.due(10.0) == 1
+        assert pacer.next_frame(10.0) == 10.5
+        # A frame that ran late does not push later steps back
+        assert pacer.due(10.7) == 1
+        assert pacer.next_frame(10.7) == 11.0
+        assert pacer.due(11.0) == 1
+    
+    def test_pacer_coalesces_steps_per_frame(self):
+        pacer = FramePacer(fps=64)
+        pacer.start(rate=6400, now=0.0)
+        frame_start, shown = 0.0, 0
+        for frame in range(64):
+            assert frame_start == frame / 64
+            shown += pacer.due(frame_start)
+            frame_start = pacer.next_frame(frame_start)
+        assert shown == 1 + 63 * 100
+        # A slow frame skips ahead instead of falling behind
+        assert pacer.due(frame_start + 0.5) == 3300
+    
+    def test_pacer_rate_change_keeps_progress(self):
+        pacer = FramePacer()
+        pacer.start(rate=1, now=0.0)
+        assert pacer.due(0.0) == 1
+        # Half of the next step was already earned at the old rate
+        pacer.set_rate(100, now=0.5)
+        assert pacer.due(0.5) == 0
+        assert pacer.next_frame(0.5) == pytest.approx(0.5 + 1 / 60)
+        assert pacer.due(0.6) == 10
+        with pytest.raises(ValueError):
+            pacer.set_rate(0, now=1.0)
+    
+    def test_fast_playback_renders_frames_not_steps(self):
+        timeline = _comparison_timeline(20000)
+        frames, done = [], []
+        controller = PlaybackController(fps=100)
+        controller.set_timeline(timeline)
+        controller.on_position_change = lambda state, step: frames.append(timeline.current_position)
+        controller.on_playback_complete = lambda: done.append(True)
+        controller.set_steps_per_second(50000)
+        assert controller.steps_per_second == 50000
+        
+        controller.play()
+        controller.playback_thread.join(timeout=5)
+        assert done == [True] and not controller.is_playing
+        assert frames == sorted(frames) and frames[-1] == 19999
+        assert len(frames) < 200
+    
+    def test_stop_joins_playback_thread(self):
+        timeline = _comparison_timeline(100)
+        controller = PlaybackController()
+        controller.set_timeline(timeline)
+        first_frame = threading.Event()
+        controller.on_position_change = lambda state, step: first_frame.set()
+        controller.set_speed(MIN_SPEED)
+        controller.play()
+        thread = controller.playback_thread
+        # The first step is shown at once; the next is five seconds away
+        assert first_frame.wait(5)
+        controller.set_position(50)
+        controller.stop()
+        assert not thread.is_alive() and controller.playback_thread is None
+        assert timeline.current_position == 50
+    
+    def test_callback_can_pause_playback(self):
+        timeline = _comparison_timeline(1000)
+        controller = PlaybackController()
+        controller.set_timeline(timeline)
+        controller.set_steps_per_second(1000)
+        controller.on_position_change = lambda state, step: controller.pause()
+        controller.play()
+        controller.playback_thread.join(timeout=5)
+        assert not controller.is_playing and timeline.current_position == 0
+    
+    def test_callback_can_swap_timeline(self):
+        timeline, replacement = _comparison_timeline(10), Timeline([1])
+        completed = []
+        controller = PlaybackController()
+        controller.set_timeline(timeline)
+        controller.set_steps_per_second(1000)
+        controller.on_position_change = lambda state, step: controller.set_timeline(replacement)
+        controller.on_playback_complete = lambda: completed.append(True)
+        controller.play()
+        controller.playback_thread.join(timeout=5)
+        # The old run stops without finishing against the new timeline
+        assert controller.timeline is replacement and not completed
+        assert replacement.current_position == -1
+
+
+class TestAsyncPlayback:
+    
+    def test_many_sessions_share_one_loop(self):
+        async def session(frames):
+            done = asyncio.Event()
+            controller = AsyncPlaybackController(fps=100)
+            await controller.set_timeline(_comparison_timeline(2000))
+            controller.on_position_change = lambda state, step: frames.append(step)
+            controller.on_playback_complete = done.set
+            controller.set_steps_per_second(20000)
+            controller.play()
+            await asyncio.wait_for(done.wait(), 5)
+            return controller
+        
+        async def main():
+            threads = threading.active_count()
+            frames = [[] for _ in range(200)]
+            controllers = await asyncio.gather(*(session(seen) for seen in frames))
+            assert threading.active_count() == threads
+            return controllers, frames
+        
+        controllers, frames = asyncio.run(main())
+        for controller, seen in zip(controllers, frames):
+            assert not controller.is_playing and controller.current_position == 1999
+            assert 0 < len(seen) < 100
+    
+    def test_commands_wait_for_frame_callbacks(self):
+        timeline = _comparison_timeline(1000)
+        notified = []
+        
+        controller = AsyncPlaybackController()
+        
+        async def on_position_change(state, step):
+            before = controller.current_position
+            await asyncio.sleep(0.002)   # e.g. a websocket send
+            notified.append((before, controller.current_position))
+        
+        async def main():
+            await controller.set_timeline(timeline)
+            controller.on_position_change = on_position_change
+            controller.set_steps_per_second(2000)
+            controller.play()
+            for position in (900, 10, 500, 20):
+                await controller.set_position(position)
+                await asyncio.sleep(0.005)
+            await controller.stop()
+            assert controller.playback_task is None
+        
+        asyncio.run(main())
+        assert len(notified) > 4
+        assert all(before == after for before, after in notified)
+    
+    def test_sessions_share_one_timeline(self):
+        steps = [Step.swap(i % 7, i % 7 + 1) for i in range(500)]
+        shared = Timeline(list(range(8)), keyframe_interval=16, compact_steps=True)
+        full = Timeline(list(range(8)))
+        for step in steps:
+            shared.add_step(step)
+            full.add_step(step)
+        checked = []
+        
+        def session(controller):
+            async def on_position_change(state, step):
+                position = controller.current_position
+                await asyncio.sleep(0.001)
+                # The view is still this session's state after the send
+                checked.append(state == full.array_states[position])
+            controller.on_position_change = on_position_change
+        
+        async def main():
+            player, seeker = AsyncPlaybackController(), AsyncPlaybackController()
+            for controller in (player, seeker):
+                await controller.set_timeline(shared)
+                session(controller)
+            player.set_steps_per_second(5000)
+            player.play()
+            for position in (400, 3, 250, 77, 499, 120):
+                await seeker.set_position(position)
+                await asyncio.sleep(0.005)
+            await player.stop()
+            assert seeker.current_position == 120 and player.current_position > 0
+        
+        asyncio.run(main())
+        assert len(checked) > 6 and all(checked)
+        assert shared.current_position == -1
+    
+    def test_engine_awaits_renderer_and_callbacks(self):
+        class SocketRenderer(Renderer):
+            def __init__(self):
+                self.frames = []
+            
+            async def render(self, state):
+                await asyncio.sleep(0)
+                self.frames.append(list(state.values))
+            
+            def clear(self):
+                pass
+        
+        timeline = Timeline([3, 1, 2])
+        timeline.add_step(Step.swap(0, 1))
+        timeline.add_step(Step.swap(1, 2))
+        renderer = SocketRenderer()
+        engine = AsyncVisualizationEngine(renderer)
+        
+        async def main():
+            done = asyncio.Event()
+            
+            async def on_complete():
+                await engine.reset()
+                done.set()
+            
+            engine.on_complete = on_complete
+            await engine.load_timeline(timeline)
+            engine.set_speed(50)
+            engine.play()
+            await asyncio.wait_for(done.wait(), 5)
+            await engine.stop()
+        
+        asyncio.run(main())
+        assert renderer.frames == [[3, 1, 2], [1, 3, 2]]
+        assert timeline.current_position == -1
+
+
+class TestTraceFile:
+    
+    def _steps(self):
+        return TestStepStore()._steps() + [
+            Step.pivot(3),
+            Step.clear_highlight(range(2, 5)),
+            Step.mark_sorted(range(0, 7), "Done")
+        ]
+    
+    def _write(self, path, steps, keyframe_interval=4):
+        with TraceWriter(path, [3, 1, 2, 5, 4, 0, 6], keyframe_interval) as writer:
+            for step in steps:
+                writer.add_step(step)
+        return MappedTimeline(path)
+    
+    def test_round_trip(self, tmp_path):
+        steps = self._steps()
+        with self._write(str(tmp_path / 'trace'), steps) as mapped:
+            assert len(mapped.steps) == len(steps)
+            assert list(mapped.steps) == steps
+            assert mapped.steps[-1] == steps[-1]
+            assert mapped.steps[4].values == [2.5]
+            assert mapped.steps[8].template_args == (2.5, "x")
+            assert mapped.steps[6].metadata == {'left_range': (0, 2), 'right_range': (2, 4)}
+    
+    def test_states_match_in_memory_timeline(self, tmp_path):
+        steps = self._steps()
+        timeline = Timeline([3, 1, 2, 5, 4, 0, 6])
+        for step in steps:
+            timeline.add_step(step)
+        
+        with self._write(str(tmp_path / 'trace'), steps, keyframe_interval=3) as mapped:
+            assert mapped.initial_array == timeline.initial_array
+            assert list(mapped.array_states) == timeline.array_states
+            for position in [11, 0, 5, -1, 7, 3, 10]:
+                mapped.set_position(position)
+                timeline.set_position(position)
+                assert mapped.get_current_state() == timeline.get_current_state()
+                assert mapped.get_current_step() == timeline.get_current_step()
+    
+    def test_fixed_size_records(self, tmp_path):
+        path = tmp_path / 'trace'
+        self._write(str(path), [Step.compare(0, 1), Step.swap(0, 1)]).close()
+        
+        assert (path / 'steps.bin').stat().st_size == 2 * 64
+        assert (path / 'extras.bin').stat().st_size == 0
+    
+    def test_read_only(self, tmp_path):
+        with self._write(str(tmp_path / 'trace'), []) as mapped:
+            assert mapped.get_total_steps() == 0
+            assert mapped.array_states[-1].values == [3, 1, 2, 5, 4, 0, 6]
+            with pytest.raises(TypeError):
+                mapped.add_step(Step.compare(0, 1))
+    
+    def test_incomplete_trace_is_rejected(self, tmp_path):
+        path = str(tmp_path / 'trace')
+        writer = TraceWriter(path, [1, 2])
+        writer.add_step(Step.compare(0, 1))
+        
+        with pytest.raises(FileNotFoundError):
+            MappedTimeline(path)
+        writer.close()
+        assert MappedTimeline(path).get_total_steps() == 1
+    
+    def test_flushed_trace_is_partial(self, tmp_path):
+        path = str(tmp_path / 'trace')
+        steps = self._steps()
+        writer = TraceWriter(path, [3, 1, 2, 5, 4, 0, 6], keyframe_interval=4)
+        for step in steps[:8]:
+            writer.add_step(step)
+        writer.flush()
+        writer.add_step(steps[8])
+        
+        with pytest.raises(ValueError):
+            MappedTimeline(path)
+        with MappedTimeline(path, allow_partial=True) as partial:
+            assert not partial.complete and partial.steps[:] == steps[:8]
+            assert partial.get_state_at(8) == self._write(str(tmp_path / 'full'), steps).get_state_at(8)
+        writer.close()
+        assert MappedTimeline(path).complete
+    
+    def test_plays_in_visualization_engine(self, tmp_path):
+        class RecordingRenderer(Renderer):
+            def __init__(self):
+                self.frames = []
+            
+            def render(self, state):
+                self.frames.append(list(state.values))
+            
+            def clear(self):
+                pass
+        
+        renderer = RecordingRenderer()
+        engine = VisualizationEngine(renderer)
+        with self._write(str(tmp_path / 'trace'), [Step.swap(0, 1), Step.overwrite(2, 9)]) as mapped:
+            engine.load_timeline(mapped)
+            engine.set_position(1)
+            engine.step_backward()
+        
+        assert renderer.frames == [[1, 3, 2, 5, 4, 0, 6], [3, 1, 2, 5, 4, 0, 6]]
+
+
+class TestIndexSet:
+    
+    def test_membership_and_ranges(self):
+        indices = IndexSet([5, 1, 5])
+        indices.update(range(10, 20))
+        
+        assert len(indices) == 12
+        assert 1 in indices and 15 in indices
+        assert 2 not in indices and -1 not in indices and 100 not in indices
+        assert list(indices)[:3] == [1, 5, 10]
+        
+        indices.difference_update(range(0, 12))
+        assert list(indices) == list(range(12, 20))
+        assert indices == set(range(12, 20))
+    
+    def test_negative_indices_rejected(self):
+        indices = IndexSet([1, 2], size=4)
+        for update in (lambda: indices.add(-1), lambda: indices.update([-4]),
+                       lambda: indices.update(range(-2, 2))):
+            with pytest.raises(ValueError):
+                update()
+        
+        assert -1 not in indices and -3 not in indices
+        assert list(indices) == [1, 2]
+    
+    def test_numpy_indices_match_ints(self):
+        indices = IndexSet(np.array([4, 0]))
+        indices.add(np.int32(2))
+        
+        assert list(indices) == [0, 2, 4]
+        assert all(type(index) is int for index in indices)
+        assert np.int64(4) in indices and np.int64(3) not in indices
+        assert indices.discard(np.int64(0)) == [(0, b'\x01')]
+        assert 1.0 not in indices and 'a' not in indices
+    
+    def test_restore_undoes_mutations(self):
+        indices = IndexSet([2, 3])
+        snapshot = indices.copy()
+        
+        undo = [
+            indices.update([3, 4]),
+            indices.replace(range(0, 8)),
+            indices.difference_update([1, 9]),
+            indices.clear()
+        ]
+        assert len(indices) == 0
+        
+        for segments in reversed(undo):
+            indices.restore(segments)
+        assert indices == snapshot
+        assert list(indices) == [2, 3]
+    
+    def test_array_state_backtracks_highlights(self):
+        state = ArrayState([4, 3, 2, 1], sorted_indices=[3])
+        steps = [
+            Step.highlight(range(0, 4)),
+            Step.clear_highlight([1, 2]),
+            Step.mark_sorted(range(2, 4)),
+            Step.highlight([0])
+        ]
+        
+        history = []
+        for step in steps:
+            before = state.copy()
+            history.append((step, state.advance(step), before))
+        
+        assert state.highlighted_indices == {0}
+        assert len(state.sorted_indices) == 2
+        
+        for step, undo, before in reversed(history):
+            state.retreat(step, undo)
+            assert state == before
+
+
+class TestExplanations:
+    
+    def test_template_rendering(self):
+        engine = ExplanationEngine()
+        step = Step.compare(3, 4, template='bubble_sort.compare', template_args=(3, 4))
+        
+        assert step.explanation == ""
+        assert engine.get_step_explanation(step) == "Comparing elements at positions 3 and 4"
+    
+    def test_explicit_explanation_wins(self):
+        engine = ExplanationEngine()
+        step = Step.swap(0, 1, "Custom", template='bubble_sort.swap', template_args=(1, 2))
+        
+        assert engine.get_step_explanation(step) == "Custom"
+    
+    def test_unhashable_arguments(self):
+        engine = ExplanationEngine()
+        step = Step.compare(0, 1, template='merge_sort.compare', template_args=([1], [2]))
+        
+        assert engine.get_step_explanation(step) == "Comparing [1] with [2]"
\ No newline at end of file
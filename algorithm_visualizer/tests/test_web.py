@@ -0,0 +1,699 @@
+import itertools
+import json
+import time
+import zlib
+import pytest
+from ..core.timeline import Timeline
+from ..web import flask_app
+from ..web.flask_app import app, job_manager, timeline_cache, timeline_store
+from ..web.cache import TimelineCache
+from ..web.binary_format import BINARY_MIMETYPE, decode_timeline, encode_steps
+from ..web.compression import available_encodings, compress_stream, decompress
+from ..web.sessions import TimelineStore
+from ..web.executor import ExecutionPool, JobCancelledError, JobTimeoutError, PoolSaturatedError
+from ..web.jobs import JobManager
+from ..algorithms import BubbleSort
+from ..core.trace_file import MappedTimeline
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestExecuteEndpoint:
+    
+    def test_json_response(self, client):
+        response = client.post('/api/execute', json={'algorithm': 'bubble', 'array': [3, 1, 2]})
+        data = response.get_json()
+        
+        assert response.status_code == 200
+        assert data['initial_array'] == [3, 1, 2]
+        assert len(data['array_states']) == len(data['steps']) + 1
+        assert data['array_states'][-1]['values'] == [1, 2, 3]
+    
+    def test_unknown_algorithm(self, client):
+        response = client.post('/api/execute', json={'algorithm': 'bogo', 'array': [1]})
+        assert response.status_code == 400
+    
+    def test_invalid_input_for_algorithm(self, client):
+        response = client.post('/api/execute', json={'algorithm': 'radix', 'array': [1.5, 2]})
+        
+        assert response.status_code == 400
+        assert 'integer' in response.get_json()['error']
+        
+        for endpoint in ('/api/execute', '/api/jobs'):
+            response = client.post(endpoint, json={'algorithm': 'counting', 'array': [0, 10 ** 10]})
+            assert response.status_code == 400
+            assert 'value range' in response.get_json()['error']
+    
+    def test_malformed_run_requests_rejected(self, client):
+        bodies = [
+            ({'algorithm': 'bubble', 'array': [2, 1], 'max_steps': bad}, 'max_steps')
+            for bad in ([1], {}, 'x', True, 2.7, -1)
+        ] + [
+            ({'algorithm': 'bubble', 'array': 'abc'}, 'array'),
+            ([{'algorithm': 'bubble'}], 'JSON object')
+        ]
+        for endpoint in ('/api/execute', '/api/timelines', '/api/jobs'):
+            for body, message in bodies:
+                response = client.post(endpoint, json=body)
+                assert response.status_code == 400
+                assert message in response.get_json()['error']
+        
+        assert client.post('/api/batch', json=[1]).status_code == 400
+        response = client.post('/api/batch', json={'jobs': [{'algorithm': 'bubble', 'max_steps': 'x'}]})
+        assert 'max_steps' in response.get_json()['results'][0]['error']
+    
+    def test_ndjson_stream(self, client):
+        array = [5, 2, 8, 1, 9, 3]
+        expected = client.post('/api/execute', json={'algorithm': 'merge', 'array': array}).get_json()
+        
+        response = client.post(
+            '/api/execute',
+            json={'algorithm': 'merge', 'array': array, 'chunk_size': 7},
+            headers={'Accept': 'application/x-ndjson'}
+        )
+        assert response.mimetype == 'application/x-ndjson'
+        
+        events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert events[0] == {'event': 'init', 'algorithm': 'merge', 'initial_array': array}
+        assert events[-1] == {'event': 'done', 'total_steps': len(expected['steps'])}
+        
+        steps = []
+        for event in events[1:-1]:
+            assert event['event'] == 'steps'
+            assert event['start'] == len(steps)
+            assert len(event['steps']) <= 7
+            steps.extend(event['steps'])
+        assert steps == expected['steps']
+    
+    def test_invalid_chunk_size_rejected(self, client):
+        for chunk_size in ('abc', None, [5], 0, True, 10 ** 6):
+            response = client.post(
+                '/api/execute',
+                json={'algorithm': 'merge', 'array': [2, 1], 'chunk_size': chunk_size},
+                headers={'Accept': 'application/x-ndjson'}
+            )
+            assert response.status_code == 400
+            assert 'chunk_size' in response.get_json()['error']
+    
+    def test_sse_stream(self, client):
+        response = client.post(
+            '/api/execute',
+            json={'algorithm': 'quick', 'array': [3, 2, 1], 'stream': 'sse'}
+        )
+        assert response.mimetype == 'text/event-stream'
+        
+        messages = response.get_data(as_text=True).strip().split('\n\n')
+        assert messages[0].startswith('event: init\ndata: ')
+        assert messages[-1].startswith('event: done\ndata: ')
+    
+    def test_stream_max_steps(self, client):
+        response = client.post(
+            '/api/execute',
+            json={'algorithm': 'bubble', 'array': list(range(500, 0, -1)), 'max_steps': 20},
+            headers={'Accept': 'application/x-ndjson'}
+        )
+        events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        
+        assert events[-1] == {'event': 'done', 'total_steps': 20}
+    
+    def test_lazy_explanations(self, client):
+        eager = client.post('/api/execute', json={'algorithm': 'bubble', 'array': [2, 1]}).get_json()
+        lazy = client.post(
+            '/api/execute',
+            json={'algorithm': 'bubble', 'array': [2, 1], 'lazy_explanations': True}
+        ).get_json()
+        
+        templates = lazy['explanation_templates']
+        for eager_step, lazy_step in zip(eager['steps'], lazy['steps']):
+            if 'template' in lazy_step:
+                rendered = templates[lazy_step['template']].format(*lazy_step['template_args'])
+            else:
+                rendered = lazy_step['explanation']
+            assert rendered == eager_step['explanation']
+        assert lazy['steps'][1] == {
+            'type': 'compare', 'indices': [0, 1], 'values': [], 'metadata': {},
+            'template': 'bubble_sort.compare', 'template_args': [0, 1]
+        }
+    
+    def test_repeat_request_hits_cache(self, client):
+        timeline_cache.clear()
+        body = {'algorithm': 'merge', 'array': [9, 4, 7, 1]}
+        
+        first = client.post('/api/execute', json=body)
+        second = client.post('/api/execute', json=body)
+        
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert first.get_data() == second.get_data()
+        
+        stats = client.get('/api/cache/stats').get_json()
+        assert stats['hits'] >= 1 and stats['entries'] >= 1
+    
+    def test_binary_response(self, client):
+        array = [7, 3, 9, 1, 4]
+        lazy = client.post(
+            '/api/execute',
+            json={'algorithm': 'merge', 'array': array, 'lazy_explanations': True}
+        ).get_json()
+        
+        response = client.post(
+            '/api/execute',
+            json={'algorithm': 'merge', 'array': array},
+            headers={'Accept': f'{BINARY_MIMETYPE}, application/json;q=0.5'}
+        )
+        assert response.mimetype == BINARY_MIMETYPE
+        
+        decoded = decode_timeline(response.get_data())
+        assert decoded['initial_array'] == array
+        assert decoded['explanation_templates'] == lazy['explanation_templates']
+        assert json.loads(json.dumps(decoded['steps'])) == lazy['steps']
+    
+    def test_binary_cached_separately_from_json(self, client):
+        timeline_cache.clear()
+        body = {'algorithm': 'heap', 'array': [4, 8, 2, 6]}
+        
+        as_json = client.post('/api/execute', json=body)
+        as_binary = client.post('/api/execute', json={**body, 'format': 'binary'})
+        repeat = client.post('/api/execute', json={**body, 'format': 'binary'})
+        
+        assert as_json.mimetype == 'application/json'
+        assert as_binary.headers['X-Cache'] == 'MISS'
+        assert repeat.headers['X-Cache'] == 'HIT'
+        assert repeat.mimetype == BINARY_MIMETYPE
+        assert repeat.get_data() == as_binary.get_data()
+
+
+class TestTimelineCache:
+    
+    def test_key_depends_on_all_inputs(self):
+        key = TimelineCache.make_key('bubble', [1, 2])
+        
+        assert key == TimelineCache.make_key('bubble', [1, 2])
+        assert key != TimelineCache.make_key('quick', [1, 2])
+        assert key != TimelineCache.make_key('bubble', [2, 1])
+        assert key != TimelineCache.make_key('bubble', [1, 2], max_steps=5)
+    
+    def test_lru_eviction_by_count(self):
+        cache = TimelineCache(max_entries=2)
+        cache.put('a', b'1')
+        cache.put('b', b'2')
+        cache.get('a')
+        cache.put('c', b'3')
+        
+        assert 'a' in cache and 'c' in cache and 'b' not in cache
+        assert cache.stats()['evictions'] == 1
+    
+    def test_eviction_by_bytes(self):
+        cache = TimelineCache(max_bytes=10)
+        cache.put('a', b'12345')
+        cache.put('b', b'12345')
+        cache.put('c', b'123')
+        cache.put('huge', b'x' * 11)
+        
+        assert 'a' not in cache and 'b' in cache and 'c' in cache
+        assert 'huge' not in cache
+        assert cache.stats()['bytes'] == 8
+    
+    def test_hit_and_miss_counters(self):
+        cache = TimelineCache()
+        cache.put('a', b'1')
+        
+        assert cache.get('a') == b'1'
+        assert cache.get('missing') is None
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses']) == (1, 1)
+        assert stats['hit_rate'] == 0.5
+    
+    def test_disk_tier(self, tmp_path):
+        TimelineCache(cache_dir=str(tmp_path)).put('a', b'payload')
+        
+        fresh = TimelineCache(cache_dir=str(tmp_path))
+        assert fresh.get('a') == b'payload'
+        assert fresh.stats()['disk_hits'] == 1
+        assert 'a' in fresh
+    
+    def test_disk_tier_lru_eviction(self, tmp_path):
+        cache = TimelineCache(max_entries=1, cache_dir=str(tmp_path), max_disk_entries=2,
+                              max_disk_bytes=12)
+        cache.put('a', b'12345')
+        cache.put('b', b'12345')
+        cache.get('a')
+        cache.put('c', b'12')
+        
+        assert sorted(path.name for path in tmp_path.iterdir()) == ['a.entry', 'c.entry']
+        stats = cache.stats()
+        assert (stats['disk_entries'], stats['disk_bytes'], stats['disk_evictions']) == (2, 7, 1)
+        
+        cache.put('d', b'12345678901')
+        assert sorted(path.name for path in tmp_path.iterdir()) == ['d.entry']
+        
+        # A restart adopts the files already there and keeps the bounds
+        fresh = TimelineCache(cache_dir=str(tmp_path), max_disk_entries=1)
+        fresh.put('e', b'1')
+        assert sorted(path.name for path in tmp_path.iterdir()) == ['e.entry']
+
+
+class TestBinaryFormat:
+    
+    def test_mixed_values_round_trip(self):
+        from ..core.step import Step
+        steps = [
+            Step.overwrite(2, -7.5, "Write a float"),
+            Step.swap(0, 4, "Swap ends"),
+            Step.highlight(range(1, 4), "Region"),
+            Step.mark_sorted([5, 1, 3], "Scattered"),
+        ]
+        data = encode_steps(['a', None, 3, -2, 1e20, 2 ** 40], steps, lambda step: step.explanation)
+        decoded = decode_timeline(data)
+        
+        assert decoded['initial_array'] == ['a', None, 3, -2, 1e20, 2 ** 40]
+        assert [step['indices'] for step in decoded['steps']] == [[2], [0, 4], [1, 2, 3], [5, 1, 3]]
+        assert decoded['steps'][0]['values'] == [-7.5]
+        assert decoded['steps'][3]['explanation'] == "Scattered"
+    
+    def test_compact_size(self, client):
+        response = client.post(
+            '/api/execute',
+            json={'algorithm': 'bubble', 'array': list(range(200, 0, -1)), 'format': 'binary'}
+        )
+        step_count = len(decode_timeline(response.get_data())['steps'])
+        
+        assert len(response.get_data()) < 8 * step_count
+    
+    def test_rejects_bad_header(self):
+        with pytest.raises(ValueError):
+            decode_timeline(b'JSON' + bytes(20))
+
+
+class TestCompression:
+    
+    def test_gzip_json_response(self, client):
+        body = {'algorithm': 'bubble', 'array': list(range(40, 0, -1))}
+        plain = client.post('/api/execute', json=body)
+        response = client.post('/api/execute', json=body, headers={'Accept-Encoding': 'gzip'})
+        
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert decompress(response.get_data(), 'gzip') == plain.get_data()
+        assert len(response.get_data()) * 10 < len(plain.get_data())
+    
+    def test_cache_stores_compressed_payload(self, client):
+        timeline_cache.clear()
+        body = {'algorithm': 'merge', 'array': list(range(30, 0, -1))}
+        headers = {'Accept-Encoding': 'gzip'}
+        
+        first = client.post('/api/execute', json=body, headers=headers)
+        second = client.post('/api/execute', json=body, headers=headers)
+        
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.headers['Content-Encoding'] == 'gzip'
+        assert second.get_data() == first.get_data()
+        # The single cached entry is the gzip body itself
+        assert timeline_cache.stats()['bytes'] == len(first.get_data())
+    
+    def test_identity_when_not_accepted(self, client):
+        response = client.post(
+            '/api/execute',
+            json={'algorithm': 'bubble', 'array': list(range(40, 0, -1))},
+            headers={'Accept-Encoding': 'gzip;q=0, unknown'}
+        )
+        
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json()['initial_array'][0] == 40
+    
+    def test_compressed_stream_decodes_incrementally(self, client):
+        body = {'algorithm': 'quick', 'array': list(range(60, 0, -1)), 'chunk_size': 50}
+        plain = client.post('/api/execute', json=body, headers={'Accept': 'application/x-ndjson'}).get_data(as_text=True)
+        response = client.post(
+            '/api/execute', json=body,
+            headers={'Accept': 'application/x-ndjson', 'Accept-Encoding': 'gzip'}
+        )
+        assert response.headers['Content-Encoding'] == 'gzip'
+        
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        text = ''
+        for chunk in response.response:
+            text += decoder.decompress(chunk).decode('utf-8')
+            # Every flushed chunk ends on a complete line
+            assert text.endswith('\n')
+        assert text == plain
+    
+    def test_small_api_responses_left_alone(self, client):
+        response = client.get('/api/cache/stats', headers={'Accept-Encoding': 'gzip'})
+        
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json()['max_entries'] == 256
+    
+    def test_compress_stream_round_trip(self):
+        chunks = [f"line {i}\n" for i in range(100)]
+        for encoding in available_encodings():
+            data = b''.join(compress_stream(chunks, encoding))
+            assert decompress(data, encoding) == ''.join(chunks).encode('utf-8')
+
+
+class TestPagedTimelines:
+    
+    def test_pages_match_full_timeline(self, client):
+        array = [8, 3, 5, 1, 9, 2, 7]
+        full = client.post(
+            '/api/execute', json={'algorithm': 'heap', 'array': array, 'lazy_explanations': True}
+        ).get_json()
+        
+        created = client.post('/api/timelines', json={'algorithm': 'heap', 'array': array})
+        assert created.status_code == 201
+        info = created.get_json()
+        assert info['total_steps'] == len(full['steps'])
+        
+        page = client.get(f"/api/timelines/{info['id']}/steps?start=10&end=25").get_json()
+        assert (page['start'], page['end']) == (10, 25)
+        assert page['steps'] == full['steps'][10:25]
+        
+        for position in (len(full['steps']), 0, 17, 16, 40):
+            state = client.get(f"/api/timelines/{info['id']}/state?position={position}").get_json()
+            assert state['state'] == full['array_states'][position]
+    
+    def test_keyframe_settings(self, client):
+        array = list(range(60, 0, -1))
+        full = client.post('/api/execute', json={'algorithm': 'merge', 'array': array}).get_json()
+        
+        dense = client.post('/api/timelines', json={
+            'algorithm': 'merge', 'array': array, 'keyframe_interval': 16, 'adaptive_keyframes': True
+        }).get_json()
+        sparse = client.post('/api/timelines', json={
+            'algorithm': 'merge', 'array': array, 'keyframe_interval': 4096
+        }).get_json()
+        assert dense['seek']['keyframes'] > sparse['seek']['keyframes'] == 1
+        
+        for position in (300, 17, len(full['steps']), 5):
+            state = client.get(f"/api/timelines/{dense['id']}/state?position={position}").get_json()
+            assert state['state'] == full['array_states'][position]
+        
+        for interval in (0, 10 ** 6, 'dense'):
+            response = client.post('/api/timelines', json={
+                'algorithm': 'merge', 'array': array, 'keyframe_interval': interval
+            })
+            assert response.status_code == 400
+        for flag in ('false', 1, None):
+            response = client.post('/api/timelines', json={
+                'algorithm': 'merge', 'array': array, 'adaptive_keyframes': flag
+            })
+            assert response.status_code == 400
+    
+    def test_page_bounds_are_clamped(self, client):
+        info = client.post('/api/timelines', json={'algorithm': 'bubble', 'array': [3, 2, 1]}).get_json()
+        
+        page = client.get(f"/api/timelines/{info['id']}/steps?start=-5&end=1000").get_json()
+        assert (page['start'], page['end']) == (0, info['total_steps'])
+        
+        response = client.get(f"/api/timelines/{info['id']}/state?position={info['total_steps'] + 1}")
+        assert response.status_code == 400
+    
+    def test_unknown_and_deleted_timelines(self, client):
+        info = client.post('/api/timelines', json={'algorithm': 'quick', 'array': [2, 1]}).get_json()
+        
+        assert client.delete(f"/api/timelines/{info['id']}").status_code == 204
+        response = client.get(f"/api/timelines/{info['id']}/steps")
+        assert response.status_code == 404
+        assert 'error' in response.get_json()
+        assert info['id'] not in timeline_store
+    
+    def test_store_ttl_and_capacity(self):
+        now = [0.0]
+        store = TimelineStore(ttl=10.0, max_timelines=2, clock=lambda: now[0])
+        
+        first = store.create('bubble', Timeline([1]))
+        now[0] = 5.0
+        second = store.create('bubble', Timeline([2]))
+        now[0] = 12.0
+        # Reading `second` extends its lifetime; `first` has expired
+        assert store.get(second.id) is second
+        assert store.get(first.id) is None
+        
+        store.create('bubble', Timeline([3]))
+        store.create('bubble', Timeline([4]))
+        assert len(store) == 2 and second.id not in store
+        assert store.stats()['expirations'] == 1
+        assert store.stats()['evictions'] == 1
+
+
+def _endless_job(context):
+    for _ in context.track(itertools.count()):
+        pass
+
+
+def _square_job(context, value):
+    return value * value
+
+
+class TestExecutionPool:
+    
+    def test_large_input_runs_on_pool(self, client):
+        body = {'algorithm': 'bubble', 'array': list(range(400, 0, -1)), 'max_steps': 50}
+        before = flask_app.execution_pool.stats()
+        response = client.post('/api/execute', json=body)
+        after = flask_app.execution_pool.stats()
+        
+        assert response.status_code == 200
+        assert len(response.get_json()['steps']) == 50
+        assert after['submitted'] == before['submitted'] + 1
+        
+        client.post('/api/execute', json={'algorithm': 'bubble', 'array': [2, 1]})
+        assert flask_app.execution_pool.stats()['inline'] == after['inline'] + 1
+    
+    def test_large_stored_timeline_runs_on_pool(self, client):
+        array = list(range(400, 0, -1))
+        before = flask_app.execution_pool.stats()
+        created = client.post('/api/timelines', json={'algorithm': 'merge', 'array': array})
+        
+        assert created.status_code == 201
+        assert flask_app.execution_pool.stats()['submitted'] == before['submitted'] + 1
+        info = created.get_json()
+        state = client.get(f"/api/timelines/{info['id']}/state?position={info['total_steps']}").get_json()
+        assert state['state']['values'] == sorted(array)
+    
+    def test_timeout_cancels_running_job(self):
+        pool = ExecutionPool(max_workers=1, max_queued=0)
+        try:
+            assert pool.run(_square_job, 7) == 49
+            
+            job = pool.submit(_endless_job)
+            with pytest.raises(JobTimeoutError):
+                job.result(timeout=0.2)
+            # The worker notices the cancel flag and frees its slot
+            with pytest.raises(JobCancelledError):
+                job.future.result(timeout=10)
+            assert pool.stats()['timed_out'] == 1
+            assert pool.run(_square_job, 3) == 9
+        finally:
+            pool.shutdown()
+    
+    def test_cancel_after_finish_leaves_reused_slot_alone(self):
+        pool = ExecutionPool(max_workers=1, max_queued=0)
+        try:
+            finished = pool.submit(_square_job, 4)
+            assert finished.result(timeout=10) == 16
+            deadline = time.monotonic() + 10
+            while pool.stats()['active'] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            
+            running = pool.submit(_endless_job)
+            assert running.slot == finished.slot
+            finished.cancel()
+            time.sleep(0.2)
+            assert not running.done()
+            
+            running.cancel()
+            with pytest.raises(JobCancelledError):
+                running.future.result(timeout=10)
+        finally:
+            pool.shutdown()
+    
+    def test_run_many_larger_than_capacity(self):
+        pool = ExecutionPool(max_workers=1, max_queued=0)
+        try:
+            assert pool.run_many(_square_job, [(value,) for value in range(6)]) == [0, 1, 4, 9, 16, 25]
+            assert pool.stats()['active'] == 0
+        finally:
+            pool.shutdown()
+    
+    def test_saturated_pool_returns_503(self, client, monkeypatch):
+        pool = ExecutionPool(max_workers=1, max_queued=0)
+        monkeypatch.setattr(flask_app, 'execution_pool', pool)
+        try:
+            job = pool.submit(_endless_job)
+            with pytest.raises(PoolSaturatedError):
+                pool.submit(_square_job, 2)
+            
+            response = client.post(
+                '/api/execute', json={'algorithm': 'merge', 'array': list(range(300, 0, -1))}
+            )
+            assert response.status_code == 503
+            assert response.headers['Retry-After'] == '1'
+            assert pool.stats()['rejected'] == 2
+            job.cancel()
+        finally:
+            pool.shutdown()
+
+
+def _wait_for_job(client, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        progress = client.get(f'/api/jobs/{job_id}').get_json()
+        if progress['status'] in ('done', 'failed', 'cancelled'):
+            return progress
+        time.sleep(0.01)
+    raise AssertionError('job did not finish')
+
+
+class TestJobs:
+    
+    def test_job_lifecycle(self, client):
+        array = list(range(120, 0, -1))
+        full = client.post(
+            '/api/execute', json={'algorithm': 'quick', 'array': array, 'lazy_explanations': True}
+        ).get_json()
+        
+        submitted = client.post('/api/jobs', json={'algorithm': 'quick', 'array': array})
+        assert submitted.status_code == 202
+        job_id = submitted.get_json()['id']
+        assert submitted.headers['Location'].endswith(job_id)
+        
+        progress = _wait_for_job(client, job_id)
+        assert progress['status'] == 'done'
+        assert progress['steps_done'] == len(full['steps'])
+        assert progress['fraction'] == 1.0 and progress['eta_seconds'] == 0.0
+        
+        page = client.get(f'/api/jobs/{job_id}/steps?start=100&end=300').get_json()
+        assert page['complete'] and page['steps'] == full['steps'][100:300]
+        
+        # The finished timeline is available through the paged timeline API
+        state = client.get(
+            f"/api/timelines/{progress['timeline_id']}/state?position={len(full['steps'])}"
+        ).get_json()
+        assert state['state']['values'] == sorted(array)
+    
+    def test_progress_events(self, client):
+        job_id = client.post('/api/jobs', json={'algorithm': 'merge', 'array': [4, 2, 3, 1]}).get_json()['id']
+        
+        messages = client.get(f'/api/jobs/{job_id}/events').get_data(as_text=True).strip().split('\n\n')
+        final = json.loads(messages[-1].split('data: ', 1)[1])
+        assert final['status'] == 'done' and final['steps_done'] > 0
+    
+    def test_cancel_running_job(self, client):
+        job_id = client.post(
+            '/api/jobs', json={'algorithm': 'bubble', 'array': list(range(3000, 0, -1))}
+        ).get_json()['id']
+        
+        cancelled = client.delete(f'/api/jobs/{job_id}')
+        assert cancelled.status_code == 200
+        progress = _wait_for_job(client, job_id)
+        assert progress['status'] == 'cancelled'
+        assert progress['steps_done'] < progress['estimated_total_steps']
+        
+        page = client.get(f'/api/jobs/{job_id}/steps').get_json()
+        assert not page['complete'] and page['end'] <= progress['steps_done']
+    
+    def test_unknown_job(self, client):
+        assert client.get('/api/jobs/missing').status_code == 404
+        assert job_manager.stats()['max_jobs'] == 64
+    
+    def test_jobs_run_in_pool_workers(self, tmp_path):
+        pool = ExecutionPool(max_workers=1, max_queued=1)
+        manager = JobManager(pool, max_running=1, progress_interval=64, trace_dir=str(tmp_path))
+        array = list(range(600, 0, -1))
+        try:
+            running = manager.submit(BubbleSort(), 'bubble', array)
+            queued = manager.submit(BubbleSort(), 'bubble', [3, 1, 2])
+            assert pool.stats()['submitted'] == 1
+            assert (running.status, queued.status) == ('running', 'queued')
+            
+            deadline = time.monotonic() + 10
+            while running.steps_done < 1000 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            status, steps_done, timeline = running.snapshot()
+            assert status == 'running' and timeline is None
+            # Everything below the reported count has been flushed to the trace
+            with MappedTimeline(running.trace_path, allow_partial=True) as partial:
+                assert not partial.complete and len(partial.steps) >= steps_done
+                assert partial.steps[:steps_done] == list(itertools.islice(BubbleSort().iter_steps(array), steps_done))
+            
+            manager.cancel(running.id)
+            deadline = time.monotonic() + 10
+            while not queued.finished and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert running.status == 'cancelled' and running.steps_done >= steps_done
+            assert queued.status == 'done' and queued.timeline.get_state_at(queued.steps_done).values == [1, 2, 3]
+        finally:
+            manager.shutdown()
+            pool.shutdown()
+    
+    def test_cancel_finished_job_spares_running_one(self, tmp_path):
+        pool = ExecutionPool(max_workers=1, max_queued=0)
+        manager = JobManager(pool, max_running=1, progress_interval=64, trace_dir=str(tmp_path))
+        try:
+            finished = manager.submit(BubbleSort(), 'bubble', [3, 1, 2])
+            deadline = time.monotonic() + 10
+            while not finished.finished and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert finished.status == 'done'
+            
+            running = manager.submit(BubbleSort(), 'bubble', list(range(250, 0, -1)))
+            while running.status == 'queued' and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert running.pool_job.slot == finished.pool_job.slot
+            
+            assert manager.cancel(finished.id)
+            while not running.finished and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert finished.status == 'done' and running.status == 'done'
+        finally:
+            manager.shutdown()
+            pool.shutdown()
+
+
+class TestBatch:
+    
+    def test_summary_counts(self, client):
+        response = client.post('/api/batch', json={'jobs': [
+            {'algorithm': 'bubble', 'array': [3, 2, 1]},
+            {'algorithm': 'radix', 'array': [1.5]},
+            {'algorithm': 'merge', 'array': list(range(300, 0, -1)), 'max_steps': 40}
+        ]})
+        results = response.get_json()['results']
+        
+        bubble = results[0]
+        assert bubble['compares'] == 3 and bubble['swaps'] == 3
+        assert bubble['writes'] == 6
+        assert bubble['step_counts']['compare'] == 3
+        assert bubble['total_steps'] == sum(bubble['step_counts'].values())
+        assert 'timeline' not in bubble
+        
+        assert 'integer' in results[1]['error']
+        assert results[2]['total_steps'] == 40 and results[2]['array_length'] == 300
+    
+    def test_algorithms_times_arrays(self, client):
+        arrays = [[2, 1], [5, 4, 3], [9, 8, 7, 6]]
+        response = client.post('/api/batch', json={
+            'algorithms': ['quick', 'heap'], 'arrays': arrays, 'include_timelines': True
+        })
+        results = response.get_json()['results']
+        
+        assert [(r['algorithm'], r['array_length']) for r in results] == [
+            ('quick', 2), ('quick', 3), ('quick', 4), ('heap', 2), ('heap', 3), ('heap', 4)
+        ]
+        single = client.post('/api/execute', json={'algorithm': 'heap', 'array': arrays[2]}).get_json()
+        assert results[5]['timeline'] == single
+    
+    def test_empty_batch_rejected(self, client):
+        assert client.post('/api/batch', json={'jobs': []}).status_code == 400
+    
+    def test_malformed_jobs_rejected(self, client):
+        for jobs in (['bubble'], [{'algorithm': 'bubble', 'array': [1]}, None], {'algorithm': 'bubble'}):
+            response = client.post('/api/batch', json={'jobs': jobs})
+            assert response.status_code == 400
+            assert 'jobs must be' in response.get_json()['error']
\ No newline at end of file
@@ -1,5 +1,10 @@
 from .engine import VisualizationEngine
+from .async_engine import AsyncVisualizationEngine
 from .renderer import Renderer
 from .controller import PlaybackController
+from .async_controller import AsyncPlaybackController
 
-__all__ = ['VisualizationEngine', 'Renderer', 'PlaybackController']
\ No newline at end of file
+__all__ = [
+    'VisualizationEngine', 'AsyncVisualizationEngine', 'Renderer', 'PlaybackController',
+    'AsyncPlaybackController'
+]
\ No newline at end of file
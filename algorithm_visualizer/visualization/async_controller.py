@@ -0,0 +1,189 @@
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Optional, Union
+from ..core.timeline import Timeline
+from ..core.array_state import ArrayState, ArrayStateView
+from ..core.cursor import TimelineCursor
+from .controller import MAX_STEPS_PER_SECOND, MIN_SPEED
+from .pacing import DEFAULT_FPS, FramePacer
+
+
+async def resolve(result: Union[Any, Awaitable]) -> Any:
+    """Await `result` if a callback returned an awaitable, else pass it through."""
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+class AsyncPlaybackController:
+    """PlaybackController for asyncio: each session is a task, not a thread.
+    
+    Playback runs as a task on the event loop that calls `play`, paced by
+    the same FramePacer on `loop.time()`, so hundreds of sessions can share
+    one loop. Every position change and its notification happen on that
+    loop under a per-controller asyncio.Lock, so a command such as
+    `set_position` never interleaves with a frame whose callback is still
+    awaiting (e.g. a websocket send). Callbacks may be plain functions or
+    coroutines; a slow consumer delays only its own session's frames, and
+    the pacer skips ahead once it catches up.
+    
+    Each controller keeps its own position and its own `timeline.cursor()`,
+    so any number of sessions can play one shared Timeline: none of them
+    touches `Timeline.current_position`, and the state view a callback is
+    sending stays valid until that session moves again.
+    
+    Callbacks run while the lock is held, so they may call `pause` or
+    `play` but must not await the controller's other commands.
+    `on_playback_complete` runs after the lock is released.
+    """
+    
+    def __init__(self, fps: float = DEFAULT_FPS):
+        self.timeline: Optional[Timeline] = None
+        self.current_position = -1
+        self.is_playing = False
+        self.speed = 1.0  # Multiplier for playback speed
+        self.base_delay = 0.5  # Base delay in seconds
+        self.playback_task: Optional[asyncio.Task] = None
+        self.fps = fps
+        
+        self.on_position_change: Optional[Callable[[ArrayState, object], Optional[Awaitable]]] = None
+        self.on_playback_complete: Optional[Callable[[], Optional[Awaitable]]] = None
+        
+        self._cursor: Optional[TimelineCursor] = None
+        self._lock = asyncio.Lock()
+        self._pacer = FramePacer(fps)
+        self._wake = asyncio.Event()
+    
+    @property
+    def steps_per_second(self) -> float:
+        return self.speed / self.base_delay
+    
+    async def set_timeline(self, timeline: Timeline):
+        await self.stop()
+        async with self._lock:
+            self.timeline = timeline
+            self._cursor = timeline.cursor()
+            self.current_position = -1
+    
+    def get_current_state(self) -> Optional[ArrayStateView]:
+        """This session's current state; valid until its position changes."""
+        if self.timeline and 0 <= self.current_position < self.timeline.get_total_steps():
+            return ArrayStateView(self._cursor.move_to(self.current_position))
+        return None
+    
+    def get_current_step(self):
+        if self.timeline and 0 <= self.current_position < self.timeline.get_total_steps():
+            return self.timeline.steps[self.current_position]
+        return None
+    
+    def play(self):
+        """Start playback as a task on the running event loop."""
+        if self.timeline and not self.is_playing:
+            self.is_playing = True
+            # Each run waits on its own event; a task left over from an
+            # earlier run sees it has been replaced and exits
+            self._wake = asyncio.Event()
+            self.playback_task = asyncio.get_running_loop().create_task(self._playback_loop(self._wake))
+    
+    def pause(self):
+        self.is_playing = False
+        self._wake.set()
+    
+    async def stop(self):
+        self.pause()
+        task = self.playback_task
+        # A callback on the playback task may stop playback; it exits by itself
+        if task is not None and task is not asyncio.current_task():
+            await task
+            if self.playback_task is task:
+                self.playback_task = None
+    
+    async def step_forward(self):
+        if self.timeline:
+            async with self._lock:
+                if self._move_to(self.current_position + 1):
+                    await self._notify_position_change()
+    
+    async def step_backward(self):
+        if self.timeline:
+            async with self._lock:
+                if self._move_to(self.current_position - 1):
+                    await self._notify_position_change()
+    
+    async def reset(self):
+        await self.stop()
+        if self.timeline:
+            async with self._lock:
+                self.current_position = -1
+                await self._notify_position_change()
+    
+    def set_speed(self, speed: float):
+        self.speed = max(MIN_SPEED, min(MAX_STEPS_PER_SECOND * self.base_delay, speed))
+        if self.is_playing:
+            self._pacer.set_rate(self.steps_per_second, asyncio.get_running_loop().time())
+            self._wake.set()
+    
+    def set_steps_per_second(self, rate: float):
+        self.set_speed(rate * self.base_delay)
+    
+    async def set_position(self, position: int):
+        if self.timeline:
+            async with self._lock:
+                if self._move_to(position):
+                    await self._notify_position_change()
+    
+    def _running(self, wake: asyncio.Event) -> bool:
+        return self.is_playing and self._wake is wake
+    
+    async def _playback_loop(self, wake: asyncio.Event):
+        loop = asyncio.get_running_loop()
+        self._pacer.start(self.steps_per_second, loop.time())
+        
+        completed = False
+        while self._running(wake):
+            frame_start = loop.time()
+            async with self._lock:
+                if not self._running(wake):
+                    break
+                if self._advance(self._pacer.due(frame_start)):
+                    await self._notify_position_change()
+                    if not self._running(wake):
+                        break
+                if self._at_end():
+                    self.is_playing = False
+                    completed = True
+                    break
+                next_frame = self._pacer.next_frame(frame_start)
+            
+            # A timer handle is much cheaper than wait_for's extra task per frame
+            timer = loop.call_at(next_frame, wake.set)
+            await wake.wait()
+            timer.cancel()
+            wake.clear()
+        
+        if completed and self.on_playback_complete:
+            await resolve(self.on_playback_complete())
+    
+    def _move_to(self, position: int) -> bool:
+        # Same range and semantics as Timeline.set_position
+        if -1 <= position < self.timeline.get_total_steps():
+            self.current_position = position
+            return True
+        return False
+    
+    def _advance(self, steps: int) -> bool:
+        """Move up to `steps` forward in one jump; the steps in between are not shown."""
+        if steps <= 0:
+            return False
+        target = min(self.current_position + steps, self.timeline.get_total_steps() - 1)
+        return target > self.current_position and self._move_to(target)
+    
+    def _at_end(self) -> bool:
+        return self.current_position >= self.timeline.get_total_steps() - 1
+    
+    async def _notify_position_change(self):
+        if self.timeline and self.on_position_change:
+            state = self.get_current_state()
+            step = self.get_current_step()
+            if state is not None:
+                await resolve(self.on_position_change(state, step))
\ No newline at end of file
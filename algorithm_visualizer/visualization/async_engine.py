@@ -0,0 +1,79 @@
+from typing import Optional, Callable
+from ..core.timeline import Timeline
+from ..core.array_state import ArrayState
+from .renderer import Renderer
+from .async_controller import AsyncPlaybackController, resolve
+from .pacing import DEFAULT_FPS
+
+
+class AsyncVisualizationEngine:
+    """VisualizationEngine for asyncio, one per playback session.
+    
+    Drives an AsyncPlaybackController, so a session costs one task rather
+    than one thread. The renderer and the callbacks may be coroutines,
+    e.g. a renderer that sends each frame to a websocket client, and are
+    awaited in order. Several engines may load the same Timeline; each
+    one's position lives in its controller.
+    """
+    
+    def __init__(self, renderer: Renderer, fps: float = DEFAULT_FPS):
+        self.renderer = renderer
+        self.timeline: Optional[Timeline] = None
+        self.controller = AsyncPlaybackController(fps)
+        self.on_state_change: Optional[Callable] = None
+        self.on_step_change: Optional[Callable] = None
+        self.on_complete: Optional[Callable] = None
+        
+        self.controller.on_position_change = self._on_position_change
+        self.controller.on_playback_complete = self._on_playback_complete
+    
+    async def load_timeline(self, timeline: Timeline):
+        await self.controller.set_timeline(timeline)
+        self.timeline = timeline
+        await self._update_visualization()
+    
+    def play(self):
+        if self.timeline:
+            self.controller.play()
+    
+    def pause(self):
+        self.controller.pause()
+    
+    async def stop(self):
+        await self.controller.stop()
+    
+    async def step_forward(self):
+        if self.timeline:
+            await self.controller.step_forward()
+    
+    async def step_backward(self):
+        if self.timeline:
+            await self.controller.step_backward()
+    
+    async def reset(self):
+        if self.timeline:
+            await self.controller.reset()
+    
+    def set_speed(self, speed: float):
+        self.controller.set_speed(speed)
+    
+    async def set_position(self, position: int):
+        if self.timeline:
+            await self.controller.set_position(position)
+    
+    async def _on_position_change(self, state: ArrayState, step):
+        await self._update_visualization()
+        if self.on_state_change:
+            await resolve(self.on_state_change(state))
+        if self.on_step_change:
+            await resolve(self.on_step_change(step))
+    
+    async def _on_playback_complete(self):
+        if self.on_complete:
+            await resolve(self.on_complete())
+    
+    async def _update_visualization(self):
+        if self.timeline and self.renderer:
+            state = self.controller.get_current_state()
+            if state:
+                await resolve(self.renderer.render(state))
\ No newline at end of file
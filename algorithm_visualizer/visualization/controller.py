@@ -3,73 +3,146 @@ import threading
 from typing import Optional, Callable
 from ..core.timeline import Timeline
 from ..core.array_state import ArrayState
+from .pacing import DEFAULT_FPS, FramePacer
+
+
+MIN_SPEED = 0.1
+# Playback rate cap in steps per second; above the frame rate, steps are
+# coalesced so only the last one of each frame is rendered
+MAX_STEPS_PER_SECOND = 100_000
 
 
 class PlaybackController:
-    def __init__(self):
+    def __init__(self, fps: float = DEFAULT_FPS, clock: Callable[[], float] = time.monotonic):
         self.timeline: Optional[Timeline] = None
         self.is_playing = False
         self.speed = 1.0  # Multiplier for playback speed
         self.base_delay = 0.5  # Base delay in seconds
         self.playback_thread: Optional[threading.Thread] = None
+        self.fps = fps
+        self.clock = clock
         
         self.on_position_change: Optional[Callable[[ArrayState, object], None]] = None
         self.on_playback_complete: Optional[Callable[[], None]] = None
+        
+        # Serializes position changes and callbacks between the playback
+        # thread and callers; reentrant so callbacks may use the controller
+        self._lock = threading.RLock()
+        self._pacer = FramePacer(fps)
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+    
+    @property
+    def steps_per_second(self) -> float:
+        return self.speed / self.base_delay
     
     def set_timeline(self, timeline: Timeline):
-        self.timeline = timeline
         self.stop()
+        self.timeline = timeline
     
     def play(self):
         if self.timeline and not self.is_playing:
+            # A paused thread may still be finishing its last frame
+            self._join_playback_thread()
             self.is_playing = True
-            self.playback_thread = threading.Thread(target=self._playback_loop)
+            # Each run gets its own events, so a stale thread can never
+            # pick up a later run's signals
+            self._stop_event = threading.Event()
+            self._wake = threading.Event()
+            self.playback_thread = threading.Thread(
+                target=self._playback_loop, args=(self._stop_event, self._wake)
+            )
             self.playback_thread.daemon = True
             self.playback_thread.start()
     
     def pause(self):
+        # Safe to call from a callback; the thread exits after its current frame
         self.is_playing = False
+        self._stop_event.set()
+        self._wake.set()
     
     def stop(self):
-        self.is_playing = False
-        if self.playback_thread:
-            self.playback_thread.join(timeout=0.1)
-            self.playback_thread = None
+        self.pause()
+        self._join_playback_thread()
     
     def step_forward(self):
         if self.timeline:
-            if self.timeline.step_forward():
-                self._notify_position_change()
+            with self._lock:
+                if self.timeline.step_forward():
+                    self._notify_position_change()
     
     def step_backward(self):
         if self.timeline:
-            if self.timeline.step_backward():
-                self._notify_position_change()
+            with self._lock:
+                if self.timeline.step_backward():
+                    self._notify_position_change()
     
     def reset(self):
         self.stop()
         if self.timeline:
-            self.timeline.reset()
-            self._notify_position_change()
+            with self._lock:
+                self.timeline.reset()
+                self._notify_position_change()
     
     def set_speed(self, speed: float):
-        self.speed = max(0.1, min(5.0, speed))
+        with self._lock:
+            self.speed = max(MIN_SPEED, min(MAX_STEPS_PER_SECOND * self.base_delay, speed))
+            if self.is_playing:
+                self._pacer.set_rate(self.steps_per_second, self.clock())
+        # Cut a long wait for a slow step short so the new speed applies now
+        self._wake.set()
+    
+    def set_steps_per_second(self, rate: float):
+        self.set_speed(rate * self.base_delay)
     
     def set_position(self, position: int):
         if self.timeline:
-            if self.timeline.set_position(position):
-                self._notify_position_change()
+            with self._lock:
+                if self.timeline.set_position(position):
+                    self._notify_position_change()
     
-    def _playback_loop(self):
-        while self.is_playing and self.timeline:
-            if not self.timeline.step_forward():
-                self.is_playing = False
-                if self.on_playback_complete:
-                    self.on_playback_complete()
-                break
+    def _join_playback_thread(self):
+        thread = self.playback_thread
+        # A callback on the playback thread may stop playback; it exits by itself
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+            self.playback_thread = None
+    
+    def _playback_loop(self, stop_event: threading.Event, wake: threading.Event):
+        with self._lock:
+            self._pacer.start(self.steps_per_second, self.clock())
+        
+        while not stop_event.is_set():
+            frame_start = self.clock()
+            with self._lock:
+                if stop_event.is_set():
+                    break
+                if self._advance(self._pacer.due(frame_start)):
+                    self._notify_position_change()
+                    # The callback may have stopped playback or swapped the
+                    # timeline; this run must not touch the new one
+                    if stop_event.is_set():
+                        break
+                if self._at_end():
+                    self.is_playing = False
+                    if self.on_playback_complete:
+                        self.on_playback_complete()
+                    break
+                next_frame = self._pacer.next_frame(frame_start)
             
-            self._notify_position_change()
-            time.sleep(self.base_delay / self.speed)
+            wake.wait(max(0.0, next_frame - self.clock()))
+            wake.clear()
+    
+    def _advance(self, steps: int) -> bool:
+        """Move up to `steps` forward in one jump; the steps in between are not shown."""
+        if steps <= 0:
+            return False
+        position = self.timeline.current_position
+        target = min(position + steps, self.timeline.get_total_steps() - 1)
+        return target > position and self.timeline.set_position(target)
+    
+    def _at_end(self) -> bool:
+        return self.timeline.current_position >= self.timeline.get_total_steps() - 1
     
     def _notify_position_change(self):
         if self.timeline and self.on_position_change:
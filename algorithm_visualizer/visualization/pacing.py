@@ -0,0 +1,59 @@
+DEFAULT_FPS = 60.0
+
+
+class FramePacer:
+    """Schedules playback frames against a monotonic clock.
+    
+    Steps are released by elapsed time, not by counting sleeps: the number
+    shown by time `now` is always `(now - anchor) * rate`, so time spent
+    rendering or in callbacks never accumulates as drift. Frames start at
+    most `fps` times a second; when the rate is higher than that, `due`
+    hands out several steps per frame and the caller shows only the last
+    one. A late frame simply gets more steps.
+    
+    The pacer only does arithmetic on the timestamps it is given, so the
+    threaded and asyncio controllers share it and tests can drive it with
+    a fake clock.
+    """
+    
+    def __init__(self, fps: float = DEFAULT_FPS):
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self.frame_interval = 1.0 / fps
+        self.rate = 0.0
+        self._anchor = 0.0
+        self._released = 0
+    
+    def start(self, rate: float, now: float):
+        """Begin a run of frames at `rate` steps per second; the first step is due at once."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self._anchor = now
+        self._released = -1
+    
+    def set_rate(self, rate: float, now: float):
+        """Change speed mid-run, keeping the steps (and fraction) already earned."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        pending = max(0.0, (now - self._anchor) * self.rate - self._released)
+        self.rate = rate
+        self._anchor = now - pending / rate
+        self._released = 0
+    
+    def due(self, now: float) -> int:
+        """Steps that became due since the last call, for the frame starting at `now`."""
+        total = int((now - self._anchor) * self.rate)
+        steps = max(0, total - self._released)
+        self._released += steps
+        return steps
+    
+    def next_frame(self, frame_start: float) -> float:
+        """When the frame after the one started at `frame_start` should begin.
+        
+        That is one frame interval later, or when the next step falls due if
+        the rate is below the frame rate. The result may already be in the
+        past if the frame ran long; the caller should then start at once.
+        """
+        next_step = self._anchor + (self._released + 1) / self.rate
+        return max(frame_start + self.frame_interval, next_step)
\ No newline at end of file
@@ -1,8 +1,11 @@
 import random
 from typing import List, Optional
-from ..algorithms import BubbleSort, QuickSort, MergeSort
+from ..algorithms import (
+    BubbleSort, QuickSort, MergeSort, HeapSort, IntroSort, TimSort, RadixSort, CountingSort
+)
 from ..visualization import VisualizationEngine
 from ..visualization.renderer import ConsoleRenderer
+from ..core.explanations import ExplanationEngine
 
 
 class AlgorithmVisualizerApp:
@@ -10,9 +13,15 @@ class AlgorithmVisualizerApp:
         self.algorithms = {
             'bubble': BubbleSort(),
             'quick': QuickSort(),
-            'merge': MergeSort()
+            'merge': MergeSort(),
+            'heap': HeapSort(),
+            'intro': IntroSort(),
+            'tim': TimSort(),
+            'radix': RadixSort(),
+            'counting': CountingSort()
         }
         self.renderer = ConsoleRenderer()
+        self.explanation_engine = ExplanationEngine()
         self.engine = VisualizationEngine(self.renderer)
         self.current_array: Optional[List] = None
         self.current_algorithm = None
@@ -22,12 +31,12 @@ class AlgorithmVisualizerApp:
     
     def run_console_demo(self):
         print("=== Premium Algorithm Visualizer ===")
-        print("1. Bubble Sort")
-        print("2. Quick Sort") 
-        print("3. Merge Sort")
+        algorithm_map = {}
+        for number, (key, algorithm) in enumerate(self.algorithms.items(), start=1):
+            algorithm_map[str(number)] = key
+            print(f"{number}. {algorithm.name}")
         
-        choice = input("Select algorithm (1-3): ").strip()
-        algorithm_map = {'1': 'bubble', '2': 'quick', '3': 'merge'}
+        choice = input(f"Select algorithm (1-{len(algorithm_map)}): ").strip()
         
         if choice not in algorithm_map:
             print("Invalid choice!")
@@ -59,7 +68,7 @@ class AlgorithmVisualizerApp:
     
     def _run_interactive_mode(self):
         print("\n=== Interactive Controls ===")
-        print("Commands: play, pause, step, back, reset, speed <0.1-5.0>, quit")
+        print("Commands: play, pause, step, back, reset, speed <0.1-50000>, quit")
         
         while True:
             command = input("\n> ").strip().lower()
@@ -88,7 +97,7 @@ class AlgorithmVisualizerApp:
                     self.engine.set_speed(speed)
                     print(f"Speed set to {speed}x")
                 except (IndexError, ValueError):
-                    print("Usage: speed <0.1-5.0>")
+                    print("Usage: speed <0.1-50000>")
                     
             elif command == 'quit':
                 break
@@ -98,7 +107,8 @@ class AlgorithmVisualizerApp:
     
     def _on_step_change(self, step):
         if step and hasattr(step, 'explanation'):
-            print(f"\n\033[96mStep: {step.explanation}\033[0m")
+            explanation = self.explanation_engine.get_step_explanation(step)
+            print(f"\n\033[96mStep: {explanation}\033[0m")
     
     def _on_complete(self):
         print("\n\033[92mAlgorithm execution completed!\033[0m")
\ No newline at end of file
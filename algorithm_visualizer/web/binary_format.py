@@ -0,0 +1,392 @@
+"""Compact binary encoding of timelines, served by /api/execute when the
+client asks for BINARY_MIMETYPE.
+
+All fixed-width integers are little-endian. The layout is
+
+    header         magic b'AVTL', u8 version, u8 flags, u16 reserved,
+                   u32 step count, u32 array length, u32 string count,
+                   u32 payload length
+    strings        string count x (varint byte length, UTF-8 bytes)
+    initial array  array length x value
+    records        step count x u8: step type code in the low three bits,
+                   step flags above
+    payload        the variable part of every step, in step order
+
+Only the initial array and the steps are sent; clients rebuild states by
+replaying the steps. Explanations are template ids plus arguments where
+the step has a template, otherwise literal strings. Both go through the
+string table, so each distinct text is sent once. String 0 holds the
+template texts as JSON.
+
+A step's payload is, in order:
+
+    string id      template id or literal explanation
+    indices        an index count when COUNT is set (otherwise compare and
+                   swap imply two, overwrite and pivot one), then zigzag
+                   deltas: the first two from the first and second index
+                   last sent, any further ones from the index before them.
+                   With RANGE, a start coded like a first index and a count.
+    values         when VALUES is set: a count (overwrite implies one),
+                   then the values
+    arguments      for template steps: 0 when they equal the indices,
+                   otherwise the argument count plus one, then the values
+    metadata       when METADATA is set: 0 and the split point of a merge
+                   relative to its first index, or a JSON string id plus one
+
+Successive steps mostly touch neighbouring positions, so nearly every
+index costs one byte whatever the array size.
+
+Values are varint tags. An even tag is a non-negative integer, tag >> 1.
+Odd tags are told apart by their low four bits: 1 is followed by a
+float64, 3 by a string id, 5 is null, 7 is followed by the string id of a
+JSON document, 9 and 11 refer to the step's own index or value number
+tag >> 4, and 13 is the negative integer -(tag >> 4) - 1.
+"""
+import json
+import struct
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+from ..core.explanations import STEP_TEMPLATES
+from ..core.step import StepType
+
+
+BINARY_MIMETYPE = 'application/vnd.algorithm-visualizer.timeline'
+
+MAGIC = b'AVTL'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBBHIIII')
+_FLOAT = struct.Struct('<d')
+
+# Header flags
+HAS_TEMPLATES = 1
+
+# Step flags, stored above the three type code bits of a record
+TYPE_MASK = 0x07
+TEMPLATE = 0x08  # the string id is a template id and arguments follow
+RANGE = 0x10     # indices are a contiguous [start, start + count) run
+COUNT = 0x20     # an index count precedes the indices
+VALUES = 0x40    # values follow the indices
+METADATA = 0x80  # merge ranges or a metadata JSON string id follow
+
+# Value tags
+_FLOAT_TAG = 1
+_STRING_TAG = 3
+_NULL_TAG = 5
+_JSON_TAG = 7
+_INDEX_REF_TAG = 9
+_VALUE_REF_TAG = 11
+_NEGATIVE_TAG = 13
+
+STEP_TYPES = list(StepType)
+_TYPE_CODES = {step_type: code for code, step_type in enumerate(STEP_TYPES)}
+_TYPE_NAMES = [step_type.value for step_type in STEP_TYPES]
+
+# Index counts implied by the step type when COUNT is not set
+_ARITY = {StepType.COMPARE: 2, StepType.SWAP: 2, StepType.OVERWRITE: 1, StepType.PIVOT: 1}
+_ARITY_BY_CODE = [_ARITY.get(step_type) for step_type in STEP_TYPES]
+_OVERWRITE_CODE = _TYPE_CODES[StepType.OVERWRITE]
+
+# Arguments are only matched against this many indices or values
+_MAX_REFS = 4
+
+
+def _write_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+class _StringTable:
+    def __init__(self):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+    
+    def intern(self, text: str) -> int:
+        string_id = self._ids.get(text)
+        if string_id is None:
+            string_id = self._ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+
+def _write_value(out: bytearray, value: Any, strings: _StringTable):
+    value_type = type(value)
+    if value_type is int:
+        if value >= 0:
+            _write_varint(out, value << 1)
+        else:
+            _write_varint(out, (-value - 1) << 4 | _NEGATIVE_TAG)
+    elif value_type is float:
+        out.append(_FLOAT_TAG)
+        out += _FLOAT.pack(value)
+    elif value_type is str:
+        out.append(_STRING_TAG)
+        _write_varint(out, strings.intern(value))
+    elif value is None:
+        out.append(_NULL_TAG)
+    else:
+        out.append(_JSON_TAG)
+        _write_varint(out, strings.intern(json.dumps(value)))
+
+
+def _write_args(out: bytearray, args: Sequence[Any], indices: Sequence[int],
+                values: Sequence[Any], strings: _StringTable):
+    if (len(args) == len(indices) and all(type(arg) is int for arg in args)
+            and list(args) == list(indices)):
+        out.append(0)
+        return
+    
+    # Arguments usually repeat the step's own indices or values, which a
+    # one-byte reference encodes more cheaply than the number itself
+    _write_varint(out, len(args) + 1)
+    for arg in args:
+        arg_type = type(arg)
+        if arg_type is int and len(indices) <= _MAX_REFS and arg in indices:
+            _write_varint(out, list(indices).index(arg) << 4 | _INDEX_REF_TAG)
+            continue
+        for position, value in enumerate(values[:_MAX_REFS]):
+            if type(value) is arg_type and value == arg:
+                _write_varint(out, position << 4 | _VALUE_REF_TAG)
+                break
+        else:
+            _write_value(out, arg, strings)
+
+
+def _is_contiguous(indices: Sequence[int]) -> bool:
+    if type(indices) is range:
+        return indices.step == 1
+    count = len(indices)
+    return (count > 2 and indices[-1] - indices[0] == count - 1
+            and list(indices) == list(range(indices[0], indices[-1] + 1)))
+
+
+def encode_timeline(timeline, explain: Callable[[Any], str]) -> bytes:
+    """Encode `timeline` in the binary wire format.
+    
+    `explain` renders the explanation of steps that carry no template.
+    """
+    return encode_steps(timeline.initial_array, timeline.steps, explain)
+
+
+def encode_steps(initial_array: List[Any], steps: Iterable[Any], explain: Callable[[Any], str]) -> bytes:
+    """Encode steps straight from an algorithm, without building a Timeline."""
+    strings = _StringTable()
+    strings.intern(json.dumps(STEP_TEMPLATES))
+    
+    initial = bytearray()
+    for value in initial_array:
+        _write_value(initial, value, strings)
+    
+    records = bytearray()
+    payload = bytearray()
+    last = [0, 0]
+    
+    for step in steps:
+        step_type = step.type
+        record = _TYPE_CODES[step_type]
+        indices = step.indices
+        count = len(indices)
+        
+        template = step.template and not step.explanation
+        if template:
+            record |= TEMPLATE
+            _write_varint(payload, strings.intern(step.template))
+        else:
+            _write_varint(payload, strings.intern(explain(step)))
+        
+        if count and _is_contiguous(indices):
+            record |= RANGE
+            _write_varint(payload, _zigzag(indices[0] - last[0]))
+            _write_varint(payload, count)
+            last[0] = indices[0]
+        else:
+            if _ARITY.get(step_type) != count:
+                record |= COUNT
+                _write_varint(payload, count)
+            previous = 0
+            for position, index in enumerate(indices):
+                if position < 2:
+                    previous = last[position]
+                    last[position] = index
+                _write_varint(payload, _zigzag(index - previous))
+                previous = index
+        
+        values = step.values
+        if values:
+            record |= VALUES
+            if step_type is StepType.OVERWRITE:
+                if len(values) != 1:
+                    raise ValueError("Overwrite steps must carry exactly one value")
+            else:
+                _write_varint(payload, len(values))
+            for value in values:
+                _write_value(payload, value, strings)
+        
+        if template:
+            _write_args(payload, step.template_args, indices, values, strings)
+        
+        metadata = step.metadata
+        if metadata:
+            record |= METADATA
+            left_range, right_range = metadata.get('left_range'), metadata.get('right_range')
+            if (step_type is StepType.MERGE and count and len(metadata) == 2
+                    and left_range and right_range
+                    and tuple(left_range) == (indices[0], right_range[0])
+                    and right_range[1] == indices[-1] + 1):
+                payload.append(0)
+                _write_varint(payload, right_range[0] - indices[0])
+            else:
+                _write_varint(payload, strings.intern(json.dumps(metadata)) + 1)
+        
+        records.append(record)
+    
+    out = bytearray(_HEADER.pack(
+        MAGIC, VERSION, HAS_TEMPLATES, 0,
+        len(records), len(initial_array), len(strings.strings), len(payload)
+    ))
+    for text in strings.strings:
+        encoded = text.encode('utf-8')
+        _write_varint(out, len(encoded))
+        out += encoded
+    out += initial
+    out += records
+    out += payload
+    return bytes(out)
+
+
+class _Reader:
+    __slots__ = ('data', 'offset', 'strings')
+    
+    def __init__(self, data: bytes, offset: int):
+        self.data = data
+        self.offset = offset
+        self.strings: List[str] = []
+    
+    def varint(self) -> int:
+        data, offset = self.data, self.offset
+        byte = data[offset]
+        offset += 1
+        value = byte & 0x7F
+        shift = 7
+        while byte & 0x80:
+            byte = data[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+        self.offset = offset
+        return value
+    
+    def value(self, indices: Sequence[int] = (), values: Sequence[Any] = ()) -> Any:
+        tag = self.varint()
+        if not tag & 1:
+            return tag >> 1
+        kind = tag & 0xF
+        if kind == _NEGATIVE_TAG:
+            return -(tag >> 4) - 1
+        if kind == _INDEX_REF_TAG:
+            return indices[tag >> 4]
+        if kind == _VALUE_REF_TAG:
+            return values[tag >> 4]
+        if tag == _FLOAT_TAG:
+            value = _FLOAT.unpack_from(self.data, self.offset)[0]
+            self.offset += _FLOAT.size
+            return value
+        if tag == _STRING_TAG:
+            return self.strings[self.varint()]
+        if tag == _NULL_TAG:
+            return None
+        if tag == _JSON_TAG:
+            return json.loads(self.strings[self.varint()])
+        raise ValueError(f"Unknown value tag {tag}")
+
+
+def decode_timeline(data: bytes) -> Dict[str, Any]:
+    """Decode a binary timeline into the lazy-explanation JSON layout,
+    without `array_states`."""
+    magic, version, header_flags, _, step_count, array_length, string_count, payload_length = (
+        _HEADER.unpack_from(data, 0)
+    )
+    if magic != MAGIC:
+        raise ValueError("Not a binary timeline")
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary timeline version {version}")
+    
+    reader = _Reader(data, _HEADER.size)
+    for _ in range(string_count):
+        length = reader.varint()
+        reader.strings.append(data[reader.offset:reader.offset + length].decode('utf-8'))
+        reader.offset += length
+    
+    initial_array = [reader.value() for _ in range(array_length)]
+    
+    records = data[reader.offset:reader.offset + step_count]
+    reader.offset += step_count
+    if reader.offset + payload_length != len(data):
+        raise ValueError("Truncated binary timeline")
+    
+    strings = reader.strings
+    varint, value = reader.varint, reader.value
+    last = [0, 0]
+    steps = []
+    
+    for record in records:
+        type_code = record & TYPE_MASK
+        step: Dict[str, Any] = {'type': _TYPE_NAMES[type_code]}
+        text = strings[varint()]
+        
+        if record & RANGE:
+            start = last[0] = last[0] + _unzigzag(varint())
+            indices = list(range(start, start + varint()))
+        else:
+            count = varint() if record & COUNT else _ARITY_BY_CODE[type_code]
+            indices = []
+            index = 0
+            for position in range(count):
+                if position < 2:
+                    index = last[position] = last[position] + _unzigzag(varint())
+                else:
+                    index += _unzigzag(varint())
+                indices.append(index)
+        step['indices'] = indices
+        
+        values = []
+        if record & VALUES:
+            count = 1 if type_code == _OVERWRITE_CODE else varint()
+            values = [value() for _ in range(count)]
+        step['values'] = values
+        
+        if record & TEMPLATE:
+            count = varint()
+            step['template'] = text
+            step['template_args'] = (
+                list(indices) if count == 0 else [value(indices, values) for _ in range(count - 1)]
+            )
+        else:
+            step['explanation'] = text
+        
+        step['metadata'] = {}
+        if record & METADATA:
+            string_id = varint()
+            if string_id == 0:
+                mid = indices[0] + varint()
+                step['metadata'] = {
+                    'left_range': [indices[0], mid],
+                    'right_range': [mid, indices[-1] + 1]
+                }
+            else:
+                step['metadata'] = json.loads(strings[string_id - 1])
+        steps.append(step)
+    
+    result = {'initial_array': initial_array, 'steps': steps}
+    if header_flags & HAS_TEMPLATES:
+        result['explanation_templates'] = json.loads(strings[0])
+    return result
\ No newline at end of file
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+
+# Disk entries hold JSON, binary or compressed payloads, so the suffix is neutral
+_DISK_SUFFIX = '.entry'
+
+
+class TimelineCache:
+    """LRU cache of serialized timeline payloads.
+    
+    Entries are bounded both by count and by total bytes. When `cache_dir` is
+    set, every payload is also written there, and memory misses fall back to
+    disk before the caller has to recompute. The disk tier is an LRU of its
+    own, bounded by `max_disk_entries` and `max_disk_bytes`; files already in
+    `cache_dir` are adopted at startup, oldest first by modification time.
+    """
+    
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 cache_dir: Optional[str] = None, max_disk_entries: int = 4096,
+                 max_disk_bytes: int = 1024 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+        self.max_disk_bytes = max_disk_bytes
+        
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._bytes = 0
+        # Sizes of the payloads on disk, least recently used first
+        self._disk: 'OrderedDict[str, int]' = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._load_disk_index()
+    
+    @staticmethod
+    def make_key(algorithm_name: str, array: list, **options: Any) -> str:
+        document = json.dumps([algorithm_name, array, options], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(document.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                self.hits += 1
+                return payload
+        
+        payload = self._read_disk(key)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self._store(key, payload)
+        return payload
+    
+    def put(self, key: str, payload: bytes):
+        with self._lock:
+            self._store(key, payload)
+        if self._write_disk(key, payload):
+            with self._lock:
+                evicted = self._track_disk(key, len(payload))
+            for evicted_key in evicted:
+                self._remove_disk(evicted_key)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'disk_tier': bool(self.cache_dir),
+                'disk_entries': len(self._disk),
+                'disk_bytes': self._disk_bytes,
+                'disk_evictions': self.disk_evictions
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+    
+    def _store(self, key: str, payload: bytes):
+        # Caller holds the lock
+        if len(payload) > self.max_bytes:
+            return
+        
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        
+        self._entries[key] = payload
+        self._bytes += len(payload)
+        
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+    
+    def _track_disk(self, key: str, size: int) -> List[str]:
+        # Caller holds the lock; returns the keys whose files should go
+        previous = self._disk.pop(key, None)
+        if previous is not None:
+            self._disk_bytes -= previous
+        self._disk[key] = size
+        self._disk_bytes += size
+        
+        evicted = []
+        while len(self._disk) > self.max_disk_entries or self._disk_bytes > self.max_disk_bytes:
+            evicted_key, evicted_size = self._disk.popitem(last=False)
+            self._disk_bytes -= evicted_size
+            self.disk_evictions += 1
+            evicted.append(evicted_key)
+        return evicted
+    
+    def _load_disk_index(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(_DISK_SUFFIX):
+                continue
+            try:
+                info = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((info.st_mtime, name[:-len(_DISK_SUFFIX)], info.st_size))
+        
+        evicted = []
+        for _, key, size in sorted(entries):
+            evicted.extend(self._track_disk(key, size))
+        for key in evicted:
+            self._remove_disk(key)
+    
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{_DISK_SUFFIX}")
+    
+    def _remove_disk(self, key: str):
+        try:
+            os.remove(self._disk_path(key))
+        except OSError:
+            pass
+    
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as handle:
+                return handle.read()
+        except OSError:
+            return None
+    
+    def _write_disk(self, key: str, payload: bytes) -> bool:
+        if not self.cache_dir or len(payload) > self.max_disk_bytes:
+            return False
+        
+        # Write to a temporary file first so readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(payload)
+            os.replace(temp_path, self._disk_path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        return True
\ No newline at end of file
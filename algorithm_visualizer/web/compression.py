@@ -0,0 +1,103 @@
+import zlib
+from typing import Iterable, Iterator, List, Optional, Union
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Payloads below this size are not worth the encoding overhead
+MIN_COMPRESS_SIZE = 1024
+
+GZIP_LEVEL = 6
+# Brotli's top qualities are far too slow for per-request use
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+
+def available_encodings() -> List[str]:
+    """Content codings this process can produce, in order of preference"""
+    encodings = []
+    if zstandard is not None:
+        encodings.append('zstd')
+    if brotli is not None:
+        encodings.append('br')
+    encodings.append('gzip')
+    return encodings
+
+
+def negotiate(accept_encodings) -> Optional[str]:
+    """Pick the best coding from a parsed Accept-Encoding header, or None for identity"""
+    return accept_encodings.best_match(available_encodings())
+
+
+def compress(payload: bytes, encoding: str) -> bytes:
+    if encoding == 'gzip':
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(payload) + compressor.flush()
+    if encoding == 'br' and brotli is not None:
+        return brotli.compress(payload, quality=BROTLI_QUALITY)
+    if encoding == 'zstd' and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    raise ValueError(f"Unsupported content encoding '{encoding}'")
+
+
+def decompress(payload: bytes, encoding: Optional[str]) -> bytes:
+    if encoding is None:
+        return payload
+    if encoding == 'gzip':
+        return zlib.decompress(payload, 16 + zlib.MAX_WBITS)
+    if encoding == 'br' and brotli is not None:
+        return brotli.decompress(payload)
+    if encoding == 'zstd' and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompressobj().decompress(payload)
+    raise ValueError(f"Unsupported content encoding '{encoding}'")
+
+
+class StreamCompressor:
+    """Incremental compressor for chunked responses.
+    
+    Every chunk is flushed to a block boundary, so the client can decode
+    each NDJSON line or SSE event as soon as it arrives while the encoder
+    keeps its history window across chunks.
+    """
+    
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == 'gzip':
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif encoding == 'br' and brotli is not None:
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        elif encoding == 'zstd' and zstandard is not None:
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        else:
+            raise ValueError(f"Unsupported content encoding '{encoding}'")
+    
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == 'gzip':
+            return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == 'br':
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    
+    def finish(self) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def compress_stream(chunks: Iterable[Union[str, bytes]], encoding: str) -> Iterator[bytes]:
+    compressor = StreamCompressor(encoding)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
\ No newline at end of file
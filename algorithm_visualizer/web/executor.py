@@ -0,0 +1,256 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED, CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError, wait
+)
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TypeVar
+
+
+T = TypeVar('T')
+
+# Steps a job generates between progress updates and cancellation checks
+CHECK_INTERVAL = 1024
+
+
+class PoolSaturatedError(RuntimeError):
+    """Every worker is busy and the queue is full."""
+
+
+class JobTimeoutError(RuntimeError):
+    """A job did not finish within its time limit and was cancelled."""
+
+
+class JobCancelledError(RuntimeError):
+    """A job noticed its cancel flag and stopped early."""
+
+
+class JobContext:
+    """What a running job sees of its slot: a cancel flag and a progress counter.
+    
+    In a worker process both live in shared memory owned by the pool, so the
+    parent can cancel the job or read its progress while it runs. Jobs run
+    inline get plain lists with the same interface.
+    """
+    
+    def __init__(self, slot: int, cancel_flags, progress):
+        self.slot = slot
+        self._cancel_flags = cancel_flags
+        self._progress = progress
+    
+    @property
+    def cancelled(self) -> bool:
+        return bool(self._cancel_flags[self.slot])
+    
+    def check(self):
+        if self._cancel_flags[self.slot]:
+            raise JobCancelledError("Job was cancelled")
+    
+    def report(self, steps: int):
+        self._progress[self.slot] = steps
+    
+    def track(self, steps: Iterable[T]) -> Iterator[T]:
+        """Pass `steps` through, reporting progress and honouring cancellation."""
+        count = 0
+        for step in steps:
+            yield step
+            count += 1
+            if count % CHECK_INTERVAL == 0:
+                self._progress[self.slot] = count
+                self.check()
+        self._progress[self.slot] = count
+
+
+# Shared arrays handed to each worker process by the pool initializer
+_worker_slots = None
+
+
+def _init_worker(cancel_flags, progress):
+    global _worker_slots
+    _worker_slots = (cancel_flags, progress)
+
+
+def _run_in_worker(slot: int, fn: Callable, args: tuple):
+    return fn(JobContext(slot, *_worker_slots), *args)
+
+
+class Job:
+    """A job submitted to an ExecutionPool."""
+    
+    def __init__(self, pool: 'ExecutionPool', slot: int, future):
+        self.pool = pool
+        self.slot = slot
+        self.future = future
+        # Frozen when the slot is released, before another job can reuse it
+        self.final_progress: Optional[int] = None
+    
+    @property
+    def progress(self) -> int:
+        """Steps generated so far, as last reported by the job."""
+        with self.pool._lock:
+            if self.final_progress is not None:
+                return self.final_progress
+            return self.pool._progress[self.slot]
+    
+    def done(self) -> bool:
+        return self.future.done()
+    
+    def cancel(self):
+        # A queued job is dropped outright; a running one stops at its next check
+        with self.pool._lock:
+            if self.final_progress is not None or self.future.done():
+                # The slot may already belong to another job
+                return
+            self.pool._cancel_flags[self.slot] = 1
+        self.future.cancel()
+    
+    def result(self, timeout: Optional[float] = None) -> Any:
+        try:
+            return self.future.result(timeout)
+        except FutureTimeoutError:
+            self.cancel()
+            with self.pool._lock:
+                self.pool.timed_out += 1
+            raise JobTimeoutError(f"Job did not finish within {timeout} seconds") from None
+        except CancelledError:
+            raise JobCancelledError("Job was cancelled") from None
+        except BrokenProcessPool:
+            raise JobCancelledError("Worker process exited before the job finished") from None
+
+
+class ExecutionPool:
+    """Bounded process pool for CPU-heavy timeline generation.
+    
+    At most `max_workers` jobs run at once and `max_queued` more may wait;
+    beyond that `submit` raises PoolSaturatedError instead of queueing
+    without limit. Every admitted job owns a slot in two shared arrays, a
+    cancel flag and a progress counter, that jobs poll through their
+    JobContext. The worker processes are started on first use.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, max_queued: Optional[int] = None,
+                 timeout: float = 30.0):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queued = 2 * self.max_workers if max_queued is None else max_queued
+        self.timeout = timeout
+        
+        capacity = self.max_workers + self.max_queued
+        self._cancel_flags = multiprocessing.RawArray('b', capacity)
+        self._progress = multiprocessing.RawArray('q', capacity)
+        self._free_slots: List[int] = list(range(capacity))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        
+        self.submitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.inline = 0
+    
+    def submit(self, fn: Callable, *args) -> Job:
+        """Queue `fn(context, *args)` on a worker process.
+        
+        `fn` and its arguments must be picklable, so `fn` has to be a
+        module-level function.
+        """
+        with self._lock:
+            if not self._free_slots:
+                self.rejected += 1
+                raise PoolSaturatedError("All workers are busy, try again shortly")
+            slot = self._free_slots.pop()
+            self._cancel_flags[slot] = 0
+            self._progress[slot] = 0
+            
+            try:
+                future = self._get_executor().submit(_run_in_worker, slot, fn, args)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); start a fresh pool
+                self._executor = None
+                future = self._get_executor().submit(_run_in_worker, slot, fn, args)
+            self.submitted += 1
+        
+        job = Job(self, slot, future)
+        future.add_done_callback(lambda _: self._release(job))
+        return job
+    
+    def run(self, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """Run a job on the pool and wait for its result."""
+        return self.submit(fn, *args).result(self.timeout if timeout is None else timeout)
+    
+    def run_many(self, fn: Callable, arg_tuples: List[tuple], timeout: Optional[float] = None) -> List[Any]:
+        """Run `fn(context, *args)` for each tuple on the pool and return the results in order.
+        
+        At most `max_workers` of these jobs are in flight at once, so a large
+        batch takes turns with other requests instead of filling the queue.
+        Raises PoolSaturatedError only if not a single job can be admitted,
+        and JobTimeoutError (cancelling the rest) if the whole batch takes
+        longer than `timeout`.
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        results: List[Any] = [None] * len(arg_tuples)
+        pending = list(enumerate(arg_tuples))
+        running = {}
+        try:
+            while pending or running:
+                while pending and len(running) < self.max_workers:
+                    try:
+                        job = self.submit(fn, *pending[0][1])
+                    except PoolSaturatedError:
+                        if not running:
+                            raise
+                        break
+                    running[job.future] = (pending.pop(0)[0], job)
+                
+                done, _ = wait(running, timeout=deadline - time.monotonic(), return_when=FIRST_COMPLETED)
+                if not done:
+                    with self._lock:
+                        self.timed_out += len(running)
+                    raise JobTimeoutError(f"Batch did not finish within {timeout or self.timeout} seconds")
+                for future in done:
+                    index, job = running.pop(future)
+                    results[index] = job.result()
+        finally:
+            for _, job in running.values():
+                job.cancel()
+        return results
+    
+    def run_inline(self, fn: Callable, *args) -> Any:
+        """Run a job on the calling thread, bypassing the pool."""
+        with self._lock:
+            self.inline += 1
+        return fn(JobContext(0, [0], [0]), *args)
+    
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+    
+    def stats(self) -> dict:
+        with self._lock:
+            capacity = self.max_workers + self.max_queued
+            return {
+                'max_workers': self.max_workers,
+                'max_queued': self.max_queued,
+                'active': capacity - len(self._free_slots),
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+                'inline': self.inline
+            }
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Caller holds the lock
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self._cancel_flags, self._progress)
+            )
+        return self._executor
+    
+    def _release(self, job: Job):
+        with self._lock:
+            job.final_progress = self._progress[job.slot]
+            self._free_slots.append(job.slot)
\ No newline at end of file
@@ -1,8 +1,24 @@
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, Response, abort, jsonify, request, render_template, stream_with_context
 from flask_cors import CORS
+from itertools import islice
+import json
+import os
 import random
-from ..algorithms import BubbleSort, QuickSort, MergeSort
-from ..core.explanations import ExplanationEngine
+import time
+from ..algorithms import (
+    BubbleSort, QuickSort, MergeSort, HeapSort, IntroSort, TimSort, RadixSort, CountingSort
+)
+from ..core.explanations import ExplanationEngine, STEP_TEMPLATES
+from ..core.sinks import FanOutSink
+from ..core.stats import CountingEmitter, ProbingEmitter, StepStats
+from ..core.timeline import Timeline
+from ..core.trace_file import MappedTimeline
+from .binary_format import BINARY_MIMETYPE, encode_steps
+from .cache import TimelineCache
+from .executor import ExecutionPool, JobCancelledError, JobTimeoutError, PoolSaturatedError
+from .compression import MIN_COMPRESS_SIZE, compress, compress_stream, negotiate
+from .sessions import TimelineStore
+from .jobs import JobManager
 
 
 app = Flask(__name__, 
@@ -14,10 +30,61 @@ CORS(app)
 algorithms = {
     'bubble': BubbleSort(),
     'quick': QuickSort(),
-    'merge': MergeSort()
+    'merge': MergeSort(),
+    'heap': HeapSort(),
+    'intro': IntroSort(),
+    'tim': TimSort(),
+    'radix': RadixSort(),
+    'counting': CountingSort()
 }
 explanation_engine = ExplanationEngine()
 
+# Serialized /api/execute payloads, keyed by algorithm, input and options
+timeline_cache = TimelineCache(
+    max_entries=256,
+    max_bytes=64 * 1024 * 1024,
+    cache_dir=os.environ.get('ALGORITHM_VISUALIZER_CACHE_DIR')
+)
+
+# Large /api/execute jobs run here so they don't hold this process's GIL
+execution_pool = ExecutionPool(
+    max_workers=int(os.environ.get('ALGORITHM_VISUALIZER_WORKERS', 0)) or None,
+    timeout=float(os.environ.get('ALGORITHM_VISUALIZER_JOB_TIMEOUT', 30.0))
+)
+
+# Inputs up to this length are cheap enough to run on the request thread
+INLINE_MAX_LENGTH = 256
+
+# Largest number of jobs one /api/batch request may carry
+MAX_BATCH_JOBS = 100
+
+# Timelines created through /api/timelines and fetched page by page
+timeline_store = TimelineStore(ttl=600.0, max_timelines=32)
+
+# Background jobs from /api/jobs run on the same worker processes, two at a
+# time so /api/execute keeps the rest; finished timelines move to timeline_store
+job_manager = JobManager(execution_pool, max_running=2, max_jobs=64, timeline_store=timeline_store)
+
+# Seconds between progress events on /api/jobs/<id>/events
+JOB_EVENT_INTERVAL = 0.5
+
+# Number of steps sent per streamed chunk, by default and at most
+STREAM_CHUNK_SIZE = 500
+MAX_STREAM_CHUNK_SIZE = 5000
+
+# Largest page /api/timelines/<id>/steps returns, and the default keyframe
+# spacing of stored timelines. Clients may pick a spacing within the bounds:
+# smaller means more snapshots held and faster state lookups
+MAX_PAGE_SIZE = 5000
+STORED_KEYFRAME_INTERVAL = 1024
+MIN_KEYFRAME_INTERVAL = 16
+MAX_KEYFRAME_INTERVAL = 65536
+
+STREAM_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream'
+}
+
 
 @app.route('/')
 def index():
@@ -40,53 +107,548 @@ def get_algorithms():
     return jsonify(result)
 
 
-@app.route('/api/execute', methods=['POST'])
-def execute_algorithm():
-    """Execute an algorithm and return timeline data"""
-    data = request.get_json()
+def _serialize_step(step, algorithm_name: str, lazy_explanations: bool = False) -> dict:
+    step_data = {
+        'type': step.type.value,
+        'indices': list(step.indices),
+        'values': step.values,
+        'metadata': step.metadata
+    }
+    
+    # Lazy mode ships the template id and arguments; the client formats the
+    # text only for the steps it actually displays
+    if lazy_explanations and step.template and not step.explanation:
+        step_data['template'] = step.template
+        step_data['template_args'] = list(step.template_args)
+    else:
+        step_data['explanation'] = explanation_engine.get_step_explanation(step, algorithm_name)
+    return step_data
+
+
+def _serialize_state(state) -> dict:
+    return {
+        'values': state.values,
+        'sorted_indices': list(state.sorted_indices),
+        'highlighted_indices': list(state.highlighted_indices),
+        'pivot_index': state.pivot_index,
+        'comparing_indices': state.comparing_indices
+    }
+
+
+def serialize_timeline(timeline, algorithm_name: str, lazy_explanations: bool = False) -> dict:
+    """Convert a timeline to the JSON-serializable /api/execute payload"""
+    timeline_data = {
+        'initial_array': timeline.initial_array,
+        'steps': [],
+        'array_states': []
+    }
+    if lazy_explanations:
+        timeline_data['explanation_templates'] = STEP_TEMPLATES
+    
+    for step in timeline.steps:
+        timeline_data['steps'].append(_serialize_step(step, algorithm_name, lazy_explanations))
+    
+    for state in timeline.array_states:
+        timeline_data['array_states'].append(_serialize_state(state))
+    
+    return timeline_data
+
+
+def _requested_format(data: dict) -> str:
+    """Pick 'json', 'binary' or a streaming format from the request body or the Accept header"""
+    stream = data.get('stream') or request.args.get('stream')
+    if stream in STREAM_MIMETYPES:
+        return stream
+    if data.get('format') == 'binary':
+        return 'binary'
+    
+    best = request.accept_mimetypes.best_match(
+        ['application/json', BINARY_MIMETYPE, *STREAM_MIMETYPES.values()]
+    )
+    if best == BINARY_MIMETYPE:
+        return 'binary'
+    for stream_format, mimetype in STREAM_MIMETYPES.items():
+        if best == mimetype:
+            return stream_format
+    return 'json'
+
+
+def _stream_timeline(algorithm_name: str, array_input: list, stream_format: str,
+                     chunk_size: int, max_steps=None, lazy_explanations: bool = False):
+    """Yield the initial array, then the steps in chunks, as NDJSON lines or SSE events"""
+    def encode(event: str, payload: dict) -> str:
+        if stream_format == 'sse':
+            return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        return json.dumps({'event': event, **payload}) + "\n"
+    
+    init = {'algorithm': algorithm_name, 'initial_array': array_input}
+    if lazy_explanations:
+        init['explanation_templates'] = STEP_TEMPLATES
+    yield encode('init', init)
+    
+    # Steps are pulled from the algorithm as it runs, so only one chunk is
+    # ever held in memory
+    steps = algorithms[algorithm_name].iter_steps(array_input)
+    if max_steps is not None:
+        steps = islice(steps, max_steps)
+    
+    total_steps = 0
+    while True:
+        chunk = [
+            _serialize_step(step, algorithm_name, lazy_explanations)
+            for step in islice(steps, chunk_size)
+        ]
+        if not chunk:
+            break
+        yield encode('steps', {'start': total_steps, 'steps': chunk})
+        total_steps += len(chunk)
     
+    yield encode('done', {'total_steps': total_steps})
+
+
+def _parse_run_request(data: dict):
+    """Return the algorithm name, input array and max_steps of a request body.
+    
+    Raises ValueError with a client-facing message when the input is invalid.
+    An empty array is replaced with random values.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Request body must be a JSON object')
     algorithm_name = data.get('algorithm')
     array_input = data.get('array', [])
     
     if algorithm_name not in algorithms:
-        return jsonify({'error': 'Algorithm not found'}), 400
-    
+        raise ValueError('Algorithm not found')
+    if not isinstance(array_input, list):
+        raise ValueError('array must be a list of numbers')
     if not array_input:
         array_input = [random.randint(1, 99) for _ in range(10)]
+    algorithms[algorithm_name].validate(array_input)
+    
+    max_steps = data.get('max_steps')
+    if max_steps is not None and (not isinstance(max_steps, int) or isinstance(max_steps, bool)
+                                  or max_steps < 0):
+        raise ValueError('max_steps must be a non-negative integer')
+    return algorithm_name, array_input, max_steps
+
+
+@app.route('/api/execute', methods=['POST'])
+def execute_algorithm():
+    """Execute an algorithm and return timeline data"""
+    data = request.get_json()
+    try:
+        algorithm_name, array_input, max_steps = _parse_run_request(data)
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+    
+    # Randomly generated inputs are never requested twice, so skip the cache
+    cacheable = bool(data.get('array'))
+    
+    lazy_explanations = bool(data.get('lazy_explanations', False))
+    
+    response_format = _requested_format(data)
+    encoding = negotiate(request.accept_encodings)
+    if response_format in STREAM_MIMETYPES:
+        chunk_size = data.get('chunk_size', STREAM_CHUNK_SIZE)
+        if (not isinstance(chunk_size, int) or isinstance(chunk_size, bool)
+                or not 1 <= chunk_size <= MAX_STREAM_CHUNK_SIZE):
+            return jsonify({
+                'error': f'chunk_size must be an integer between 1 and {MAX_STREAM_CHUNK_SIZE}'
+            }), 400
+        chunks = _stream_timeline(
+            algorithm_name, array_input, response_format, chunk_size, max_steps,
+            lazy_explanations
+        )
+        headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        if encoding is not None:
+            chunks = compress_stream(chunks, encoding)
+            headers['Content-Encoding'] = encoding
+        response = Response(
+            stream_with_context(chunks),
+            mimetype=STREAM_MIMETYPES[response_format],
+            headers=headers
+        )
+        response.vary.add('Accept-Encoding')
+        return response
+    
+    # Binary payloads always carry templates, so lazy_explanations does not apply
+    if response_format == 'binary':
+        mimetype, options = BINARY_MIMETYPE, {'format': 'binary'}
+    else:
+        mimetype, options = 'application/json', {'lazy_explanations': lazy_explanations}
+    
+    # Entries are stored in the negotiated content coding, so a hit is served
+    # as-is without compressing again
+    cache_key = None
+    if cacheable:
+        cache_key = TimelineCache.make_key(
+            algorithm_name, array_input, max_steps=max_steps, encoding=encoding, **options
+        )
+        payload = timeline_cache.get(cache_key)
+        if payload is not None:
+            return _encoded_response(payload, mimetype, encoding, {'X-Cache': 'HIT'})
+    
+    job_args = (algorithm_name, array_input, max_steps, response_format == 'binary', lazy_explanations, encoding)
+    try:
+        if len(array_input) <= INLINE_MAX_LENGTH:
+            payload = execution_pool.run_inline(build_payload, *job_args)
+        else:
+            payload = execution_pool.run(build_payload, *job_args)
+    except PoolSaturatedError as error:
+        return jsonify({'error': str(error)}), 503, {'Retry-After': '1'}
+    except (JobTimeoutError, JobCancelledError) as error:
+        return jsonify({'error': str(error)}), 504
+    
+    if cache_key is not None:
+        timeline_cache.put(cache_key, payload)
+    return _encoded_response(payload, mimetype, encoding, {'X-Cache': 'MISS'})
+
+
+def build_payload(context, algorithm_name: str, array_input: list, max_steps, binary: bool,
+                  lazy_explanations: bool, encoding) -> bytes:
+    """Run an algorithm and encode its /api/execute body; runs in a pool worker for large inputs"""
+    steps = algorithms[algorithm_name].iter_steps(array_input)
+    if max_steps is not None:
+        steps = islice(steps, max_steps)
+    steps = context.track(steps)
+    
+    if binary:
+        # Clients rebuild states from the steps, so no Timeline is needed
+        payload = encode_steps(
+            array_input, steps, lambda step: explanation_engine.get_step_explanation(step, algorithm_name)
+        )
+    else:
+        timeline = Timeline(array_input)
+        for step in steps:
+            timeline.add_step(step)
+        payload = app.json.dumps(serialize_timeline(timeline, algorithm_name, lazy_explanations)).encode('utf-8')
+    
+    if encoding is not None:
+        payload = compress(payload, encoding)
+    return payload
+
+
+def build_timeline(context, algorithm_name: str, array_input: list, max_steps,
+                   keyframe_interval: int, adaptive_keyframes: bool) -> Timeline:
+    """Run an algorithm into a compact Timeline for /api/timelines; runs in a pool worker for large inputs"""
+    steps = algorithms[algorithm_name].iter_steps(array_input)
+    if max_steps is not None:
+        steps = islice(steps, max_steps)
     
+    timeline = Timeline(
+        array_input, keyframe_interval, compact_steps=True, adaptive_keyframes=adaptive_keyframes
+    )
+    for step in context.track(steps):
+        timeline.add_step(step)
+    return timeline
+
+
+def summarize_run(context, algorithm_name: str, array_input: list, max_steps,
+                  include_timeline: bool, lazy_explanations: bool) -> dict:
+    """Run an algorithm and count its steps for /api/batch; runs in a pool worker for large inputs"""
     algorithm = algorithms[algorithm_name]
-    timeline = algorithm.execute(array_input)
+    stats = StepStats()
+    timeline = None
+    if include_timeline:
+        timeline = Timeline(array_input)
+        steps = algorithm.iter_steps(array_input, ProbingEmitter(stats))
+        if max_steps is not None:
+            steps = islice(steps, max_steps)
+        sink = FanOutSink(stats, timeline)
+        for step in context.track(steps):
+            sink.add_step(step)
+    else:
+        # Stats mode: count step types without building Step objects
+        steps = algorithm.iter_steps(array_input, CountingEmitter(stats))
+        if max_steps is not None:
+            steps = islice(steps, max_steps)
+        stats.count(context.track(steps))
     
-    # Convert timeline to JSON-serializable format
-    timeline_data = {
+    summary = {'algorithm': algorithm_name, 'array_length': len(array_input), **stats.to_dict()}
+    if timeline is not None:
+        summary['timeline'] = serialize_timeline(timeline, algorithm_name, lazy_explanations)
+    return summary
+
+
+def _encoded_response(payload: bytes, mimetype: str, encoding, headers: dict) -> Response:
+    if encoding is not None:
+        headers['Content-Encoding'] = encoding
+    response = Response(payload, mimetype=mimetype, headers=headers)
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+@app.after_request
+def compress_api_response(response):
+    """Compress the remaining buffered API responses according to Accept-Encoding"""
+    if (not request.path.startswith('/api/') or response.status_code < 200
+            or response.status_code in (204, 304) or response.direct_passthrough
+            or response.is_streamed or 'Content-Encoding' in response.headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate(request.accept_encodings)
+    if encoding is None or (response.content_length or 0) < MIN_COMPRESS_SIZE:
+        return response
+    
+    response.set_data(compress(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+@app.route('/api/batch', methods=['POST'])
+def execute_batch():
+    """Run many algorithm/array jobs in parallel and return step statistics for each"""
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    jobs = data.get('jobs')
+    if jobs is None:
+        # Shorthand for every algorithm run on every array
+        jobs = [
+            {'algorithm': algorithm_name, 'array': array_input}
+            for algorithm_name in data.get('algorithms', [])
+            for array_input in data.get('arrays', [[]])
+        ]
+    if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+        return jsonify({'error': 'jobs must be a list of objects'}), 400
+    if not jobs:
+        return jsonify({'error': 'No jobs given'}), 400
+    if len(jobs) > MAX_BATCH_JOBS:
+        return jsonify({'error': f'At most {MAX_BATCH_JOBS} jobs per batch'}), 400
+    
+    include_timelines = bool(data.get('include_timelines', False))
+    lazy_explanations = bool(data.get('lazy_explanations', False))
+    
+    # Invalid jobs get an error entry instead of failing the whole batch
+    results = [None] * len(jobs)
+    inline, pooled = [], []
+    for index, job in enumerate(jobs):
+        try:
+            algorithm_name, array_input, max_steps = _parse_run_request(job)
+        except ValueError as error:
+            results[index] = {'algorithm': job.get('algorithm'), 'error': str(error)}
+            continue
+        job_args = (algorithm_name, array_input, max_steps, include_timelines, lazy_explanations)
+        (inline if len(array_input) <= INLINE_MAX_LENGTH else pooled).append((index, job_args))
+    
+    try:
+        pooled_results = execution_pool.run_many(summarize_run, [job_args for _, job_args in pooled])
+    except PoolSaturatedError as error:
+        return jsonify({'error': str(error)}), 503, {'Retry-After': '1'}
+    except (JobTimeoutError, JobCancelledError) as error:
+        return jsonify({'error': str(error)}), 504
+    for (index, _), result in zip(pooled, pooled_results):
+        results[index] = result
+    for index, job_args in inline:
+        results[index] = execution_pool.run_inline(summarize_run, *job_args)
+    
+    return jsonify({'results': results})
+
+
+@app.route('/api/timelines', methods=['POST'])
+def create_timeline():
+    """Execute an algorithm and keep the timeline on the server for paged access"""
+    data = request.get_json()
+    try:
+        algorithm_name, array_input, max_steps = _parse_run_request(data)
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+    
+    keyframe_interval = data.get('keyframe_interval', STORED_KEYFRAME_INTERVAL)
+    if (not isinstance(keyframe_interval, int) or isinstance(keyframe_interval, bool)
+            or not MIN_KEYFRAME_INTERVAL <= keyframe_interval <= MAX_KEYFRAME_INTERVAL):
+        return jsonify({
+            'error': f'keyframe_interval must be an integer between {MIN_KEYFRAME_INTERVAL} '
+                     f'and {MAX_KEYFRAME_INTERVAL}'
+        }), 400
+    adaptive_keyframes = data.get('adaptive_keyframes', False)
+    if not isinstance(adaptive_keyframes, bool):
+        return jsonify({'error': 'adaptive_keyframes must be true or false'}), 400
+    
+    job_args = (algorithm_name, array_input, max_steps, keyframe_interval, adaptive_keyframes)
+    try:
+        if len(array_input) <= INLINE_MAX_LENGTH:
+            timeline = execution_pool.run_inline(build_timeline, *job_args)
+        else:
+            timeline = execution_pool.run(build_timeline, *job_args)
+    except PoolSaturatedError as error:
+        return jsonify({'error': str(error)}), 503, {'Retry-After': '1'}
+    except (JobTimeoutError, JobCancelledError) as error:
+        return jsonify({'error': str(error)}), 504
+    entry = timeline_store.create(algorithm_name, timeline)
+    return jsonify({
+        'id': entry.id,
+        'algorithm': algorithm_name,
         'initial_array': timeline.initial_array,
-        'steps': [],
-        'array_states': []
+        'total_steps': timeline.get_total_steps(),
+        'explanation_templates': STEP_TEMPLATES,
+        'seek': timeline.seek_stats(),
+        'ttl': timeline_store.ttl
+    }), 201
+
+
+def _stored_timeline_or_404(timeline_id: str):
+    entry = timeline_store.get(timeline_id)
+    if entry is None:
+        abort(404, description='Timeline not found or expired')
+    return entry
+
+
+def _int_arg(name: str, default: int) -> int:
+    try:
+        return int(request.args.get(name, default))
+    except ValueError:
+        abort(400, description=f"'{name}' must be an integer")
+
+
+def _steps_page(timeline, algorithm_name: str, available: int) -> dict:
+    """Serialize the steps[start:end] window named by the query string, clamped to `available`"""
+    start = min(max(0, _int_arg('start', 0)), available)
+    end = min(max(start, _int_arg('end', start + MAX_PAGE_SIZE)), start + MAX_PAGE_SIZE, available)
+    lazy_explanations = request.args.get('lazy_explanations', 'true').lower() != 'false'
+    
+    steps = timeline.steps if timeline is not None else []
+    return {
+        'start': start,
+        'end': end,
+        'steps': [
+            _serialize_step(steps[index], algorithm_name, lazy_explanations)
+            for index in range(start, end)
+        ]
     }
+
+
+@app.route('/api/timelines/<timeline_id>/steps')
+def get_timeline_steps(timeline_id):
+    """Return steps[start:end] of a stored timeline"""
+    entry = _stored_timeline_or_404(timeline_id)
+    total_steps = entry.timeline.get_total_steps()
     
-    for step in timeline.steps:
-        step_data = {
-            'type': step.type.value,
-            'indices': step.indices,
-            'values': step.values,
-            'explanation': step.explanation or explanation_engine.get_step_explanation(
-                step, algorithm_name
-            ),
-            'metadata': step.metadata
-        }
-        timeline_data['steps'].append(step_data)
+    page = _steps_page(entry.timeline, entry.algorithm_name, total_steps)
+    return jsonify({**page, 'total_steps': total_steps})
+
+
+@app.route('/api/timelines/<timeline_id>/state')
+def get_timeline_state(timeline_id):
+    """Return the array state after the first `position` steps of a stored timeline"""
+    entry = _stored_timeline_or_404(timeline_id)
+    total_steps = entry.timeline.get_total_steps()
     
-    for state in timeline.array_states:
-        state_data = {
-            'values': state.values,
-            'sorted_indices': state.sorted_indices,
-            'highlighted_indices': state.highlighted_indices,
-            'pivot_index': state.pivot_index,
-            'comparing_indices': state.comparing_indices
-        }
-        timeline_data['array_states'].append(state_data)
+    position = _int_arg('position', 0)
+    if not 0 <= position <= total_steps:
+        return jsonify({'error': f'position must be between 0 and {total_steps}'}), 400
+    
+    with entry.lock:
+        state = _serialize_state(entry.cursor.move_to(position))
+    return jsonify({'position': position, 'total_steps': total_steps, 'state': state})
+
+
+@app.route('/api/timelines/stats')
+def get_timeline_store_stats():
+    """Report how many timelines are stored and how many have expired"""
+    return jsonify(timeline_store.stats())
+
+
+@app.route('/api/timelines/<timeline_id>', methods=['DELETE'])
+def delete_timeline(timeline_id):
+    """Drop a stored timeline before its TTL runs out"""
+    if not timeline_store.delete(timeline_id):
+        return jsonify({'error': 'Timeline not found or expired'}), 404
+    return '', 204
+
+
+@app.errorhandler(400)
+@app.errorhandler(404)
+def api_error(error):
+    if request.path.startswith('/api/'):
+        return jsonify({'error': error.description}), error.code
+    return error
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Start generating a timeline in the background and return the job id"""
+    try:
+        algorithm_name, array_input, max_steps = _parse_run_request(request.get_json())
+        job = job_manager.submit(algorithms[algorithm_name], algorithm_name, array_input, max_steps)
+    except PoolSaturatedError as error:
+        return jsonify({'error': str(error)}), 503, {'Retry-After': '5'}
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
     
-    return jsonify(timeline_data)
+    progress = job_manager.progress(job)
+    progress['initial_array'] = array_input
+    progress['explanation_templates'] = STEP_TEMPLATES
+    return jsonify(progress), 202, {'Location': f'/api/jobs/{job.id}'}
+
+
+def _job_or_404(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        abort(404, description='Job not found or expired')
+    return job
+
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Report a job's status, step count and estimated time to completion"""
+    return jsonify(job_manager.progress(_job_or_404(job_id)))
+
+
+@app.route('/api/jobs/<job_id>/events')
+def get_job_events(job_id):
+    """Stream a job's progress as server-sent events until it finishes"""
+    job = _job_or_404(job_id)
+    
+    def events():
+        while True:
+            progress = job_manager.progress(job)
+            yield f"event: progress\ndata: {json.dumps(progress)}\n\n"
+            if job.finished:
+                return
+            time.sleep(JOB_EVENT_INTERVAL)
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/jobs/<job_id>/steps')
+def get_job_steps(job_id):
+    """Return the steps a job has generated so far, paged like stored timelines"""
+    job = _job_or_404(job_id)
+    # One snapshot, so 'complete' is only reported together with the final count
+    status, steps_done, timeline = job.snapshot()
+    if timeline is None and steps_done:
+        # Still running: read what the worker has flushed so far
+        with MappedTimeline(job.trace_path, allow_partial=True) as partial:
+            page = _steps_page(partial, job.algorithm_name, steps_done)
+    else:
+        page = _steps_page(timeline, job.algorithm_name, steps_done)
+    return jsonify({**page, 'steps_done': steps_done, 'complete': status == 'done'})
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    job = _job_or_404(job_id)
+    job_manager.cancel(job.id)
+    return jsonify(job_manager.progress(job))
+
+
+@app.route('/api/executor/stats')
+def get_executor_stats():
+    """Report worker pool occupancy and rejected or timed-out jobs"""
+    return jsonify(execution_pool.stats())
+
+
+@app.route('/api/cache/stats')
+def get_cache_stats():
+    """Report hit/miss counters and size of the timeline cache"""
+    return jsonify(timeline_cache.stats())
 
 
 @app.route('/api/generate_array', methods=['POST'])
@@ -0,0 +1,293 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import CancelledError
+from itertools import islice
+from typing import Callable, Optional
+
+from ..core.trace_file import MappedTimeline, TraceWriter
+from .executor import ExecutionPool, JobCancelledError, PoolSaturatedError
+
+
+def generate_trace(context, algorithm, array: list, max_steps: Optional[int], path: str,
+                   keyframe_interval: int, progress_interval: int) -> int:
+    """Record a job's steps into a trace directory; runs in a pool worker.
+    
+    Every `progress_interval` steps the trace is flushed and only then the
+    count reported, so the parent can read any step below the reported
+    count from disk. The trace is closed however the run ends.
+    """
+    steps = algorithm.iter_steps(array)
+    if max_steps is not None:
+        steps = islice(steps, max_steps)
+    
+    writer = TraceWriter(path, array, keyframe_interval)
+    try:
+        for count, step in enumerate(steps, start=1):
+            writer.add_step(step)
+            if count % progress_interval == 0:
+                writer.flush()
+                context.report(count)
+                context.check()
+    finally:
+        writer.close()
+    context.report(writer.steps_written)
+    return writer.steps_written
+
+
+class TimelineJob:
+    """A timeline being generated in the background.
+    
+    While the job runs, its steps are in a trace directory that the worker
+    flushes at every progress report; `steps_done` is the count last
+    reported, so everything below it is readable with
+    `MappedTimeline(trace_path, allow_partial=True)`. Once finished,
+    `timeline` holds the whole trace. Status, step count and timeline
+    change together under the job's lock; read them with `snapshot`.
+    """
+    
+    def __init__(self, algorithm_name: str, array: list, estimated_steps: int, created_at: float,
+                 trace_dir: str):
+        self.id = uuid.uuid4().hex
+        self.algorithm_name = algorithm_name
+        self.array = array
+        self.estimated_steps = estimated_steps
+        self.trace_path = os.path.join(trace_dir, self.id)
+        self.status = 'queued'
+        self.error: Optional[str] = None
+        self.timeline: Optional[MappedTimeline] = None
+        self.timeline_id: Optional[str] = None
+        self.pool_job = None
+        self.created_at = created_at
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.expires_at = float('inf')
+        self._steps_done = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed', 'cancelled')
+    
+    @property
+    def steps_done(self) -> int:
+        return self.snapshot()[1]
+    
+    def snapshot(self) -> tuple:
+        """Return `(status, steps_done, timeline)` as of one moment.
+        
+        A job marked done has published its final step count, so a reader
+        that sees `'done'` here also sees the whole timeline. `timeline` is
+        None until the job finishes.
+        """
+        with self._lock:
+            steps = self._steps_done
+            if self.status == 'running':
+                # Reported by the worker through the pool's shared counters
+                steps = self.pool_job.progress
+            return self.status, steps, self.timeline
+    
+    def progress(self, now: float) -> dict:
+        status, steps, _ = self.snapshot()
+        # The estimate can be low; until the job finishes never claim 100%
+        estimate = max(self.estimated_steps, 1)
+        fraction = 1.0 if status == 'done' else min(steps / estimate, 0.99)
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or now) - self.started_at
+        
+        eta = None
+        if status == 'running' and steps:
+            eta = max(elapsed * (estimate - steps) / steps, 0.0)
+        elif status == 'done':
+            eta = 0.0
+        
+        return {
+            'id': self.id,
+            'algorithm': self.algorithm_name,
+            'status': status,
+            'steps_done': steps,
+            'estimated_total_steps': max(self.estimated_steps, steps),
+            'fraction': fraction,
+            'elapsed': elapsed,
+            'eta_seconds': eta,
+            'error': self.error,
+            'timeline_id': self.timeline_id
+        }
+
+
+class JobManager:
+    """Runs timeline generation jobs on an ExecutionPool's worker processes.
+    
+    Jobs write their steps to a trace directory under `trace_dir` (a fresh
+    temporary directory by default) and report progress through the pool's
+    shared counters, so generation never holds this process's GIL. At most
+    `max_running` jobs are handed to the pool at once, leaving workers free
+    for /api/execute; the rest wait here, up to `max_jobs` unfinished jobs
+    in all, beyond which `submit` raises PoolSaturatedError. Finished jobs
+    and their traces are removed `ttl` seconds after they complete. When a
+    `timeline_store` is given, each completed timeline is handed to it and
+    the job records the stored id.
+    """
+    
+    def __init__(self, pool: ExecutionPool, max_running: int = 2, max_jobs: int = 64,
+                 ttl: float = 600.0, progress_interval: int = 1024, keyframe_interval: int = 1024,
+                 timeline_store=None, trace_dir: Optional[str] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.pool = pool
+        self.max_running = max_running
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self.progress_interval = progress_interval
+        self.keyframe_interval = keyframe_interval
+        self.timeline_store = timeline_store
+        self.trace_dir = trace_dir
+        self._clock = clock
+        
+        self._jobs: 'OrderedDict[str, TimelineJob]' = OrderedDict()
+        self._queue: 'deque[tuple]' = deque()
+        self._running = 0
+        self._lock = threading.Lock()
+    
+    def submit(self, algorithm, algorithm_name: str, array: list,
+               max_steps: Optional[int] = None) -> TimelineJob:
+        estimate = algorithm.estimate_steps(array)
+        if max_steps is not None:
+            estimate = min(estimate, max_steps)
+        
+        with self._lock:
+            self._purge_expired()
+            if sum(not job.finished for job in self._jobs.values()) >= self.max_jobs:
+                raise PoolSaturatedError("Too many jobs in progress, try again later")
+            if self.trace_dir is None:
+                self.trace_dir = tempfile.mkdtemp(prefix='timeline-jobs-')
+            job = TimelineJob(algorithm_name, array, estimate, self._clock(), self.trace_dir)
+            self._jobs[job.id] = job
+            self._queue.append((job, algorithm, max_steps))
+        self._dispatch()
+        return job
+    
+    def get(self, job_id: str) -> Optional[TimelineJob]:
+        # Queued jobs may be waiting for a pool slot that has since freed up
+        self._dispatch()
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+    
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None:
+            return False
+        with self._lock:
+            queued = [entry for entry in self._queue if entry[0] is job]
+            for entry in queued:
+                self._queue.remove(entry)
+        if queued:
+            self._finish(job, 'cancelled', None)
+        elif not job.finished and job.pool_job is not None and not job.pool_job.done():
+            # A running job stops at its next progress report; a finished
+            # one's pool slot may already serve another run
+            job.pool_job.cancel()
+        return True
+    
+    def progress(self, job: TimelineJob) -> dict:
+        return job.progress(self._clock())
+    
+    def shutdown(self, wait: bool = True):
+        """Cancel every unfinished job and remove the traces; the pool is left running."""
+        with self._lock:
+            queued = [job for job, _, _ in self._queue]
+            self._queue.clear()
+            running = [job for job in self._jobs.values() if job.status == 'running']
+        for job in queued:
+            self._finish(job, 'cancelled', None)
+        for job in running:
+            job.pool_job.cancel()
+            if wait:
+                try:
+                    job.pool_job.future.result()
+                except Exception:
+                    pass
+        if self.trace_dir is not None:
+            shutil.rmtree(self.trace_dir, ignore_errors=True)
+    
+    def stats(self) -> dict:
+        self._dispatch()
+        with self._lock:
+            self._purge_expired()
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            'jobs': len(statuses),
+            'queued': statuses.count('queued'),
+            'running': statuses.count('running'),
+            'max_running': self.max_running,
+            'max_jobs': self.max_jobs
+        }
+    
+    def _dispatch(self):
+        started = []
+        with self._lock:
+            while self._queue and self._running < self.max_running:
+                job, algorithm, max_steps = self._queue[0]
+                try:
+                    pool_job = self.pool.submit(
+                        generate_trace, algorithm, job.array, max_steps, job.trace_path,
+                        self.keyframe_interval, self.progress_interval
+                    )
+                except PoolSaturatedError:
+                    # The pool is busy with other requests; retried on the next
+                    # poll or when a job finishes
+                    break
+                self._queue.popleft()
+                self._running += 1
+                with job._lock:
+                    job.pool_job = pool_job
+                    job.status = 'running'
+                    job.started_at = self._clock()
+                started.append(job)
+        
+        # Outside the lock: a callback on an already finished future runs here
+        for job in started:
+            job.pool_job.future.add_done_callback(lambda _, job=job: self._on_done(job))
+    
+    def _on_done(self, job: TimelineJob):
+        with self._lock:
+            self._running -= 1
+        
+        status = 'done'
+        try:
+            job.pool_job.future.result()
+        except (CancelledError, JobCancelledError):
+            status = 'cancelled'
+        except Exception as error:
+            job.error = str(error)
+            status = 'failed'
+        
+        try:
+            # A worker that died mid-run leaves only its last flush behind
+            timeline = MappedTimeline(job.trace_path, allow_partial=status != 'done')
+        except FileNotFoundError:
+            timeline = None
+        if status == 'done' and self.timeline_store is not None:
+            job.timeline_id = self.timeline_store.create(job.algorithm_name, timeline).id
+        self._finish(job, status, timeline)
+        self._dispatch()
+    
+    def _finish(self, job: TimelineJob, status: str, timeline: Optional[MappedTimeline]):
+        with job._lock:
+            job.timeline = timeline
+            job._steps_done = timeline.get_total_steps() if timeline is not None else 0
+            job.finished_at = self._clock()
+            job.expires_at = job.finished_at + self.ttl
+            job.status = status
+    
+    def _purge_expired(self):
+        # Caller holds the lock
+        now = self._clock()
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.expires_at <= now]:
+            # Open maps, e.g. a stored timeline's, stay valid after the files go
+            shutil.rmtree(self._jobs.pop(job_id).trace_path, ignore_errors=True)
\ No newline at end of file
@@ -0,0 +1,95 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+class StoredTimeline:
+    """A server-side timeline plus the cursor its state requests walk with.
+    
+    Pages are usually fetched in order, so keeping one cursor per timeline
+    lets consecutive state lookups cost a few step applications each. `lock`
+    serializes those lookups since the cursor is not thread-safe.
+    """
+    
+    def __init__(self, timeline_id: str, algorithm_name: str, timeline, expires_at: float):
+        self.id = timeline_id
+        self.algorithm_name = algorithm_name
+        self.timeline = timeline
+        self.cursor = timeline.cursor()
+        self.expires_at = expires_at
+        self.lock = threading.Lock()
+
+
+class TimelineStore:
+    """Timelines kept on the server between paged requests.
+    
+    Entries expire `ttl` seconds after they were last used, and the least
+    recently used entry is dropped once more than `max_timelines` are held.
+    Expired entries are purged whenever the store is touched, so no
+    background thread is needed.
+    """
+    
+    def __init__(self, ttl: float = 600.0, max_timelines: int = 32,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_timelines = max_timelines
+        self._clock = clock
+        
+        self._entries: 'OrderedDict[str, StoredTimeline]' = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.expirations = 0
+        self.evictions = 0
+    
+    def create(self, algorithm_name: str, timeline) -> StoredTimeline:
+        entry = StoredTimeline(uuid.uuid4().hex, algorithm_name, timeline, self._clock() + self.ttl)
+        with self._lock:
+            self._purge_expired()
+            self._entries[entry.id] = entry
+            while len(self._entries) > self.max_timelines:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+    
+    def get(self, timeline_id: str) -> Optional[StoredTimeline]:
+        with self._lock:
+            self._purge_expired()
+            entry = self._entries.get(timeline_id)
+            if entry is not None:
+                entry.expires_at = self._clock() + self.ttl
+                self._entries.move_to_end(timeline_id)
+            return entry
+    
+    def delete(self, timeline_id: str) -> bool:
+        with self._lock:
+            return self._entries.pop(timeline_id, None) is not None
+    
+    def stats(self) -> dict:
+        with self._lock:
+            self._purge_expired()
+            return {
+                'timelines': len(self._entries),
+                'max_timelines': self.max_timelines,
+                'ttl': self.ttl,
+                'expirations': self.expirations,
+                'evictions': self.evictions
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, timeline_id: str) -> bool:
+        return timeline_id in self._entries
+    
+    def _purge_expired(self):
+        # Caller holds the lock; entries are in last-used order, so the
+        # expired ones are all at the front
+        now = self._clock()
+        while self._entries:
+            timeline_id, entry = next(iter(self._entries.items()))
+            if entry.expires_at > now:
+                break
+            del self._entries[timeline_id]
+            self.expirations += 1
\ No newline at end of file
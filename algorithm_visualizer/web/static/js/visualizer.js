@@ -28,6 +28,7 @@ class AlgorithmVisualizer {
             speedControl: document.getElementById('speed-control'),
             speedDisplay: document.getElementById('speed-display'),
             progressBar: document.getElementById('progress-bar'),
+            positionSlider: document.getElementById('position-slider'),
             stepCounter: document.getElementById('step-counter'),
             arrayVisualization: document.getElementById('array-visualization'),
             algorithmName: document.getElementById('algorithm-name'),
@@ -65,6 +66,11 @@ class AlgorithmVisualizer {
             this.elements.speedDisplay.textContent = `${this.playbackSpeed}x`;
         });
         
+        // The slider counts applied steps, so 0 is the initial array
+        this.elements.positionSlider.addEventListener('input', (e) => {
+            this.seek(parseInt(e.target.value) - 1);
+        });
+        
         this.elements.generateBtn.addEventListener('click', () => this.generateArray());
         this.elements.executeBtn.addEventListener('click', () => this.executeAlgorithm());
         this.elements.playBtn.addEventListener('click', () => this.play());
@@ -105,20 +111,126 @@ class AlgorithmVisualizer {
         try {
             const response = await fetch('/api/execute', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: {
+                    'Content-Type': 'application/json',
+                    'Accept': `${BINARY_TIMELINE_MIMETYPE}, application/x-ndjson;q=0.9`
+                },
                 body: JSON.stringify({
                     algorithm,
-                    array: this.currentArray
+                    array: this.currentArray,
+                    lazy_explanations: true
                 })
             });
             
-            this.timeline = await response.json();
+            if (!response.ok) {
+                throw new Error(`Request failed with status ${response.status}`);
+            }
+            const contentType = response.headers.get('Content-Type') || '';
+            if (contentType.startsWith(BINARY_TIMELINE_MIMETYPE)) {
+                this.loadBinaryTimeline(await response.arrayBuffer());
+            } else {
+                await this.readTimelineStream(response);
+            }
+        } catch (error) {
+            console.error('Failed to execute algorithm:', error);
+        }
+    }
+    
+    async readTimelineStream(response) {
+        // Steps arrive as NDJSON chunks, so playback can start before the run finishes
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.forEach(line => {
+                if (line.trim()) this.handleStreamEvent(JSON.parse(line));
+            });
+        }
+        
+        if (buffer.trim()) this.handleStreamEvent(JSON.parse(buffer));
+    }
+    
+    loadBinaryTimeline(buffer) {
+        const timeline = decodeBinaryTimeline(buffer);
+        this.handleStreamEvent({
+            event: 'init',
+            initial_array: timeline.initial_array,
+            explanation_templates: timeline.explanation_templates
+        });
+        this.handleStreamEvent({ event: 'steps', start: 0, steps: timeline.steps });
+        this.handleStreamEvent({ event: 'done', total_steps: timeline.steps.length });
+    }
+    
+    handleStreamEvent(event) {
+        if (event.event === 'init') {
+            const initialState = this.createInitialState(event.initial_array);
+            const seekIndex = new SeekIndex(SEEK_REPLAY_BUDGET);
+            seekIndex.add(0, copyState(initialState));
+            this.timeline = {
+                initial_array: event.initial_array,
+                steps: [],
+                // Checkpoints instead of a snapshot per step; `lastState` is
+                // the state after every step received so far
+                seekIndex,
+                lastState: initialState,
+                cursor: { position: 0, state: copyState(initialState) },
+                explanation_templates: event.explanation_templates || {},
+                renderedExplanations: new Map(),
+                complete: false
+            };
             this.currentPosition = -1;
             this.enablePlaybackControls();
             this.reset();
-        } catch (error) {
-            console.error('Failed to execute algorithm:', error);
+        } else if (event.event === 'steps') {
+            const timeline = this.timeline;
+            event.steps.forEach(step => {
+                timeline.steps.push(step);
+                advanceState(timeline.lastState, step);
+                if (timeline.seekIndex.shouldCheckpoint(step)) {
+                    timeline.seekIndex.add(timeline.steps.length, copyState(timeline.lastState));
+                }
+            });
+            this.updateProgress();
+        } else if (event.event === 'done') {
+            this.timeline.complete = true;
+            this.updateProgress();
+        }
+    }
+    
+    createInitialState(values) {
+        return {
+            values: values.slice(),
+            sorted_indices: new Set(),
+            highlighted_indices: [],
+            pivot_index: null,
+            comparing_indices: []
+        };
+    }
+    
+    stateAt(position) {
+        // State after the first `position` steps. Walks forward from the
+        // shared cursor when that is cheaper than the nearest checkpoint, so
+        // playback costs one step per tick and any seek replays at most one
+        // checkpoint gap
+        const timeline = this.timeline;
+        const cursor = timeline.cursor;
+        const [checkpoint, state] = timeline.seekIndex.floor(position);
+        if (position < cursor.position || checkpoint > cursor.position) {
+            cursor.position = checkpoint;
+            cursor.state = copyState(state);
+        }
+        while (cursor.position < position) {
+            advanceState(cursor.state, timeline.steps[cursor.position]);
+            cursor.position++;
         }
+        return cursor.state;
     }
     
     updateAlgorithmInfo(algorithmKey) {
@@ -167,7 +279,7 @@ class AlgorithmVisualizer {
             return;
         }
         
-        const state = this.timeline.array_states[this.currentPosition + 1];
+        const state = this.stateAt(this.currentPosition + 1);
         const maxValue = Math.max(...state.values);
         
         state.values.forEach((value, index) => {
@@ -182,7 +294,7 @@ class AlgorithmVisualizer {
         bar.style.height = `${(value / maxValue) * 80}%`;
         
         if (state) {
-            if (state.sorted_indices.includes(index)) {
+            if (state.sorted_indices.has(index)) {
                 bar.classList.add('sorted');
             } else if (state.pivot_index === index) {
                 bar.classList.add('pivot');
@@ -203,7 +315,7 @@ class AlgorithmVisualizer {
     
     updateArrayDisplay() {
         if (this.timeline && this.currentPosition >= 0) {
-            const state = this.timeline.array_states[this.currentPosition + 1];
+            const state = this.stateAt(this.currentPosition + 1);
             this.elements.currentArray.textContent = `[${state.values.join(', ')}]`;
         } else {
             this.elements.currentArray.textContent = `[${this.currentArray.join(', ')}]`;
@@ -213,12 +325,25 @@ class AlgorithmVisualizer {
     updateStepExplanation() {
         if (this.timeline && this.currentPosition >= 0 && this.currentPosition < this.timeline.steps.length) {
             const step = this.timeline.steps[this.currentPosition];
-            this.elements.stepExplanationText.textContent = step.explanation;
+            this.elements.stepExplanationText.textContent = this.getStepExplanation(step);
         } else {
             this.elements.stepExplanationText.textContent = 'No step in progress';
         }
     }
     
+    getStepExplanation(step) {
+        if (step.explanation !== undefined) return step.explanation;
+        
+        // Templated explanations are formatted on first display and cached
+        const key = `${step.template}|${step.template_args.join('|')}`;
+        const cache = this.timeline.renderedExplanations;
+        if (!cache.has(key)) {
+            const template = this.timeline.explanation_templates[step.template] || '';
+            cache.set(key, template.replace(/\{(\d+)\}/g, (match, index) => step.template_args[index]));
+        }
+        return cache.get(key);
+    }
+    
     updateProgress() {
         if (!this.timeline) return;
         
@@ -228,6 +353,8 @@ class AlgorithmVisualizer {
         
         this.elements.progressBar.style.width = `${progress}%`;
         this.elements.stepCounter.textContent = `${currentStep} / ${totalSteps}`;
+        this.elements.positionSlider.max = totalSteps;
+        this.elements.positionSlider.value = currentStep;
     }
     
     enablePlaybackControls() {
@@ -236,6 +363,7 @@ class AlgorithmVisualizer {
         this.elements.stepForwardBtn.disabled = false;
         this.elements.stepBackwardBtn.disabled = false;
         this.elements.resetBtn.disabled = false;
+        this.elements.positionSlider.disabled = false;
     }
     
     play() {
@@ -247,7 +375,7 @@ class AlgorithmVisualizer {
         this.playbackInterval = setInterval(() => {
             if (this.currentPosition < this.timeline.steps.length - 1) {
                 this.stepForward();
-            } else {
+            } else if (this.timeline.complete !== false) {
                 this.pause();
             }
         }, interval);
@@ -279,6 +407,13 @@ class AlgorithmVisualizer {
         }
     }
     
+    seek(position) {
+        if (!this.timeline) return;
+        
+        this.currentPosition = Math.max(-1, Math.min(position, this.timeline.steps.length - 1));
+        this.updateVisualization();
+    }
+    
     reset() {
         this.pause();
         this.currentPosition = -1;
@@ -293,6 +428,235 @@ class AlgorithmVisualizer {
     }
 }
 
+const BINARY_TIMELINE_MIMETYPE = 'application/vnd.algorithm-visualizer.timeline';
+
+// Replay work between seek checkpoints, in swaps: lower keeps more snapshots
+// in memory and makes slider seeks cheaper. Costs mirror core/seek_index.py
+const SEEK_REPLAY_BUDGET = 256;
+const REPLAY_COSTS = {
+    compare: 0.25, swap: 1, overwrite: 1, mark_sorted: 4,
+    highlight: 4, clear_highlight: 4, pivot: 4, merge: 0.25
+};
+
+// Checkpointed states at increasing step positions, placed adaptively by
+// replay cost and found by binary search
+class SeekIndex {
+    constructor(budget) {
+        this.budget = budget;
+        this.cost = 0;
+        this.positions = [];
+        this.states = [];
+    }
+    
+    shouldCheckpoint(step) {
+        this.cost += REPLAY_COSTS[step.type] || 1;
+        if (this.cost < this.budget) return false;
+        this.cost = 0;
+        return true;
+    }
+    
+    add(position, state) {
+        this.positions.push(position);
+        this.states.push(state);
+    }
+    
+    floor(position) {
+        let low = 0;
+        let high = this.positions.length - 1;
+        while (low < high) {
+            const mid = (low + high + 1) >> 1;
+            if (this.positions[mid] <= position) low = mid;
+            else high = mid - 1;
+        }
+        return [this.positions[low], this.states[low]];
+    }
+}
+
+function copyState(state) {
+    return {
+        values: state.values.slice(),
+        sorted_indices: new Set(state.sorted_indices),
+        highlighted_indices: state.highlighted_indices.slice(),
+        pivot_index: state.pivot_index,
+        comparing_indices: state.comparing_indices.slice()
+    };
+}
+
+// Applies `step` to `state` in place; mirrors ArrayState.advance on the server
+function advanceState(state, step) {
+    state.comparing_indices = [];
+    switch (step.type) {
+        case 'swap': {
+            const [i, j] = step.indices;
+            [state.values[i], state.values[j]] = [state.values[j], state.values[i]];
+            break;
+        }
+        case 'overwrite':
+            state.values[step.indices[0]] = step.values[0];
+            break;
+        case 'compare':
+            state.comparing_indices = step.indices.slice();
+            break;
+        case 'mark_sorted':
+            step.indices.forEach(index => state.sorted_indices.add(index));
+            break;
+        case 'highlight':
+            state.highlighted_indices = step.indices.slice();
+            break;
+        case 'clear_highlight': {
+            const cleared = new Set(step.indices);
+            state.highlighted_indices = state.highlighted_indices.filter(
+                index => !cleared.has(index)
+            );
+            break;
+        }
+        case 'pivot':
+            state.pivot_index = step.indices[0];
+            break;
+    }
+}
+
+// Decodes the binary timeline format written by web/binary_format.py into
+// the same step objects the NDJSON stream delivers
+function decodeBinaryTimeline(buffer) {
+    const STEP_TYPES = ['compare', 'swap', 'overwrite', 'mark_sorted', 'highlight', 'clear_highlight', 'pivot', 'merge'];
+    const ARITY = [2, 2, 1, null, null, null, 1, null];
+    const OVERWRITE = 2;
+    const TEMPLATE = 0x08, RANGE = 0x10, COUNT = 0x20, VALUES = 0x40, METADATA = 0x80;
+    
+    const view = new DataView(buffer);
+    const bytes = new Uint8Array(buffer);
+    const textDecoder = new TextDecoder();
+    let offset = 0;
+    
+    // Varints can exceed 32 bits, so avoid bitwise shifts on the total
+    const readVarint = () => {
+        let value = 0;
+        let scale = 1;
+        let byte;
+        do {
+            byte = bytes[offset++];
+            value += (byte & 0x7f) * scale;
+            scale *= 128;
+        } while (byte & 0x80);
+        return value;
+    };
+    const unzigzag = value => (value % 2 === 0 ? value / 2 : -(value + 1) / 2);
+    
+    const magic = textDecoder.decode(bytes.subarray(0, 4));
+    if (magic !== 'AVTL' || bytes[4] !== 1) {
+        throw new Error('Unsupported binary timeline');
+    }
+    const headerFlags = bytes[5];
+    const stepCount = view.getUint32(8, true);
+    const arrayLength = view.getUint32(12, true);
+    const stringCount = view.getUint32(16, true);
+    offset = 24;
+    
+    const strings = new Array(stringCount);
+    for (let i = 0; i < stringCount; i++) {
+        const length = readVarint();
+        strings[i] = textDecoder.decode(bytes.subarray(offset, offset + length));
+        offset += length;
+    }
+    
+    const readValue = (indices, values) => {
+        const tag = readVarint();
+        if (tag % 2 === 0) return tag / 2;
+        const kind = tag % 16;
+        const ref = Math.floor(tag / 16);
+        switch (kind) {
+            case 1: {
+                const value = view.getFloat64(offset, true);
+                offset += 8;
+                return value;
+            }
+            case 3: return strings[readVarint()];
+            case 5: return null;
+            case 7: return JSON.parse(strings[readVarint()]);
+            case 9: return indices[ref];
+            case 11: return values[ref];
+            case 13: return -ref - 1;
+        }
+        throw new Error(`Unknown value tag ${tag}`);
+    };
+    
+    const initialArray = new Array(arrayLength);
+    for (let i = 0; i < arrayLength; i++) initialArray[i] = readValue();
+    
+    const records = bytes.subarray(offset, offset + stepCount);
+    offset += stepCount;
+    
+    const last = [0, 0];
+    const steps = new Array(stepCount);
+    for (let s = 0; s < stepCount; s++) {
+        const record = records[s];
+        const typeCode = record & 0x07;
+        const text = strings[readVarint()];
+        
+        let indices;
+        if (record & RANGE) {
+            const start = last[0] = last[0] + unzigzag(readVarint());
+            const count = readVarint();
+            indices = new Array(count);
+            for (let i = 0; i < count; i++) indices[i] = start + i;
+        } else {
+            const count = record & COUNT ? readVarint() : ARITY[typeCode];
+            indices = new Array(count);
+            let index = 0;
+            for (let i = 0; i < count; i++) {
+                if (i < 2) {
+                    index = last[i] = last[i] + unzigzag(readVarint());
+                } else {
+                    index += unzigzag(readVarint());
+                }
+                indices[i] = index;
+            }
+        }
+        
+        let values = [];
+        if (record & VALUES) {
+            const count = typeCode === OVERWRITE ? 1 : readVarint();
+            values = new Array(count);
+            for (let i = 0; i < count; i++) values[i] = readValue();
+        }
+        
+        const step = { type: STEP_TYPES[typeCode], indices, values, metadata: {} };
+        if (record & TEMPLATE) {
+            const count = readVarint();
+            step.template = text;
+            if (count === 0) {
+                step.template_args = indices.slice();
+            } else {
+                step.template_args = new Array(count - 1);
+                for (let i = 0; i < count - 1; i++) step.template_args[i] = readValue(indices, values);
+            }
+        } else {
+            step.explanation = text;
+        }
+        
+        if (record & METADATA) {
+            const stringId = readVarint();
+            if (stringId === 0) {
+                const mid = indices[0] + readVarint();
+                step.metadata = {
+                    left_range: [indices[0], mid],
+                    right_range: [mid, indices[indices.length - 1] + 1]
+                };
+            } else {
+                step.metadata = JSON.parse(strings[stringId - 1]);
+            }
+        }
+        steps[s] = step;
+    }
+    
+    return {
+        initial_array: initialArray,
+        steps,
+        explanation_templates: headerFlags & 1 ? JSON.parse(strings[0]) : {}
+    };
+}
+
 // Initialize the visualizer when DOM is loaded
 document.addEventListener('DOMContentLoaded', () => {
     new AlgorithmVisualizer();